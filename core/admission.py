@@ -0,0 +1,173 @@
+"""
+Pahalı endpoint'ler için kabul kontrolü (admission control).
+
+Her endpoint grubunun sabit sayıda eş zamanlı çalışma yeri (slot) ve sınırlı
+bir bekleme kuyruğu vardır. Slot'lar doluysa istek kuyrukta bekler; kuyruk da
+doluysa veya bekleme süresi aşılırsa istek hemen 503 + Retry-After ile
+reddedilir. Böylece model/skorlama yükü worker'ların hepsini tutamaz ve ucuz
+CRUD istekleri arkada beklemez.
+
+Sınırlar worker (process) başınadır; bkz. settings.ADMISSION_LIMITS. Bu
+yüzden gunicorn thread'li worker'larla (gthread, bkz. gunicorn.conf.py)
+çalıştırılır: tek thread'li sync worker'da aynı anda tek istek çalışır ve
+slot'lar hiç dolmaz.
+"""
+import functools
+import threading
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+SUGGESTIONS = 'suggestions'
+ONBOARD = 'onboard'
+NETWORK = 'network'
+EXPORT = 'export'
+
+# slots: eş zamanlı çalışan istek, queue: bekleyebilecek istek,
+# timeout: kuyrukta en fazla bekleme (sn), retry_after: reddedilene önerilen bekleme (sn)
+DEFAULT_LIMITS = {
+    SUGGESTIONS: {"slots": 4, "queue": 8, "timeout": 5.0, "retry_after": 2},
+    ONBOARD: {"slots": 2, "queue": 8, "timeout": 10.0, "retry_after": 5},
+    NETWORK: {"slots": 2, "queue": 4, "timeout": 5.0, "retry_after": 5},
+    EXPORT: {"slots": 1, "queue": 2, "timeout": 5.0, "retry_after": 30},
+}
+
+
+class ServiceBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Sunucu şu an yoğun, lütfen biraz sonra tekrar deneyin."
+    default_code = 'service_busy'
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        # DRF'in exception handler'ı bunu Retry-After header'ına yazar
+        self.wait = retry_after
+
+
+class ConcurrencyGate:
+
+    def __init__(self, name: str, slots: int, queue: int, timeout: float, retry_after: int):
+        self.name = name
+        self.slots = slots
+        self.queue = queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        # Metrikler
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self) -> None:
+        """ Slot alır; alamazsa ServiceBusy fırlatır. """
+        started = time.monotonic()
+        with self._cond:
+            if self._active >= self.slots:
+                if self._waiting >= self.queue:
+                    self._rejected += 1
+                    raise ServiceBusy(self.retry_after)
+
+                self._waiting += 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self._active < self.slots, timeout=self.timeout)
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    self._timed_out += 1
+                    raise ServiceBusy(self.retry_after)
+
+            self._active += 1
+            self._admitted += 1
+            waited = time.monotonic() - started
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "queue_size": self.queue,
+                "active": self._active,
+                "queue_depth": self._waiting,
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_wait_ms": round(self._wait_total / self._admitted * 1000, 2) if self._admitted else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+
+def _build_gates() -> Dict[str, ConcurrencyGate]:
+    configured = getattr(settings, 'ADMISSION_LIMITS', {})
+    gates = {}
+    for name in set(DEFAULT_LIMITS) | set(configured):
+        limits = {**DEFAULT_LIMITS.get(name, DEFAULT_LIMITS[SUGGESTIONS]), **configured.get(name, {})}
+        gates[name] = ConcurrencyGate(name, **limits)
+    return gates
+
+
+GATES = _build_gates()
+
+
+def limit_concurrency(name: str):
+    """
+    View metodu dekoratörü: metod sadece `name` kapısından slot alınca çalışır.
+    @action'ın altına yazılır.
+    """
+    gate = GATES[name]
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(*args, **kwargs):
+            with gate:
+                return view_method(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+class GatedStream:
+    """
+    Akan (streaming) yanıt için slot: view dönünce değil, yanıt tamamen
+    gönderilince (veya bağlantı kapanınca) bırakılır. Kapı önceden alınmış olmalı.
+    """
+
+    def __init__(self, gate: ConcurrencyGate, chunks):
+        self._gate = gate
+        self._chunks = chunks
+        self._released = False
+
+    def __iter__(self):
+        try:
+            yield from self._chunks
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if not self._released:
+            self._released = True
+            self._gate.release()
+
+
+def admission_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: gate.stats() for name, gate in GATES.items()}
@@ -0,0 +1,248 @@
+"""
+İşbirliği ağı analizi: merkezilik, topluluklar ve köprü araştırmacılar.
+
+Ağ (core/graph.py) NetworkX grafına çevrilir ve şunlar hesaplanır:
+  - degree / weighted_degree: işbirlikçi sayısı / ortak proje + yayın toplamı
+  - betweenness: büyük ağlarda GRAPH_ANALYTICS_BETWEENNESS_SAMPLES kaynaktan örneklenir
+  - eigenvector: en büyük bağlı bileşende (diğer bileşenlerde 0)
+  - community: Louvain toplulukları, 0 en büyük topluluk
+  - is_bridge: çıkarılınca ağı bölen araştırmacılar (articulation point)
+
+Hesap pahalıdır, arka plan işinde yapılır (jobs.GRAPH_ANALYTICS) ve ağ
+versiyonuyla (core/changes.py) birlikte saklanır. Endpoint'ler son analizi
+okur; ağ o versiyondan beri değiştiyse yeni bir hesap kuyruğa eklenir.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import networkx as nx
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .changes import changed_since, settled_version
+from .graph import PROJECT, PUBLICATION, CollaborationGraph
+from .models import GraphAnalysis, Researcher, ResearcherCentrality
+
+BETWEENNESS_SAMPLES = getattr(settings, 'GRAPH_ANALYTICS_BETWEENNESS_SAMPLES', 500)
+KEEP_ANALYSES = getattr(settings, 'GRAPH_ANALYTICS_KEEP', 3)
+SEED = 42   # Örnekleme ve Louvain aynı ağda aynı sonucu versin
+
+METRICS = ('degree', 'weighted_degree', 'betweenness', 'eigenvector')
+
+
+def _to_networkx(graph: CollaborationGraph) -> nx.Graph:
+    """ Düğümler graph satırlarıdır; weight = ortak proje + yayın sayısı """
+    total = (graph.weights(PROJECT) + graph.weights(PUBLICATION)).tocsr()
+    G = nx.from_scipy_sparse_array(total)
+    G.add_nodes_from(range(len(graph.ids)))
+    return G
+
+
+def _eigenvector(G: nx.Graph) -> Dict[int, float]:
+    """ Bağlı olmayan ağda özvektör belirsizdir: en büyük bileşende hesaplanır """
+    if G.number_of_edges() == 0:
+        return {}
+    component = G.subgraph(max(nx.connected_components(G), key=len))
+    if len(component) < 3:
+        return {node: 1 / np.sqrt(len(component)) for node in component}
+    return nx.eigenvector_centrality_numpy(component, weight='weight')
+
+
+def _communities(G: nx.Graph) -> List[set]:
+    communities = nx.community.louvain_communities(G, weight='weight', seed=SEED)
+    return sorted(communities, key=lambda members: (-len(members), min(members)))
+
+
+def compute(graph: CollaborationGraph) -> Dict[str, Any]:
+    """ Satır sırasında skor dizileri ve topluluk özetleri """
+    G = _to_networkx(graph)
+    n = G.number_of_nodes()
+
+    samples = BETWEENNESS_SAMPLES if n > BETWEENNESS_SAMPLES else None
+    betweenness = nx.betweenness_centrality(G, k=samples, seed=SEED) if n else {}
+    eigenvector = _eigenvector(G)
+    communities = _communities(G) if n else []
+
+    community = np.zeros(n, dtype=np.int64)
+    for label, members in enumerate(communities):
+        community[list(members)] = label
+
+    bridges = np.zeros(n, dtype=bool)
+    bridges[list(nx.articulation_points(G))] = True
+
+    return {
+        "degree": np.array([G.degree(row) for row in range(n)], dtype=np.int64),
+        "weighted_degree": np.array([G.degree(row, weight='weight') for row in range(n)], dtype=np.int64),
+        "betweenness": np.array([betweenness.get(row, 0.0) for row in range(n)]),
+        "eigenvector": np.array([eigenvector.get(row, 0.0) for row in range(n)]),
+        "community": community,
+        "is_bridge": bridges,
+        "edge_count": G.number_of_edges(),
+        "community_count": len(communities),
+        "modularity": nx.community.modularity(G, communities, weight='weight') if G.number_of_edges() else None,
+        "betweenness_samples": samples,
+    }
+
+
+def run_analysis() -> GraphAnalysis:
+    """
+    Ağın güncel halini DB'den okuyup analiz eder ve kaydeder. Versiyon ağdan
+    önce okunur: analiz en az bu versiyona kadarki değişiklikleri içerir.
+    """
+    version = settled_version()
+    latest = latest_analysis()
+    if latest is not None and latest.version >= version:
+        return latest
+
+    started = time.monotonic()
+    # Worker'ın önbellekteki kopyası başka process'lerin yazmalarını kaçırmış olabilir
+    graph = CollaborationGraph.load()
+    result = compute(graph)
+
+    with transaction.atomic():
+        analysis = GraphAnalysis.objects.create(
+            version=version,
+            node_count=len(graph.ids),
+            edge_count=result["edge_count"],
+            community_count=result["community_count"],
+            modularity=result["modularity"],
+            betweenness_samples=result["betweenness_samples"],
+            duration=time.monotonic() - started,
+        )
+        ResearcherCentrality.objects.bulk_create(
+            [
+                ResearcherCentrality(
+                    analysis=analysis,
+                    researcher_id=researcher_id,
+                    degree=int(result["degree"][row]),
+                    weighted_degree=int(result["weighted_degree"][row]),
+                    betweenness=float(result["betweenness"][row]),
+                    eigenvector=float(result["eigenvector"][row]),
+                    community=int(result["community"][row]),
+                    is_bridge=bool(result["is_bridge"][row]),
+                )
+                for row, researcher_id in enumerate(graph.ids)
+            ],
+            batch_size=1000,
+        )
+        # Eski analizler (skorları cascade ile) silinir
+        old = GraphAnalysis.objects.order_by('-analysis_id').values_list('analysis_id', flat=True)[KEEP_ANALYSES:]
+        GraphAnalysis.objects.filter(analysis_id__in=list(old)).delete()
+    return analysis
+
+
+# ---------------------------------------------------------
+# OKUMA
+# ---------------------------------------------------------
+
+def latest_analysis() -> Optional[GraphAnalysis]:
+    return GraphAnalysis.objects.order_by('-analysis_id').first()
+
+
+def is_stale(analysis: Optional[GraphAnalysis]) -> bool:
+    return analysis is None or changed_since(analysis.version)
+
+
+def analysis_summary(analysis: GraphAnalysis) -> Dict[str, Any]:
+    return {
+        "version": analysis.version,
+        "computed_at": analysis.computed_at,
+        "stale": is_stale(analysis),
+        "nodes": analysis.node_count,
+        "edges": analysis.edge_count,
+        "communities": analysis.community_count,
+        "modularity": analysis.modularity,
+        "betweenness_samples": analysis.betweenness_samples,
+    }
+
+
+def _with_researchers(scores) -> List[Dict[str, Any]]:
+    """ Skor satırlarına araştırmacının adı / departmanı / unvanı eklenir (sıra korunur) """
+    scores = list(scores.values('researcher_id', *METRICS, 'community', 'is_bridge'))
+    info = {
+        row['researcher_id']: row
+        for row in Researcher.objects
+        .filter(researcher_id__in=[score['researcher_id'] for score in scores])
+        .values('researcher_id', 'full_name', 'department__name', 'title')
+    }
+    results = []
+    for score in scores:
+        researcher = info.get(score['researcher_id'])
+        if researcher is None:
+            continue    # Analizden sonra silinmiş
+        results.append({
+            "researcher_id": score['researcher_id'],
+            "full_name": researcher['full_name'],
+            "department": researcher['department__name'] or "Unknown",
+            "title": researcher['title'],
+            **{key: score[key] for key in (*METRICS, 'community', 'is_bridge')},
+        })
+    return results
+
+
+def top_central(analysis: GraphAnalysis, metric: str, limit: int = 10, community: Optional[int] = None) -> List[Dict[str, Any]]:
+    """ metric'e göre en merkezi limit araştırmacı (opsiyonel: tek topluluk içinde) """
+    scores = analysis.scores.all()
+    if community is not None:
+        scores = scores.filter(community=community)
+    return _with_researchers(scores.order_by(f'-{metric}', 'researcher_id')[:limit])
+
+
+def communities(analysis: GraphAnalysis, limit: int = 50, top: int = 5) -> List[Dict[str, Any]]:
+    """
+    En büyük limit topluluk: boyutu, köprü sayısı ve en çok bağlantısı olan top üyesi.
+    Topluluk sayısından bağımsız üç sorgu: boyutlar, üyeler (topluluk başına
+    sıra numarasıyla) ve araştırmacı bilgileri.
+    """
+    scores = analysis.scores.filter(community__lt=limit)
+    sizes = (
+        scores.values('community')
+        .annotate(size=Count('id'), bridges=Count('id', filter=Q(is_bridge=True)))
+        .order_by('community')
+    )
+    ranked = scores.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('community')],
+            order_by=[F('degree').desc(), F('researcher_id').asc()],
+        ),
+    ).filter(position__lte=top).order_by('community', 'position')
+
+    members: Dict[int, List[Dict[str, Any]]] = {}
+    for member in _with_researchers(ranked):
+        members.setdefault(member['community'], []).append(member)
+    return [
+        {
+            "community": row['community'],
+            "size": row['size'],
+            "bridges": row['bridges'],
+            "top_members": members.get(row['community'], []),
+        }
+        for row in sizes
+    ]
+
+
+def community_members(analysis: GraphAnalysis, community: int, limit: int) -> Optional[Dict[str, Any]]:
+    """ Topluluğun üyeleri (en çok bağlantısı olan önce). Topluluk yoksa None. """
+    if not 0 <= community < analysis.community_count:
+        return None
+    scores = analysis.scores.filter(community=community)
+    size = scores.count()
+    return {
+        "community": community,
+        "size": size,
+        "members": _with_researchers(scores.order_by('-degree', 'researcher_id')[:limit]),
+        "truncated": size > limit,
+    }
+
+
+def researcher_centrality(analysis: GraphAnalysis, researcher_id: int) -> Optional[Dict[str, Any]]:
+    """ Araştırmacının skorları ve topluluk büyüklüğü. Analizde yoksa (hiç ortak işi yok) None. """
+    score = analysis.scores.filter(researcher_id=researcher_id).values(*METRICS, 'community', 'is_bridge').first()
+    if score is None:
+        return None
+    score["community_size"] = analysis.scores.filter(community=score["community"]).count()
+    return score
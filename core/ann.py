@@ -0,0 +1,409 @@
+"""
+Yaklaşık en yakın komşu (ANN) vektör indeksleri.
+
+Tüm vektörler normalize edildiği için benzerlik = dot product (cosine).
+
+- BruteForceIndex: Herkesle tek bir matris çarpımı. Kesin sonuç verir,
+  referans ve küçük veri için.
+- IVFIndex: Vektörler k-means merkezlerine (centroid) göre listelere bölünür.
+  Sorguda sadece en yakın n_probe listenin içine bakılır. n_probe büyüdükçe
+  recall artar, hız düşer (n_probe = n_lists -> brute force ile aynı sonuç).
+
+Saf NumPy; harici kütüphane (faiss vb.) gerektirmez.
+"""
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .embeddings import load_embeddings
+from .snapshot import VersionedSnapshot
+
+
+class VectorIndex(ABC):
+    """ Tüm indekslerin ortak arayüzü. id'ler tam sayıdır (entity_id). """
+
+    kind = None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def build(self, ids: np.ndarray, vectors: np.ndarray) -> 'VectorIndex':
+        ...
+
+    @abstractmethod
+    def add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """ Yeni vektörleri ekler; id zaten varsa vektörü günceller. """
+
+    @abstractmethod
+    def remove(self, ids: np.ndarray) -> None:
+        ...
+
+    @abstractmethod
+    def query(self, vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """ En benzer k kayıt: (id'ler, benzerlikler), benzerliğe göre azalan. """
+
+    @abstractmethod
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """ İndeksteki tüm (id'ler, vektörler) """
+
+    def save(self, path: str) -> None:
+        ids, vectors = self.items()
+        np.savez(path, kind=self.kind, ids=ids, vectors=vectors)
+
+
+def _top_k(ids: np.ndarray, sims: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if k <= 0 or not len(ids):
+        return ids[:0], sims[:0]
+    if k < len(ids):
+        part = np.argpartition(-sims, k - 1)[:k]
+        ids, sims = ids[part], sims[part]
+    order = np.argsort(-sims, kind='stable')
+    return ids[order], sims[order]
+
+
+def _as_matrix(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    return np.ascontiguousarray(vectors)
+
+
+class BruteForceIndex(VectorIndex):
+
+    kind = 'brute'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (id'ler, vektörler) her zaman tek atamayla değiştirilir: kilitsiz okuyan
+        # query ikisini birlikte alır, yeni id'leri eski matrisle eşleştiremez
+        self._items = (np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32))
+
+    def __len__(self):
+        return len(self._items[0])
+
+    def build(self, ids, vectors):
+        with self._lock:
+            self._items = (np.asarray(ids, dtype=np.int64), _as_matrix(vectors))
+        return self
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            old_ids, old_vectors = self._items
+            keep = ~np.isin(old_ids, ids)
+            old_vectors = old_vectors[keep] if len(old_ids) else np.empty((0, np.shape(vectors)[1]), dtype=np.float32)
+            self._items = (np.concatenate([old_ids[keep], ids]), np.concatenate([old_vectors, _as_matrix(vectors)]))
+
+    def remove(self, ids):
+        with self._lock:
+            old_ids, old_vectors = self._items
+            keep = ~np.isin(old_ids, np.asarray(ids, dtype=np.int64))
+            self._items = (old_ids[keep], old_vectors[keep])
+
+    def query(self, vector, k):
+        ids, vectors = self._items
+        if not len(ids):
+            return ids, np.empty(0, dtype=np.float32)
+        return _top_k(ids, vectors @ np.asarray(vector, dtype=np.float32), k)
+
+    def items(self):
+        return self._items
+
+
+class IVFIndex(VectorIndex):
+
+    kind = 'ivf'
+
+    def __init__(self, n_lists: Optional[int] = None, n_probe: int = 8, iterations: int = 10, seed: int = 0):
+        """
+        n_lists: Liste (centroid) sayısı. None ise sqrt(N) kullanılır.
+        n_probe: Sorguda bakılan liste sayısı (recall/latency ayarı).
+        """
+        self._lock = threading.RLock()
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.iterations = iterations
+        self.seed = seed
+        # (centroid'ler, ((liste id'leri, liste vektörleri), ...)); yazmalar yeni bir
+        # demet kurup tek atamayla yayınlar, query kilitsiz ve her zaman tutarlı okur
+        self._state: Tuple[np.ndarray, Tuple[Tuple[np.ndarray, np.ndarray], ...]] = (np.empty((0, 0), dtype=np.float32), ())
+        self.location: Dict[int, int] = {}  # id -> liste numarası
+
+    def __len__(self):
+        return len(self.location)
+
+    @property
+    def centroids(self) -> np.ndarray:
+        return self._state[0]
+
+    # --- Eğitim (spherical k-means) ---
+
+    def _train(self, vectors: np.ndarray) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+
+        # Büyük veri için örneklem üzerinde eğit, sonra herkesi ata
+        sample = vectors
+        if len(vectors) > 64 * n_lists:
+            sample = vectors[rng.choice(len(vectors), 64 * n_lists, replace=False)]
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.iterations):
+            assign = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Boş kalan merkezleri rastgele noktalara taşı
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1.0, norms)
+        return centroids.astype(np.float32)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+        # Bellek patlamasın diye parça parça
+        out = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk):
+            out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+        return out
+
+    def build(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _as_matrix(vectors)
+        with self._lock:
+            if not len(ids):
+                self.location = {}
+                self._state = (np.empty((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32), ())
+                return self
+            centroids = self._train(vectors)
+            self._fill(centroids, ids, vectors, self._nearest(vectors, centroids))
+        return self
+
+    def _fill(self, centroids: np.ndarray, ids: np.ndarray, vectors: np.ndarray, assign: np.ndarray) -> None:
+        n_lists = len(centroids)
+        order = np.argsort(assign, kind='stable')
+        bounds = np.searchsorted(assign[order], np.arange(n_lists + 1))
+        lists = tuple(
+            (ids[order[bounds[i]:bounds[i + 1]]], vectors[order[bounds[i]:bounds[i + 1]]])
+            for i in range(n_lists)
+        )
+        with self._lock:
+            self.location = dict(zip(ids.tolist(), assign.tolist()))
+            self._state = (centroids, lists)
+
+    # --- Artımlı güncelleme ---
+
+    def _without(self, lists: list, ids: np.ndarray) -> None:
+        """ ids'i lists kopyasından (ve location'dan) çıkarır; kilit tutulurken çağrılır """
+        by_list: Dict[int, list] = {}
+        for entity_id in ids.tolist():
+            list_no = self.location.pop(entity_id, None)
+            if list_no is not None:
+                by_list.setdefault(list_no, []).append(entity_id)
+        for list_no, removed in by_list.items():
+            list_ids, list_vectors = lists[list_no]
+            keep = ~np.isin(list_ids, removed)
+            lists[list_no] = (list_ids[keep], list_vectors[keep])
+
+    def add(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _as_matrix(vectors)
+        with self._lock:
+            centroids, lists = self._state
+            if not len(centroids):
+                self.build(ids, vectors)
+                return
+            # Güncellenen id'ler eski listelerinden çıkarılır ve yeni yerlerine
+            # eklenir; sorgular ikisinin arasını hiç görmez
+            lists = list(lists)
+            self._without(lists, ids)
+            assign = self._nearest(vectors, centroids)
+            for list_no in np.unique(assign).tolist():
+                mask = assign == list_no
+                list_ids, list_vectors = lists[list_no]
+                lists[list_no] = (np.concatenate([list_ids, ids[mask]]), np.concatenate([list_vectors, vectors[mask]]))
+            self.location.update(zip(ids.tolist(), assign.tolist()))
+            self._state = (centroids, tuple(lists))
+
+    def remove(self, ids):
+        with self._lock:
+            centroids, lists = self._state
+            lists = list(lists)
+            self._without(lists, np.asarray(ids, dtype=np.int64))
+            self._state = (centroids, tuple(lists))
+
+    # --- Sorgu ---
+
+    def query(self, vector, k, n_probe: Optional[int] = None):
+        vector = np.asarray(vector, dtype=np.float32)
+        centroids, lists = self._state
+        if not len(centroids):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        n_probe = min(n_probe or self.n_probe, len(centroids))
+        centroid_sims = centroids @ vector
+        probe = np.argpartition(-centroid_sims, n_probe - 1)[:n_probe]
+
+        ids = np.concatenate([lists[i][0] for i in probe])
+        if not len(ids):
+            return ids, np.empty(0, dtype=np.float32)
+        vectors = np.concatenate([lists[i][1] for i in probe])
+        return _top_k(ids, vectors @ vector, k)
+
+    def items(self):
+        centroids, lists = self._state
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty((0, centroids.shape[1]), dtype=np.float32)
+        return np.concatenate([ids for ids, _ in lists]), np.concatenate([vectors for _, vectors in lists])
+
+    def save(self, path):
+        with self._lock:
+            ids, vectors = self.items()
+            assign = np.array([self.location[i] for i in ids.tolist()], dtype=np.int64)
+            centroids = self.centroids
+        np.savez(
+            path,
+            kind=self.kind,
+            ids=ids,
+            vectors=vectors,
+            assign=assign,
+            centroids=centroids,
+            params=np.array([self.n_lists or 0, self.n_probe, self.iterations, self.seed]),
+        )
+
+
+def load_index(path: str) -> VectorIndex:
+    """ save() ile diske yazılmış bir indeksi geri yükler. """
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+        if kind == IVFIndex.kind:
+            n_lists, n_probe, iterations, seed = data['params'].tolist()
+            index = IVFIndex(n_lists=n_lists or None, n_probe=n_probe, iterations=iterations, seed=seed)
+            index._fill(data['centroids'], data['ids'], data['vectors'], data['assign'])
+            return index
+        return BruteForceIndex().build(data['ids'], data['vectors'])
+
+
+def create_index(size: int) -> VectorIndex:
+    """
+    settings.ANN_INDEX_BACKEND: 'brute', 'ivf' veya 'auto'
+    ('auto': ANN_IVF_MIN_SIZE altında kesin sonuç veren brute force).
+    """
+    backend = getattr(settings, 'ANN_INDEX_BACKEND', 'auto')
+    if backend == 'auto':
+        backend = 'ivf' if size >= getattr(settings, 'ANN_IVF_MIN_SIZE', 20000) else 'brute'
+    if backend == 'ivf':
+        return IVFIndex(
+            n_lists=getattr(settings, 'ANN_IVF_LISTS', None),
+            n_probe=getattr(settings, 'ANN_IVF_PROBE', 8),
+        )
+    return BruteForceIndex()
+
+
+# ---------------------------------------------------------
+# VARLIK İNDEKSLERİ (researcher / project / publication)
+# ---------------------------------------------------------
+
+def index_path(entity_type: str) -> str:
+    directory = getattr(settings, 'ANN_INDEX_DIR', None) or os.path.join(settings.BASE_DIR, 'ann_indexes')
+    return os.path.join(str(directory), f"{entity_type}.npz")
+
+
+def build_entity_index(entity_type: str) -> VectorIndex:
+    """ Embedding deposundaki tüm vektörlerden sıfırdan indeks kurar. """
+    stored = load_embeddings(entity_type)
+    index = create_index(len(stored))
+    if stored:
+        ids = np.fromiter(stored.keys(), dtype=np.int64, count=len(stored))
+        index.build(ids, np.stack([vector for _, vector in stored.values()]))
+    return index
+
+
+def _load_entity_index(entity_type: str) -> VectorIndex:
+    """
+    Diskte kayıtlı indeks varsa (build_vector_index komutu) onu yükler ve
+    depoyla arasındaki farkı artımlı olarak uygular; k-means tekrar çalışmaz.
+    Yoksa sıfırdan kurar.
+    """
+    path = index_path(entity_type)
+    if not os.path.exists(path):
+        return build_entity_index(entity_type)
+
+    index = load_index(path)
+    stored = load_embeddings(entity_type)
+    ids, vectors = index.items()
+    current = dict(zip(ids.tolist(), range(len(ids))))
+
+    removed = [entity_id for entity_id in current if entity_id not in stored]
+    changed = [
+        entity_id for entity_id, (_, vector) in stored.items()
+        if entity_id not in current or not np.array_equal(vectors[current[entity_id]], vector)
+    ]
+    if removed:
+        index.remove(np.array(removed, dtype=np.int64))
+    if changed:
+        index.add(
+            np.array(changed, dtype=np.int64),
+            np.stack([stored[entity_id][1] for entity_id in changed]),
+        )
+    return index
+
+
+VECTOR_INDEXES = {
+    entity_type: VersionedSnapshot(
+        lambda entity_type=entity_type: _load_entity_index(entity_type),
+        max_age=getattr(settings, 'ANN_INDEX_MAX_AGE', 3600),
+    )
+    for entity_type in ('researcher', 'project', 'publication')
+}
+
+
+def get_vector_index(entity_type: str) -> VectorIndex:
+    return VECTOR_INDEXES[entity_type].get()
+
+
+def index_upsert(entity_type: str, entity_id: int, vector: np.ndarray) -> None:
+    """ Embedding deposu güncellendiğinde indeksi baştan kurmadan günceller. """
+    index_upsert_many(entity_type, [entity_id], np.asarray(vector).reshape(1, -1))
+
+
+def index_upsert_many(entity_type: str, entity_ids: List[int], vectors: np.ndarray) -> None:
+    """ Toplu yazma (sync_embeddings) sonrası: tüm batch tek add ile indekse yazılır """
+    index = VECTOR_INDEXES[entity_type].peek() if entity_type in VECTOR_INDEXES else None
+    if index is not None and len(entity_ids):
+        index.add(np.asarray(entity_ids, dtype=np.int64), _as_matrix(vectors))
+
+
+def index_remove(entity_type: str, entity_id: int) -> None:
+    index = VECTOR_INDEXES[entity_type].peek() if entity_type in VECTOR_INDEXES else None
+    if index is not None:
+        index.remove(np.array([entity_id]))
+
+
+def semantic_neighbours(
+    entity_type: str,
+    vector: np.ndarray,
+    min_similarity: float,
+    k: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Benzerliği min_similarity ve üzeri olan kayıtlar: (id'ler, benzerlikler).
+    İlk k komşunun en zayıfı bile eşiğin üstündeyse k ikiye katlanarak
+    devam edilir; brute-force indekste sonuç kesindir.
+    """
+    index = get_vector_index(entity_type)
+    while True:
+        ids, sims = index.query(vector, k)
+        if len(ids) < k or sims[-1] < min_similarity:
+            keep = sims >= min_similarity
+            return ids[keep], sims[keep]
+        k *= 2
@@ -0,0 +1,199 @@
+"""
+Ağır endpoint'lerin async (ASGI) sürümleri: /api/async/...
+
+uvicorn (veya gunicorn -k uvicorn.workers.UvicornWorker) ile çalışırken
+event loop hiç bloklanmaz:
+  - Birbirinden bağımsız DB okumaları ayrı thread'lerde eş zamanlı yapılır.
+  - CPU'ya yük olan skorlama sınırlı bir thread havuzunda (SCORING_EXECUTOR)
+    çalışır. NumPy/SciPy işlemleri GIL'i bıraktığı ve özellik önbelleği
+    process içinde paylaşıldığı için process havuzu yerine thread havuzu
+    kullanılır (her process kendi önbelleğini kurmak zorunda kalırdı).
+
+Böylece tek bir worker birçok isteği sıraya koymadan üst üste bindirebilir.
+Yanıtlar senkron endpoint'lerle aynıdır.
+"""
+import asyncio
+import contextlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from .admission import GATES, NETWORK, SUGGESTIONS, ServiceBusy
+from .changes import if_none_match, network_etag, settled_version
+from .materialized import get_materialized_suggestions
+from .queries import (
+    GENERAL_STATS_QUERIES,
+    department_distribution,
+    network_edges,
+    network_nodes,
+    top_skills,
+)
+from .scoring import NETWORK_MODES
+from .services import DEFAULT_NETWORK_SCORE, get_collaboration_suggestions
+
+SCORING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_SCORING_WORKERS', 4),
+    thread_name_prefix='scoring',
+)
+
+
+def _with_connections(func):
+    """ Havuz thread'lerinde de DB bağlantıları istek gibi yönetilsin (CONN_MAX_AGE) """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+def _release_if_acquired(gate, acquiring: asyncio.Future) -> None:
+    if not acquiring.cancelled() and acquiring.exception() is None:
+        gate.release()
+
+
+@contextlib.asynccontextmanager
+async def _admission(name: str):
+    """
+    Senkron endpoint'lerle aynı kabul kapısı (bkz. core/admission.py).
+    Kuyrukta bekleme event loop'u bloklamasın diye ayrı bir thread'de yapılır.
+
+    İstek (bağlantı koptuğu için) beklerken iptal edilirse thread durdurulamaz
+    ve slot'u sonradan alabilir: o durumda slot, alındığı anda bırakılır.
+    """
+    gate = GATES[name]
+    acquiring = asyncio.ensure_future(sync_to_async(gate.acquire, thread_sensitive=False)())
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        acquiring.add_done_callback(functools.partial(_release_if_acquired, gate))
+        raise
+    try:
+        yield
+    finally:
+        gate.release()
+
+
+def _get_only(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _json({"detail": f'"{request.method}" metoduna izin verilmiyor.'}, status=405)
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def run_scoring(func, *args, **kwargs):
+    """ CPU işini skorlama havuzunda çalıştırır """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        SCORING_EXECUTOR,
+        functools.partial(_with_connections(func), *args, **kwargs),
+    )
+
+
+async def run_query(func, *args, **kwargs):
+    """ DB okumasını ayrı bir thread'de çalıştırır (diğer sorgularla eş zamanlı) """
+    return await sync_to_async(_with_connections(func), thread_sensitive=False)(*args, **kwargs)
+
+
+def _json(data, status=200) -> JsonResponse:
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+def _busy(exc: ServiceBusy) -> JsonResponse:
+    response = _json({"detail": str(exc.detail)}, status=exc.status_code)
+    response["Retry-After"] = str(exc.wait)
+    return response
+
+
+@_get_only
+async def collaboration_suggestions(request, pk: int):
+    """
+    GET /api/async/researchers/{id}/collaboration-suggestions/
+    /api/researchers/{id}/collaboration-suggestions/ ile aynı parametre ve yanıt.
+    """
+    try:
+        limit = int(request.GET.get('limit', '10'))
+    except ValueError:
+        limit = 10
+    limit = max(1, min(limit, 50))  # 1 ile 50 arasında sınırla
+
+    network = request.GET.get('network', DEFAULT_NETWORK_SCORE)
+    if network not in NETWORK_MODES:
+        return _json({"detail": f"network şunlardan biri olmalıdır: {', '.join(NETWORK_MODES)}."}, status=400)
+
+    try:
+        async with _admission(SUGGESTIONS):
+            if network == DEFAULT_NETWORK_SCORE:
+                materialized = await run_query(get_materialized_suggestions, pk, limit=limit)
+                if materialized is not None:
+                    suggestions, computed_at = materialized
+                    response = _json(suggestions)
+                    response["X-Suggestions-Source"] = "materialized"
+                    response["X-Suggestions-Computed-At"] = computed_at.isoformat()
+                    return response
+
+            suggestions = await run_scoring(get_collaboration_suggestions, pk, limit=limit, network=network)
+    except ServiceBusy as exc:
+        return _busy(exc)
+
+    response = _json(suggestions)
+    response["X-Suggestions-Source"] = "live"
+    return response
+
+
+@_get_only
+async def network(request):
+    """
+    GET /api/async/network/
+    Düğümler ve iki kenar sorgusu eş zamanlı çalışır. ETag / X-Network-Version
+    senkron /api/network/ ile aynıdır.
+    """
+    etag = await run_query(network_etag)
+    if etag in if_none_match(request):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+    version = await run_query(settled_version)
+
+    try:
+        async with _admission(NETWORK):
+            nodes, project_edges, publication_edges = await asyncio.gather(
+                run_query(network_nodes),
+                run_query(network_edges, "project"),
+                run_query(network_edges, "publication"),
+            )
+    except ServiceBusy as exc:
+        return _busy(exc)
+    response = _json({"nodes": nodes, "edges": project_edges + publication_edges})
+    response["ETag"] = etag
+    response["X-Network-Version"] = str(version)
+    return response
+
+
+@_get_only
+async def dashboard_general_stats(request):
+    """ GET /api/async/dashboard/general_stats/ (sayımlar eş zamanlı) """
+    keys = list(GENERAL_STATS_QUERIES)
+    values = await asyncio.gather(*(run_query(GENERAL_STATS_QUERIES[key]) for key in keys))
+    return _json(dict(zip(keys, values)))
+
+
+@_get_only
+async def dashboard_department_distribution(request):
+    """ GET /api/async/dashboard/department_distribution/ """
+    return _json(await run_query(department_distribution))
+
+
+@_get_only
+async def dashboard_top_skills(request):
+    """ GET /api/async/dashboard/top_skills/ """
+    return _json(await run_query(top_skills))
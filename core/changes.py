@@ -0,0 +1,250 @@
+"""
+İşbirliği ağının versiyonu ve değişiklik günlüğü (graph_change tablosu).
+
+researcher ve project_researcher / author_publication yazmaları, aynı
+transaction içinde günlüğe düğüm / kenar değişikliği olarak yazılır:
+  - node upsert / remove: araştırmacı eklendi, adı / departmanı / unvanı değişti, silindi
+    (silinen düğümün kenarları da gitmiştir, ayrıca yazılmaz)
+  - edge upsert / remove: iki araştırmacının ortak proje (yayın) sayısı değişti
+    veya sıfırlandı (üyelik eklendi / çıkarıldı, proje / yayın silindi);
+    weight her zaman yeni değerdir, fark değil
+
+İstemci /api/network/ yanıtındaki versiyonu (X-Network-Version) saklar,
+sonra sadece /api/network/changes/?since=<versiyon> ile farkı alır.
+Uygulamak idempotenttir (upsert'ler son değeri taşır).
+
+Versiyon change_id değildir: id'ler INSERT sırasıyla verilir ve aynı anda süren
+iki transaction'dan küçük id'li olan daha geç commit edilebilir. Her satır,
+onu yazan transaction'ın id'sini (txid) taşır (PostgreSQL'de trigger ile
+pg_current_xact_id(), bkz. migration 0007). Versiyon, o an çalışan en eski
+transaction'dan (pg_current_snapshot() xmin) bir küçüktür: txid'si bundan
+küçük eşit her transaction bitmiştir, sonradan commit edilip araya satır
+ekleyemez. Versiyondan büyük txid'li satırlar bir sonraki sorguda gelir.
+SQLite yazmaları sıraya koyduğu için orada txid = change_id'dir.
+"""
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+
+from .graph import MEMBERSHIP_TABLES, record_membership
+from .models import Department, GraphChange, Researcher
+
+MAX_CHANGES = getattr(settings, 'GRAPH_CHANGES_PAGE_SIZE', 5000)
+
+
+def _node_change(researcher_id: int, full_name: str, department: Optional[str], title: Optional[str]) -> GraphChange:
+    # /api/network/ düğümüyle aynı alanlar
+    return GraphChange(
+        entity=GraphChange.NODE,
+        op=GraphChange.UPSERT,
+        source_id=researcher_id,
+        data={"label": full_name, "group": department or "Unknown", "title": title},
+    )
+
+
+def log_node(researcher: Researcher) -> None:
+    """ Araştırmacı eklendi / güncellendi """
+    department = None
+    if researcher.department_id is not None:
+        department = Department.objects.filter(pk=researcher.department_id).values_list('name', flat=True).first()
+    _node_change(researcher.researcher_id, researcher.full_name, department, researcher.title).save()
+
+
+def log_nodes(researchers: Iterable[Researcher]) -> None:
+    """ log_node'un toplu hali (bulk_create signal tetiklemez) """
+    departments = dict(Department.objects.values_list('department_id', 'name'))
+    GraphChange.objects.bulk_create([
+        _node_change(r.researcher_id, r.full_name, departments.get(r.department_id), r.title)
+        for r in researchers
+    ])
+
+
+def log_node_removed(researcher_id: int) -> None:
+    GraphChange.objects.create(entity=GraphChange.NODE, op=GraphChange.REMOVE, source_id=researcher_id)
+
+
+def _pair_weights(kind: str, group_id: int, researcher_id: int) -> List[Tuple[int, int]]:
+    """ researcher ile grubun (eski / yeni) diğer üyelerinin güncel ortak grup sayıları """
+    table, column = MEMBERSHIP_TABLES[kind]
+    sql = f"""
+        SELECT other.researcher_id, COUNT(mine.researcher_id)
+        FROM {table} other
+        LEFT JOIN {table} mine
+            ON mine.{column} = other.{column} AND mine.researcher_id = %s
+        WHERE other.researcher_id <> %s
+          AND other.researcher_id IN (SELECT researcher_id FROM {table} WHERE {column} = %s)
+        GROUP BY other.researcher_id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [researcher_id, researcher_id, group_id])
+        return cursor.fetchall()
+
+
+def membership_changed(kind: str, group_id: int, researcher_id: int, added: bool = True) -> None:
+    """
+    project_researcher / author_publication yazmasından sonra, aynı transaction
+    içinde çağrılır: etkilenen kenarların yeni ağırlıklarını günlüğe yazar ve
+    önbellekteki ağı günceller (bkz. core.graph.record_membership).
+    """
+    group_id, researcher_id = int(group_id), int(researcher_id)
+    changes = []
+    for other_id, weight in _pair_weights(kind, group_id, researcher_id):
+        source, target = sorted((researcher_id, other_id))
+        changes.append(GraphChange(
+            entity=GraphChange.EDGE,
+            op=GraphChange.UPSERT if weight else GraphChange.REMOVE,
+            source_id=source,
+            target_id=target,
+            kind=kind,
+            weight=weight or None,
+        ))
+    GraphChange.objects.bulk_create(changes)
+    record_membership(kind, group_id, researcher_id, added=added)
+
+
+def group_members(kind: str, group_id: int) -> List[int]:
+    """ Projenin (yayının) üyesi olan araştırmacılar """
+    table, column = MEMBERSHIP_TABLES[kind]
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT researcher_id FROM {table} WHERE {column} = %s", [group_id])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _shared_counts(kind: str, researcher_ids: List[int]) -> Dict[Tuple[int, int], int]:
+    """ researcher_ids içindeki çiftlerin (küçük id önce) güncel ortak grup sayıları """
+    table, column = MEMBERSHIP_TABLES[kind]
+    placeholders = ', '.join(['%s'] * len(researcher_ids))
+    sql = f"""
+        SELECT a.researcher_id, b.researcher_id, COUNT(*)
+        FROM {table} a
+        JOIN {table} b ON b.{column} = a.{column} AND b.researcher_id > a.researcher_id
+        WHERE a.researcher_id IN ({placeholders})
+          AND b.researcher_id IN ({placeholders})
+        GROUP BY a.researcher_id, b.researcher_id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, researcher_ids + researcher_ids)
+        return {(source, target): weight for source, target, weight in cursor.fetchall()}
+
+
+def group_removed(kind: str, group_id: int, researcher_ids: Iterable[int]) -> None:
+    """
+    Proje / yayın silindikten sonra, aynı transaction içinde çağrılır
+    (researcher_ids silinmeden önceki üyelerdir, bkz. group_members).
+    Üyelik satırları DB'de cascade ile silinmemişse burada silinir; üyeler
+    arasındaki her kenarın yeni ağırlığı (ortak başka grup yoksa REMOVE)
+    günlüğe yazılır. Önbellekteki ağ core.graph.forget_group ile güncellenir.
+    """
+    table, column = MEMBERSHIP_TABLES[kind]
+    group_id = int(group_id)
+    researcher_ids = sorted({int(r_id) for r_id in researcher_ids})
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} = %s", [group_id])
+
+    if len(researcher_ids) > 1:
+        weights = _shared_counts(kind, researcher_ids)
+        GraphChange.objects.bulk_create([
+            GraphChange(
+                entity=GraphChange.EDGE,
+                op=GraphChange.UPSERT if weights.get(pair) else GraphChange.REMOVE,
+                source_id=pair[0],
+                target_id=pair[1],
+                kind=kind,
+                weight=weights.get(pair),
+            )
+            for pair in combinations(researcher_ids, 2)
+        ])
+
+
+# ---------------------------------------------------------
+# OKUMA
+# ---------------------------------------------------------
+
+def _oldest_running_xact(cursor) -> Optional[int]:
+    """ Çalışan en eski transaction'ın id'si (veya sıradaki id); SQLite'ta None """
+    if connection.vendor != 'postgresql':
+        return None
+    cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+    return cursor.fetchone()[0]
+
+
+def settled_version() -> int:
+    """ txid'si bundan küçük eşit olan değişikliklerin hepsi commit edilmiş (veya geri alınmış) """
+    with connection.cursor() as cursor:
+        xmin = _oldest_running_xact(cursor)
+    if xmin is None:
+        return GraphChange.objects.aggregate(version=Max('txid'))['version'] or 0
+    return xmin - 1
+
+
+def network_etag() -> str:
+    """
+    Görünen (commit edilmiş) değişiklik kümesi değişince değişir: kesinleşmiş son
+    txid ve henüz kesinleşmemiş satır sayısı. Geç commit edilen bir transaction ya
+    ikinciyi artırır ya da kesinleşince birinciyi.
+    """
+    with connection.cursor() as cursor:
+        xmin = _oldest_running_xact(cursor)
+        if xmin is None:
+            return f'"network-{settled_version()}"'
+        cursor.execute(
+            """
+            SELECT (SELECT MAX(txid) FROM graph_change WHERE txid < %s),
+                   (SELECT COUNT(*) FROM graph_change WHERE txid >= %s)
+            """,
+            [xmin, xmin],
+        )
+        settled, unsettled = cursor.fetchone()
+    return f'"network-{settled or 0}-{unsettled}"'
+
+
+def changed_since(version: int) -> bool:
+    """ version'dan sonra (commit edilmiş) değişiklik var mı """
+    return GraphChange.objects.filter(txid__gt=version).exists()
+
+
+def if_none_match(request) -> Set[str]:
+    """ If-None-Match'teki ETag'ler (DRF ve düz Django isteği için aynı) """
+    return {tag.strip() for tag in request.headers.get('If-None-Match', '').split(',') if tag.strip()}
+
+
+def _as_dict(change: GraphChange) -> Dict[str, Any]:
+    item = {"version": change.txid, "entity": change.entity, "op": change.op}
+    if change.entity == GraphChange.NODE:
+        item["id"] = change.source_id
+        if change.data:
+            item.update(change.data)
+    else:
+        item.update({"from": change.source_id, "to": change.target_id, "type": change.kind})
+        if change.weight is not None:
+            item["value"] = change.weight
+    return item
+
+
+def changes_since(since: int, limit: int = MAX_CHANGES) -> Dict[str, Any]:
+    """
+    since'ten sonraki kesinleşmiş değişiklikler, commit sırasıyla. has_more ise
+    istemci dönen version ile tekrar sorar. Sayfalar transaction ortasında
+    bölünmez (limit'ten büyük tek transaction bütün olarak döner).
+    """
+    upto = settled_version()
+    changes = list(
+        GraphChange.objects
+        .filter(txid__gt=since, txid__lte=upto)
+        .order_by('txid', 'change_id')[:limit + 1]
+    )
+    has_more = len(changes) > limit
+    if has_more:
+        cut = changes[limit].txid
+        changes = [change for change in changes[:limit] if change.txid != cut]
+        if not changes:
+            changes = list(GraphChange.objects.filter(txid=cut).order_by('change_id'))
+    return {
+        "since": since,
+        "version": changes[-1].txid if has_more else max(since, upto),
+        "has_more": has_more,
+        "changes": [_as_dict(change) for change in changes],
+    }
@@ -0,0 +1,367 @@
+"""
+Embedding deposu.
+
+Her varlık (researcher, project, publication) için tek bir vektör tutulur.
+Vektörler metnin sha256 hash'i ile anahtarlanır; metin değişmedikçe model
+tekrar çalıştırılmaz. Öneri algoritması istek sırasında sadece bu depodan okur.
+"""
+import hashlib
+import importlib.util
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+
+from .models import EntityEmbedding, Project, Publication, Researcher
+
+# AI / NLP Kütüphaneleri
+# Model import sırasında DEĞİL, ilk semantic kullanımda yüklenir; böylece
+# migrate / collectstatic gibi komutlar torch yükleme maliyetini ödemez.
+# gunicorn --preload ile master process'te bir kez yüklenip worker'lara
+# copy-on-write paylaştırılabilir (bkz. gunicorn.conf.py, preload_model).
+AI_MODEL_NAME = getattr(settings, 'AI_MODEL_NAME', 'all-MiniLM-L6-v2')
+# Küçük ve hızlı bir model kullanıyoruz (all-MiniLM-L6-v2)
+# Bu model metinleri 384 boyutlu vektörlere çevirir.
+AI_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+if not AI_AVAILABLE:
+    print("⚠️ UYARI: sentence-transformers yüklü değil. Semantic Search çalışmayacak.")
+
+# bulk_create post_save göndermez: toplu yazmalardan sonra bu sinyal commit'te
+# gönderilir (kwargs: entity_type, entity_ids, vectors). ANN indeksi ve öneri
+# önbelleği core/signals.py'de güncellenir.
+embeddings_written = Signal()
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """ Modeli ilk çağrıda yükler; sonraki çağrılar aynı nesneyi döner. """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(AI_MODEL_NAME)
+                print("✅ AI Modeli Yüklendi: Semantic Search Aktif")
+    return _model
+
+
+def is_model_loaded() -> bool:
+    return _model is not None
+
+
+def preload_model() -> bool:
+    """
+    Fork öncesi (gunicorn master) çağrılmak için. Sadece ağırlıkları yükler,
+    inference çalıştırmaz: torch'un thread havuzu fork'tan önce başlatılırsa
+    worker'larda kilitlenmeye yol açabilir.
+    """
+    if not AI_AVAILABLE:
+        return False
+    get_model()
+    return True
+
+# Bundan kısa metinler anlamlı bir vektör üretmez (eski "len(bio) > 10" kuralı)
+MIN_TEXT_LENGTH = 10
+
+# Vektörü tutulan varlıklar: entity_type -> (model, metni taşıyan alan)
+EMBEDDED_ENTITIES = {
+    'researcher': (Researcher, 'bio'),
+    'project': (Project, 'summary'),
+    'publication': (Publication, 'title'),
+}
+
+
+def text_hash(text: Optional[str]) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def is_embeddable(text: Optional[str]) -> bool:
+    return bool(text) and len(text) > MIN_TEXT_LENGTH
+
+
+def encode_texts(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    """
+    Metin listesini (len(texts), dim) boyutlu float32 matrise çevirir.
+    Vektörler normalize edilir, böylece cosine benzerliği düz dot product olur.
+    """
+    vectors = get_model().encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+class EmbeddingBatcher:
+    """
+    Eş zamanlı gelen tekil encode isteklerini toplayıp tek bir batch halinde
+    modele verir. İstek en fazla max_wait_ms kadar (ya da batch dolana kadar)
+    bekler; çağırana bir Future döner.
+
+    Thread'ler ilk kullanımda başlatılır. Fork sonrası (gunicorn worker)
+    ebeveynin thread'leri yaşamadığı için her process kendi thread'lerini açar.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 5.0, threads: int = 1):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.threads = max(1, threads)
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._metrics_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            for i in range(self.threads):
+                threading.Thread(target=self._run, name=f"embedding-batcher-{i}", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future, time.monotonic()))
+        return future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        return self.submit(text).result(timeout)
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            deadline = batch[0][2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch) -> None:
+        started = time.monotonic()
+        waits = [started - enqueued for _, _, enqueued in batch]
+        with self._metrics_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, max(waits))
+
+        live = [(text, future) for text, future, _ in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        try:
+            vectors = encode_texts([text for text, _ in live], batch_size=self.max_batch_size)
+        except Exception as exc:
+            for _, future in live:
+                future.set_exception(exc)
+            return
+        for (_, future), vector in zip(live, vectors):
+            future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            batches, items = self._batches, self._items
+            return {
+                "batches": batches,
+                "items": items,
+                "queue_depth": self._queue.qsize(),
+                "avg_batch_size": round(items / batches, 2) if batches else 0.0,
+                "avg_batch_fill": round(items / (batches * self.max_batch_size), 3) if batches else 0.0,
+                "avg_queue_latency_ms": round(1000 * self._wait_total / items, 2) if items else 0.0,
+                "max_queue_latency_ms": round(1000 * self._wait_max, 2),
+            }
+
+
+EMBEDDING_BATCHER = EmbeddingBatcher(
+    max_batch_size=getattr(settings, 'EMBEDDING_BATCH_SIZE', 32),
+    max_wait_ms=getattr(settings, 'EMBEDDING_BATCH_WAIT_MS', 5),
+    threads=getattr(settings, 'EMBEDDING_BATCH_THREADS', 1),
+)
+
+
+def vector_from_bytes(raw) -> np.ndarray:
+    return np.frombuffer(bytes(raw), dtype=np.float32)
+
+
+def load_embeddings(
+    entity_type: str,
+    entity_ids: Optional[Iterable[int]] = None,
+) -> Dict[int, Tuple[str, np.ndarray]]:
+    """
+    Depodaki vektörleri {entity_id: (text_hash, vektör)} olarak döner.
+    Başka bir modelle üretilmiş (eski) vektörler atlanır.
+    """
+    if not AI_AVAILABLE:
+        return {}
+
+    qs = EntityEmbedding.objects.filter(entity_type=entity_type, model_name=AI_MODEL_NAME)
+    if entity_ids is not None:
+        qs = qs.filter(entity_id__in=list(entity_ids))
+
+    data = {}
+    for entity_id, t_hash, raw in qs.values_list('entity_id', 'text_hash', 'vector').iterator():
+        data[entity_id] = (t_hash, vector_from_bytes(raw))
+    return data
+
+
+def get_embedding(entity_type: str, entity_id: int, text: Optional[str]) -> Optional[np.ndarray]:
+    """
+    Tek bir varlığın güncel vektörü. Depoda yoksa veya metin değişmişse
+    model sadece bu metin için çalıştırılır ve sonuç depoya yazılır.
+    """
+    if not AI_AVAILABLE or not is_embeddable(text):
+        return None
+    return store_embedding(entity_type, entity_id, text)
+
+
+def store_embedding(entity_type: str, entity_id: int, text: Optional[str]) -> Optional[np.ndarray]:
+    """
+    Varlığın vektörünü günceller. Metin hash'i depodakiyle aynıysa model çalışmaz.
+    Metin artık vektörlenebilir değilse eski kayıt silinir.
+    """
+    if not AI_AVAILABLE:
+        return None
+
+    if not is_embeddable(text):
+        EntityEmbedding.objects.filter(entity_type=entity_type, entity_id=entity_id).delete()
+        return None
+
+    t_hash = text_hash(text)
+    stored = load_embeddings(entity_type, [entity_id]).get(entity_id)
+    if stored is not None and stored[0] == t_hash:
+        return stored[1]
+
+    # Tekil encode'lar ortak kuyruktan batch'lenir (eş zamanlı istekler birleşir)
+    vector = EMBEDDING_BATCHER.encode(text)
+    _save_embedding(entity_type, entity_id, t_hash, vector)
+    return vector
+
+
+def get_embeddings(entity_type: str, texts: Dict[int, Optional[str]]) -> Dict[int, np.ndarray]:
+    """
+    get_embedding'in toplu hali: {entity_id: metin} -> {entity_id: vektör}.
+    Depoda olmayan / metni değişmiş olanlar kuyruğa birlikte verilir, yani
+    tek bir model çağrısında encode edilir. Vektörlenemeyen metinler dönmez.
+    """
+    texts = {entity_id: text for entity_id, text in texts.items() if is_embeddable(text)}
+    if not AI_AVAILABLE or not texts:
+        return {}
+
+    stored = load_embeddings(entity_type, texts.keys())
+    result, pending = {}, []
+    for entity_id, text in texts.items():
+        t_hash = text_hash(text)
+        current = stored.get(entity_id)
+        if current is not None and current[0] == t_hash:
+            result[entity_id] = current[1]
+        else:
+            pending.append((entity_id, t_hash, EMBEDDING_BATCHER.submit(text)))
+
+    for entity_id, t_hash, future in pending:
+        vector = future.result()
+        _save_embedding(entity_type, entity_id, t_hash, vector)
+        result[entity_id] = vector
+    return result
+
+
+def _save_embedding(entity_type: str, entity_id: int, t_hash: str, vector: np.ndarray) -> None:
+    EntityEmbedding.objects.update_or_create(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        defaults={
+            "text_hash": t_hash,
+            "model_name": AI_MODEL_NAME,
+            "dimension": int(vector.shape[0]),
+            "vector": vector.tobytes(),
+        },
+    )
+
+
+def delete_embedding(entity_type: str, entity_id: int) -> None:
+    EntityEmbedding.objects.filter(entity_type=entity_type, entity_id=entity_id).delete()
+
+
+def sync_embeddings(
+    entity_type: str,
+    items: Iterable[Tuple[int, Optional[str]]],
+    batch_size: int = 64,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    Toplu doldurma (backfill): (entity_id, metin) çiftlerini alır, sadece
+    yeni veya metni değişmiş olanları batch halinde encode edip depoya yazar.
+    """
+    counts = {"encoded": 0, "unchanged": 0, "skipped": 0}
+    if not AI_AVAILABLE:
+        return counts
+
+    stored = {} if force else {
+        entity_id: t_hash for entity_id, (t_hash, _) in load_embeddings(entity_type).items()
+    }
+
+    pending = []
+    for entity_id, text in items:
+        if not is_embeddable(text):
+            counts["skipped"] += 1
+            continue
+        t_hash = text_hash(text)
+        if stored.get(entity_id) == t_hash:
+            counts["unchanged"] += 1
+            continue
+        pending.append((entity_id, text, t_hash))
+        if len(pending) >= batch_size:
+            counts["encoded"] += _write_batch(entity_type, pending, batch_size)
+            pending = []
+
+    if pending:
+        counts["encoded"] += _write_batch(entity_type, pending, batch_size)
+    return counts
+
+
+def _write_batch(entity_type: str, pending: List[Tuple[int, str, str]], batch_size: int) -> int:
+    vectors = encode_texts([text for _, text, _ in pending], batch_size=batch_size)
+    objs = [
+        EntityEmbedding(
+            entity_type=entity_type,
+            entity_id=entity_id,
+            text_hash=t_hash,
+            model_name=AI_MODEL_NAME,
+            dimension=int(vector.shape[0]),
+            vector=vector.tobytes(),
+        )
+        for (entity_id, _, t_hash), vector in zip(pending, vectors)
+    ]
+    EntityEmbedding.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=['entity_type', 'entity_id'],
+        update_fields=['text_hash', 'model_name', 'dimension', 'vector', 'updated_at'],
+    )
+    entity_ids = [entity_id for entity_id, _, _ in pending]
+    transaction.on_commit(lambda: embeddings_written.send(
+        sender=EntityEmbedding, entity_type=entity_type, entity_ids=entity_ids, vectors=vectors,
+    ))
+    return len(objs)
@@ -0,0 +1,148 @@
+"""
+Tüm işbirliği ağının dosya olarak dışa aktarımı (Gephi vb. ile çevrimdışı analiz).
+
+Düğümler ve kenarlar sunucu taraflı cursor'larla (PostgreSQL'de named cursor)
+parça parça okunur ve seçilen biçimde artımlı olarak yazılır; ne sorgu sonucu
+ne de çıktı belleğe alınır. Ağ ne kadar büyük olursa olsun bellek kullanımı sabittir.
+
+Biçimler: ndjson (satır başına bir düğüm / kenar), graphml, gexf (1.3).
+Kullanım: GET /api/network/export/?fmt=graphml veya `manage.py export_network`.
+"""
+import json
+from typing import Iterable, Iterator, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Researcher
+from .queries import NETWORK_EDGE_SQL
+
+NDJSON = 'ndjson'
+GRAPHML = 'graphml'
+GEXF = 'gexf'
+
+# biçim -> (Content-Type, dosya uzantısı)
+EXPORT_FORMATS = {
+    NDJSON: ('application/x-ndjson', 'ndjson'),
+    GRAPHML: ('application/graphml+xml', 'graphml'),
+    GEXF: ('application/gexf+xml', 'gexf'),
+}
+
+CHUNK_SIZE = getattr(settings, 'NETWORK_EXPORT_CHUNK_SIZE', 2000)     # Cursor'dan bir seferde okunan satır
+BUFFER_SIZE = 64 * 1024                                                 # Yanıta bir seferde yazılan karakter
+
+Node = Tuple[int, str, str, str]
+Edge = Tuple[int, int, int]
+
+
+def iter_nodes(chunk_size: int = CHUNK_SIZE) -> Iterator[Node]:
+    """ (id, ad, departman, unvan); /api/network/ düğümleriyle aynı alanlar """
+    rows = (
+        Researcher.objects
+        .order_by('researcher_id')
+        .values_list('researcher_id', 'full_name', 'department__name', 'title')
+        .iterator(chunk_size=chunk_size)
+    )
+    for researcher_id, full_name, department, title in rows:
+        yield researcher_id, full_name, department or "Unknown", title or ""
+
+
+def iter_edges(kind: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Edge]:
+    """ (küçük id, büyük id, ortak proje / yayın sayısı) """
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(NETWORK_EDGE_SQL[kind])
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield from rows
+
+
+def _buffered(parts: Iterable[str]) -> Iterator[str]:
+    """ Küçük parçaları ~BUFFER_SIZE'lık bloklar halinde birleştirir """
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= BUFFER_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _ndjson(chunk_size: int) -> Iterator[str]:
+    for researcher_id, label, group, title in iter_nodes(chunk_size):
+        node = {"type": "node", "id": researcher_id, "label": label, "group": group, "title": title}
+        yield json.dumps(node, ensure_ascii=False) + "\n"
+    for kind in NETWORK_EDGE_SQL:
+        for source, target, weight in iter_edges(kind, chunk_size):
+            edge = {"type": "edge", "from": source, "to": target, "value": weight, "kind": kind}
+            yield json.dumps(edge, ensure_ascii=False) + "\n"
+
+
+def _graphml(chunk_size: int) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+        '  <key id="group" for="node" attr.name="group" attr.type="string"/>\n'
+        '  <key id="title" for="node" attr.name="title" attr.type="string"/>\n'
+        '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+        '  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n'
+        '  <graph id="collaboration" edgedefault="undirected">\n'
+    )
+    for researcher_id, label, group, title in iter_nodes(chunk_size):
+        yield (
+            f'    <node id="r{researcher_id}">'
+            f'<data key="label">{escape(label)}</data>'
+            f'<data key="group">{escape(group)}</data>'
+            f'<data key="title">{escape(title)}</data></node>\n'
+        )
+    for kind in NETWORK_EDGE_SQL:
+        for source, target, weight in iter_edges(kind, chunk_size):
+            yield (
+                f'    <edge source="r{source}" target="r{target}">'
+                f'<data key="weight">{weight}</data><data key="type">{kind}</data></edge>\n'
+            )
+    yield '  </graph>\n</graphml>\n'
+
+
+def _gexf(chunk_size: int) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gexf xmlns="http://gexf.net/1.3" version="1.3">\n'
+        '  <graph mode="static" defaultedgetype="undirected">\n'
+        '    <attributes class="node">\n'
+        '      <attribute id="group" title="group" type="string"/>\n'
+        '      <attribute id="title" title="title" type="string"/>\n'
+        '    </attributes>\n'
+        '    <attributes class="edge">\n'
+        '      <attribute id="type" title="type" type="string"/>\n'
+        '    </attributes>\n'
+        '    <nodes>\n'
+    )
+    for researcher_id, label, group, title in iter_nodes(chunk_size):
+        yield (
+            f'      <node id="r{researcher_id}" label={quoteattr(label)}><attvalues>'
+            f'<attvalue for="group" value={quoteattr(group)}/>'
+            f'<attvalue for="title" value={quoteattr(title)}/></attvalues></node>\n'
+        )
+    yield '    </nodes>\n    <edges>\n'
+    for kind in NETWORK_EDGE_SQL:
+        # Proje ve yayın kenarları aynı çift için ayrı (paralel) kenarlardır
+        for source, target, weight in iter_edges(kind, chunk_size):
+            yield (
+                f'      <edge id="{kind}-{source}-{target}" source="r{source}" target="r{target}" weight="{weight}">'
+                f'<attvalues><attvalue for="type" value="{kind}"/></attvalues></edge>\n'
+            )
+    yield '    </edges>\n  </graph>\n</gexf>\n'
+
+
+_WRITERS = {NDJSON: _ndjson, GRAPHML: _graphml, GEXF: _gexf}
+
+
+def export_network(fmt: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """ Ağı fmt biçiminde metin blokları olarak üretir """
+    return _buffered(_WRITERS[fmt](chunk_size))
@@ -0,0 +1,457 @@
+"""
+İşbirliği ağı (collaboration graph).
+
+project_researcher ve author_publication tablolarındaki üyelikler tek
+geçişte okunur (self-join yok). Ağırlıklı komşuluk W = B · Bᵀ olarak SciPy
+CSR matrisinde tutulur; B araştırmacı x proje (veya yayın) üyelik matrisidir.
+W[i, j] = i ile j'nin ortak proje (yayın) sayısı.
+
+Yakınlık için kişiselleştirilmiş PageRank (random walk with restart) aynı
+matris üzerinde seyrek güç iterasyonu ile hesaplanır ve kaynak başına önbelleğe alınır.
+
+Üyelik eklenip çıkarıldığında matris baştan kurulmaz; değişiklik sadece o
+projenin diğer üyeleriyle olan kenarlara delta olarak uygulanır.
+"""
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from scipy import sparse
+
+from .snapshot import VersionedSnapshot
+
+PROJECT = 'project'
+PUBLICATION = 'publication'
+
+# kenar türü -> (üyelik tablosu, grup kolonu)
+MEMBERSHIP_TABLES = {
+    PROJECT: ('project_researcher', 'project_id'),
+    PUBLICATION: ('author_publication', 'publication_id'),
+}
+
+# Kişiselleştirilmiş PageRank: her adımda kaynağa geri dönme olasılığı,
+# yakınsama eşiği (L1) / bu değerin altındaki skorlar atılır, en fazla iterasyon,
+# ağ değişmedikçe saklanan kaynak sayısı
+PPR_RESTART = getattr(settings, 'PPR_RESTART', 0.15)
+PPR_TOLERANCE = getattr(settings, 'PPR_TOLERANCE', 1e-6)
+PPR_MAX_ITER = getattr(settings, 'PPR_MAX_ITER', 100)
+PPR_CACHE_SIZE = getattr(settings, 'PPR_CACHE_SIZE', 1024)
+
+
+class CollaborationGraph:
+    """
+    Satır/sütunlar araştırmacılardır; sıra ilk görülme sırasıdır ve sadece büyür.
+    Okuyucular her zaman değişmez (immutable) bir CSR kopyası alır.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self.index: Dict[int, int] = {}          # researcher_id -> satır
+        self.ids: List[int] = []                 # satır -> researcher_id
+        # kind -> grup_id -> {satır}
+        self.members: Dict[str, Dict[int, Set[int]]] = {kind: defaultdict(set) for kind in MEMBERSHIP_TABLES}
+        # kind -> satır -> {grup_id}
+        self.groups: Dict[str, Dict[int, Set[int]]] = {kind: defaultdict(set) for kind in MEMBERSHIP_TABLES}
+        self._weights = {kind: sparse.csr_matrix((0, 0)) for kind in MEMBERSHIP_TABLES}
+        self._pending = {kind: ([], [], []) for kind in MEMBERSHIP_TABLES}
+        self._adjacency: Optional[sparse.csr_matrix] = None
+        self._transition: Optional[sparse.csr_matrix] = None
+        # kaynak satırları -> (satırlar, skorlar); ağ değişince boşaltılır
+        self._ppr_cache: 'OrderedDict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+
+    # ---------------------------------------------------------
+    # KURULUM
+    # ---------------------------------------------------------
+
+    @classmethod
+    def load(cls) -> 'CollaborationGraph':
+        graph = cls()
+        with connection.cursor() as cursor:
+            for kind, (table, column) in MEMBERSHIP_TABLES.items():
+                cursor.execute(f"SELECT {column}, researcher_id FROM {table}")
+                for group_id, researcher_id in cursor.fetchall():
+                    row = graph._row(researcher_id)
+                    graph.members[kind][group_id].add(row)
+                    graph.groups[kind][row].add(group_id)
+
+        n = len(graph.ids)
+        for kind in MEMBERSHIP_TABLES:
+            graph._weights[kind] = _co_membership(graph.members[kind], n)
+        return graph
+
+    def _row(self, researcher_id: int) -> int:
+        row = self.index.get(researcher_id)
+        if row is None:
+            row = len(self.ids)
+            self.index[researcher_id] = row
+            self.ids.append(researcher_id)
+        return row
+
+    # ---------------------------------------------------------
+    # ARTIMLI GÜNCELLEME
+    # ---------------------------------------------------------
+
+    def add_membership(self, kind: str, group_id: int, researcher_id: int) -> bool:
+        with self._lock:
+            row = self._row(researcher_id)
+            members = self.members[kind][group_id]
+            if row in members:
+                return False
+            self._stage(kind, row, members, +1.0)
+            members.add(row)
+            self.groups[kind][row].add(group_id)
+            self._touch()
+            return True
+
+    def remove_membership(self, kind: str, group_id: int, researcher_id: int) -> bool:
+        with self._lock:
+            row = self.index.get(researcher_id)
+            members = self.members[kind].get(group_id)
+            if row is None or not members or row not in members:
+                return False
+            members.discard(row)
+            self.groups[kind][row].discard(group_id)
+            self._stage(kind, row, members, -1.0)
+            self._touch()
+            return True
+
+    def remove_researcher(self, researcher_id: int) -> None:
+        with self._lock:
+            row = self.index.get(researcher_id)
+            if row is None:
+                return
+            for kind in MEMBERSHIP_TABLES:
+                for group_id in list(self.groups[kind].get(row, ())):
+                    self.remove_membership(kind, group_id, researcher_id)
+
+    def remove_group(self, kind: str, group_id: int) -> None:
+        """ Proje / yayın silindi: bütün üyelikleri çıkarılır """
+        with self._lock:
+            for row in list(self.members[kind].get(group_id, ())):
+                self.remove_membership(kind, group_id, self.ids[row])
+            self.members[kind].pop(group_id, None)
+
+    def _stage(self, kind: str, row: int, others: Set[int], delta: float) -> None:
+        rows, cols, vals = self._pending[kind]
+        for other in others:
+            rows.extend((row, other))
+            cols.extend((other, row))
+            vals.extend((delta, delta))
+
+    def _touch(self) -> None:
+        self.version += 1
+        self._adjacency = None
+        self._transition = None
+        self._ppr_cache.clear()
+
+    # ---------------------------------------------------------
+    # OKUMA
+    # ---------------------------------------------------------
+
+    def weights(self, kind: str) -> sparse.csr_matrix:
+        """ kind türündeki ağırlıklı komşuluk matrisi (bekleyen deltalar uygulanmış) """
+        with self._lock:
+            n = len(self.ids)
+            weights = self._weights[kind]
+            rows, cols, vals = self._pending[kind]
+            if rows or weights.shape[0] != n:
+                coo = weights.tocoo()
+                weights = sparse.csr_matrix(
+                    (
+                        np.concatenate([coo.data, np.asarray(vals, dtype=np.float64)]),
+                        (
+                            np.concatenate([coo.row, np.asarray(rows, dtype=np.int64)]),
+                            np.concatenate([coo.col, np.asarray(cols, dtype=np.int64)]),
+                        ),
+                    ),
+                    shape=(n, n),
+                )
+                weights.sum_duplicates()
+                weights.eliminate_zeros()
+                self._weights[kind] = weights
+                self._pending[kind] = ([], [], [])
+            return weights
+
+    def adjacency(self) -> sparse.csr_matrix:
+        """ Proje VEYA yayın ortaklığı olan çiftler için 0/1 matris """
+        with self._lock:
+            if self._adjacency is None:
+                total = self.weights(PROJECT) + self.weights(PUBLICATION)
+                adjacency = (total > 0).astype(np.float64).tocsr()
+                adjacency.sort_indices()
+                self._adjacency = adjacency
+            return self._adjacency
+
+    def neighbours(self, row: int) -> np.ndarray:
+        return _row_slice(self.adjacency(), row)
+
+    def common_neighbours(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        row'un 2 adım uzağındaki herkes ve ortak komşu sayıları (triadic closure).
+        A · A[row]ᵀ çarpımının sıfır olmayan kısmı; maliyet sadece komşuların
+        derece toplamı kadardır, ağın büyüklüğüne bağlı değildir.
+        Dönen satırlar graph satır sırasındadır ve row'un kendisini de içerebilir.
+        """
+        return self.second_hop(self.neighbours(row))
+
+    def second_hop(self, partners: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ partners'ın komşuları ve her birinin partners içindeki komşu sayısı """
+        if not len(partners):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        second_hop = self.adjacency()[partners].indices
+        rows, counts = np.unique(second_hop, return_counts=True)
+        return rows.astype(np.int64), counts
+
+    def neighbourhood(self, row: int, depth: int, max_nodes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        row'dan en fazla depth adımda ulaşılan satırlar (row dahil, BFS sırasıyla),
+        her birinin uzaklığı ve kesilip kesilmediği. max_nodes aşılırsa son katmandan
+        önceki katmana en çok bağı olanlar alınır. Maliyet dönen alt ağın kenar sayısı kadardır.
+        """
+        adjacency = self.adjacency()
+        layers = [np.array([row], dtype=np.int64)]
+        seen = layers[0]
+        truncated = False
+        for _ in range(depth):
+            reached, links = np.unique(adjacency[layers[-1]].indices, return_counts=True)
+            new = ~np.isin(reached, seen)
+            reached, links = reached[new].astype(np.int64), links[new]
+            if not len(reached):
+                break
+            room = None if max_nodes is None else max_nodes - len(seen)
+            if room is not None and len(reached) > room:
+                reached = np.sort(reached[np.argsort(-links, kind='stable')[:max(room, 0)]])
+                truncated = True
+            layers.append(reached)
+            seen = np.concatenate([seen, reached])
+            if truncated:
+                break
+
+        hops = np.repeat(np.arange(len(layers)), [len(layer) for layer in layers])
+        return seen, hops, truncated
+
+    def degrees(self, rows: np.ndarray) -> np.ndarray:
+        """ Satırların komşu sayısı (proje veya yayın ortaklığı) """
+        adjacency = self.adjacency()
+        rows = np.asarray(rows, dtype=np.int64)
+        return adjacency.indptr[rows + 1] - adjacency.indptr[rows]
+
+    def subgraph_edges(self, rows: np.ndarray) -> List[Tuple[str, int, int, int]]:
+        """
+        Sadece rows arasındaki kenarlar: [(tür, researcher_id, researcher_id, ağırlık)].
+        Çiftin küçük id'lisi önce gelir (/api/network/ ile aynı).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        ids = self.ids
+        edges = []
+        for kind in MEMBERSHIP_TABLES:
+            sub = self.weights(kind)[rows][:, rows].tocoo()
+            for i, j, weight in zip(sub.row.tolist(), sub.col.tolist(), sub.data.tolist()):
+                source, target = ids[rows[i]], ids[rows[j]]
+                if source < target:
+                    edges.append((kind, source, target, int(weight)))
+        return edges
+
+    def shortest_path(self, source: int, target: int, max_hops: int) -> Optional[List[int]]:
+        """
+        source'tan target'a en kısa yol (satırlar, iki uç dahil); max_hops adımda
+        yoksa None. İki uçtan dönüşümlü, katman katman BFS: her seferinde küçük
+        olan sınır genişletilir, sınırlar buluştuğunda durulur. Tek yönlü BFS'e
+        göre çok daha az düğüm ziyaret edilir (her iki taraf yarı derinliğe iner).
+        """
+        if source == target:
+            return [source]
+        adjacency = self.adjacency()
+        n = adjacency.shape[0]
+        if source >= n or target >= n:
+            return None     # Adjacency'den sonra eklenmiş, henüz kenarı yok
+
+        UNSEEN = -2
+        parents = [np.full(n, UNSEEN, dtype=np.int64), np.full(n, UNSEEN, dtype=np.int64)]
+        parents[0][source] = parents[1][target] = -1
+        fronts = [np.array([source], dtype=np.int64), np.array([target], dtype=np.int64)]
+
+        for _ in range(max_hops):
+            # Komşu sayısı toplamı küçük olan taraf genişletilir
+            side = 0 if self.degrees(fronts[0]).sum() <= self.degrees(fronts[1]).sum() else 1
+            front, parent, other = fronts[side], parents[side], parents[1 - side]
+
+            sub = adjacency[front]
+            reached = sub.indices.astype(np.int64)
+            via = np.repeat(front, np.diff(sub.indptr))
+            new = parent[reached] == UNSEEN
+            reached, first = np.unique(reached[new], return_index=True)
+            if not len(reached):
+                return None     # Bu taraftan ulaşılacak yer kalmadı: bağlantı yok
+            parent[reached] = via[new][first]
+
+            met = reached[other[reached] != UNSEEN]
+            if len(met):
+                return _join_paths(parents, int(met[0]))
+            fronts[side] = reached
+        return None
+
+    def shared_groups(self, row: int, other: int) -> Dict[str, List[int]]:
+        """ İki satırın ortak proje / yayın id'leri """
+        with self._lock:
+            return {
+                kind: sorted(self.groups[kind].get(row, set()) & self.groups[kind].get(other, set()))
+                for kind in MEMBERSHIP_TABLES
+            }
+
+    def transition(self) -> sparse.csr_matrix:
+        """
+        Rastgele yürüyüşün geçiş matrisinin transpozu Pᵀ; P = D⁻¹ W ve
+        W = ortak proje + ortak yayın sayısı (çok ortak işi olana daha sık gidilir).
+        """
+        with self._lock:
+            if self._transition is None:
+                total = (self.weights(PROJECT) + self.weights(PUBLICATION)).tocsr()
+                degree = np.asarray(total.sum(axis=1)).ravel()
+                inverse = np.divide(1.0, degree, out=np.zeros_like(degree), where=degree > 0)
+                self._transition = (sparse.diags(inverse) @ total).T.tocsr()
+            return self._transition
+
+    def personalized_pagerank(self, sources: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        sources satırlarından başlayan random walk with restart'ın durağan
+        dağılımı: (satırlar, skorlar). Skorların toplamı ~1'dir; PPR_TOLERANCE
+        altındakiler dönmez. Sonuç ağ değişene kadar kaynak kümesi başına saklanır.
+        """
+        key = tuple(sorted({int(source) for source in sources}))
+        if not key:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        with self._lock:
+            cached = self._ppr_cache.get(key)
+            if cached is not None:
+                self._ppr_cache.move_to_end(key)
+                return cached
+            version = self.version
+            transition = self.transition()
+
+        result = _power_iteration(transition, key)
+
+        with self._lock:
+            # Hesaplama sırasında ağ değiştiyse sonuç eskidir, saklanmaz
+            if self.version == version:
+                self._ppr_cache[key] = result
+                while len(self._ppr_cache) > PPR_CACHE_SIZE:
+                    self._ppr_cache.popitem(last=False)
+        return result
+
+    def rows_for(self, researcher_ids: np.ndarray) -> np.ndarray:
+        """ researcher_id dizisi -> graph satırları (ağda olmayanlar için -1) """
+        index = self.index
+        return np.fromiter(
+            (index.get(r_id, -1) for r_id in researcher_ids.tolist()),
+            dtype=np.int64,
+            count=len(researcher_ids),
+        )
+
+
+def _row_slice(matrix: sparse.csr_matrix, row: int) -> np.ndarray:
+    if row >= matrix.shape[0]:
+        return np.empty(0, dtype=matrix.indices.dtype)
+    return matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+
+
+def _join_paths(parents: List[np.ndarray], meeting: int) -> List[int]:
+    """ Buluşma noktasından iki yönün parent zincirlerini birleştirir """
+    head, row = [], meeting
+    while row != -1:
+        head.append(row)
+        row = int(parents[0][row])
+    tail, row = [], int(parents[1][meeting])
+    while row != -1:
+        tail.append(row)
+        row = int(parents[1][row])
+    return head[::-1] + tail
+
+
+def _power_iteration(transition: sparse.csr_matrix, sources: Tuple[int, ...]) -> Tuple[np.ndarray, np.ndarray]:
+    """ r = α·s + (1-α)·Pᵀr; komşusu olmayanlardan düşen olasılık da kaynağa döner """
+    restart = np.zeros(transition.shape[0], dtype=np.float64)
+    restart[list(sources)] = 1.0 / len(sources)
+
+    scores = restart
+    for _ in range(PPR_MAX_ITER):
+        walked = (1.0 - PPR_RESTART) * (transition @ scores)
+        walked += (1.0 - walked.sum()) * restart
+        converged = np.abs(walked - scores).sum() < PPR_TOLERANCE
+        scores = walked
+        if converged:
+            break
+
+    rows = np.flatnonzero(scores >= PPR_TOLERANCE)
+    return rows.astype(np.int64), scores[rows]
+
+
+def _co_membership(members: Dict[int, Set[int]], n: int) -> sparse.csr_matrix:
+    """ W = B · Bᵀ (köşegen hariç) """
+    rows, cols = [], []
+    for col, group_rows in enumerate(members.values()):
+        rows.extend(group_rows)
+        cols.extend([col] * len(group_rows))
+
+    incidence = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+        shape=(n, len(members)),
+    )
+    weights = (incidence @ incidence.T).tocsr()
+    weights = (weights - sparse.diags(weights.diagonal())).tocsr()
+    weights.eliminate_zeros()
+    return weights
+
+
+# Worker başına tek kopya. Aynı process'teki yazmalar record_membership ile
+# anında uygulanır; diğer process'lerin yazmaları için max_age sonunda baştan okunur.
+COLLABORATION_GRAPH = VersionedSnapshot(
+    CollaborationGraph.load,
+    max_age=getattr(settings, 'COLLABORATION_GRAPH_MAX_AGE', 900),
+)
+
+
+def get_collaboration_graph() -> CollaborationGraph:
+    return COLLABORATION_GRAPH.get()
+
+
+def record_membership(kind: str, group_id: int, researcher_id: int, added: bool = True) -> None:
+    """
+    project_researcher / author_publication yazmalarından sonra çağrılır.
+    Ağ henüz yüklenmemişse bir şey yapmaya gerek yok (ilk okumada DB'den gelir).
+    """
+    def apply():
+        graph = COLLABORATION_GRAPH.peek()
+        if graph is None:
+            return
+        if added:
+            graph.add_membership(kind, int(group_id), int(researcher_id))
+        else:
+            graph.remove_membership(kind, int(group_id), int(researcher_id))
+
+    # Transaction geri alınırsa ağ da değişmemiş olmalı
+    transaction.on_commit(apply)
+
+
+def forget_researcher(researcher_id: int) -> None:
+    def apply():
+        graph = COLLABORATION_GRAPH.peek()
+        if graph is not None:
+            graph.remove_researcher(researcher_id)
+
+    transaction.on_commit(apply)
+
+
+def forget_group(kind: str, group_id: int) -> None:
+    def apply():
+        graph = COLLABORATION_GRAPH.peek()
+        if graph is not None:
+            graph.remove_group(kind, int(group_id))
+
+    transaction.on_commit(apply)
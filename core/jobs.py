@@ -0,0 +1,284 @@
+"""
+Veritabanı tabanlı hafif iş kuyruğu (Redis/Celery gibi harici bir broker gerekmez).
+
+HTTP isteğinin beklemesi gerekmeyen işler (otomatik etiketleme, embedding
+hesabı, öneri hesabı) `job` tablosuna yazılır; `python manage.py run_jobs`
+worker'ı bunları sırayla çalıştırır. İş satırı, onu oluşturan transaction ile
+birlikte commit edilir: worker yarım kalmış (rollback olmuş) bir kaydı görmez
+ve commit'ten önce işe başlamaz.
+
+Birden fazla worker çalışabilir: PostgreSQL'de iş SELECT ... FOR UPDATE
+SKIP LOCKED ile alınır, aynı işi iki worker almaz. Çalışan iş her
+JOBS_HEARTBEAT_INTERVAL saniyede heartbeat_at'i günceller; sadece heartbeat'i
+JOBS_STALE_AFTER saniyedir gelmeyen (worker'ı ölmüş) iş başka bir worker'a
+verilir. Eski worker yine de biterse sonucu yazılmaz (attempts ile kontrol).
+
+Deploy'da worker gunicorn worker'larının içinde thread olarak çalışır
+(bkz. gunicorn.conf.py, JOBS_WORKER_THREADS). Worker olmadan geliştirme yapmak
+için JOBS_RUN_INLINE = True: işler commit'ten hemen sonra aynı process'te
+çalıştırılır.
+"""
+import hashlib
+import json
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .analytics import run_analysis
+from .embeddings import store_embedding, sync_embeddings
+from .models import Job
+from .services import get_collaboration_suggestions, invalidate_feature_snapshot
+from .tagging import TAGGED_ENTITIES, get_tag_matcher, tag_entities, tag_entity
+
+RUN_INLINE = getattr(settings, 'JOBS_RUN_INLINE', False)
+MAX_ATTEMPTS = getattr(settings, 'JOBS_MAX_ATTEMPTS', 3)
+RETRY_DELAY = getattr(settings, 'JOBS_RETRY_DELAY', 10)          # sn; her denemede iki katına çıkar
+HEARTBEAT_INTERVAL = getattr(settings, 'JOBS_HEARTBEAT_INTERVAL', 30)   # sn
+STALE_AFTER = getattr(settings, 'JOBS_STALE_AFTER', 120)          # sn; heartbeat'i gelmeyen iş geri alınır
+ERROR_MAX_LENGTH = 200      # job.error (API'de görünür); traceback sadece logda
+
+logger = logging.getLogger(__name__)
+
+AUTO_TAG = 'auto_tag'
+EMBEDDING = 'embedding'
+ONBOARD_ANALYSIS = 'onboard_analysis'
+BULK_ANALYSIS = 'bulk_analysis'
+GRAPH_ANALYTICS = 'graph_analytics'
+
+HANDLERS: Dict[str, Callable[..., Any]] = {}
+
+
+def job_handler(kind: str):
+    """ İş türünü çalıştıracak fonksiyonu kaydeder; fonksiyon payload'u keyword olarak alır """
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def _dedup_key(kind: str, payload: Dict[str, Any]) -> str:
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return f"{kind}:{digest}"
+
+
+def enqueue(kind: str, **payload) -> Job:
+    """
+    İşi kuyruğa ekler. Aynı tür ve payload ile bekleyen bir iş varsa yenisi
+    açılmaz, o döner (örn. art arda kaydedilen bir araştırmacı tek kez etiketlenir).
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Bilinmeyen iş türü: {kind}")
+
+    # (dedup_key) WHERE status = 'pending' unique index'i eş zamanlı iki enqueue'da
+    # da tek satır bırakır; get_or_create çakışmada var olanı okur
+    job, _ = Job.objects.get_or_create(
+        dedup_key=_dedup_key(kind, payload),
+        status=Job.PENDING,
+        defaults={"kind": kind, "payload": payload, "run_after": timezone.now()},
+    )
+
+    if RUN_INLINE:
+        job_id = job.job_id
+        transaction.on_commit(lambda: run_job_by_id(job_id))
+    return job
+
+
+def claim_next() -> Optional[Job]:
+    """ Sıradaki çalıştırılabilir işi 'running' yapıp döner; yoksa None """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Job.PENDING, run_after__lte=now)
+            .order_by('job_id')
+            .first()
+        )
+        if job is None:
+            # Çalışırken ölen worker'ların işleri (heartbeat'i kesilmiş)
+            job = (
+                Job.objects
+                .select_for_update(skip_locked=True)
+                .alias(last_seen=Coalesce('heartbeat_at', 'started_at'))
+                .filter(status=Job.RUNNING, last_seen__lt=now - timedelta(seconds=STALE_AFTER))
+                .order_by('job_id')
+                .first()
+            )
+        if job is None:
+            return None
+        _start(job, now)
+    return job
+
+
+def _start(job: Job, now) -> None:
+    job.status = Job.RUNNING
+    job.attempts += 1
+    job.started_at = now
+    job.heartbeat_at = now
+    job.save(update_fields=['status', 'attempts', 'started_at', 'heartbeat_at'])
+
+
+def _this_run(job: Job):
+    """ İşin bu denemesi: iş geri alınıp tekrar başlatıldıysa (attempts arttıysa) boş döner """
+    return Job.objects.filter(job_id=job.job_id, status=Job.RUNNING, attempts=job.attempts)
+
+
+def _heartbeat(job: Job, stop: threading.Event) -> None:
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            _this_run(job).update(heartbeat_at=timezone.now())
+    finally:
+        # Thread'in kendi DB bağlantısı
+        connection.close()
+
+
+def _short_error(exc: Exception) -> str:
+    """ Hata türü ve mesajının ilk satırı: iç ayrıntılar (traceback, SQL) API'ye çıkmaz """
+    lines = str(exc).strip().splitlines()
+    message = f"{type(exc).__name__}: {lines[0]}" if lines else type(exc).__name__
+    return message[:ERROR_MAX_LENGTH]
+
+
+def run_job(job: Job) -> Job:
+    """ 'running' durumundaki işi çalıştırır ve sonucunu kaydeder """
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job, stop), daemon=True, name=f'job-{job.job_id}-heartbeat')
+    heartbeat.start()
+    try:
+        result = HANDLERS[job.kind](**job.payload)
+    except Exception as exc:
+        logger.exception("%s başarısız oldu (deneme %s).", job, job.attempts)
+        job.error = _short_error(exc)
+        if job.attempts < MAX_ATTEMPTS:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.DONE
+        job.result = result
+        job.error = ''
+        job.finished_at = timezone.now()
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    fields = {field: getattr(job, field) for field in ('status', 'result', 'error', 'run_after', 'finished_at')}
+    try:
+        with transaction.atomic():
+            saved = _this_run(job).update(**fields)
+    except IntegrityError:
+        # Tekrar denenecekti ama bu sırada aynı işin yeni bir kopyası kuyruğa
+        # girmiş (pending unique): o çalışacak, bu deneme başarısız sayılır
+        job.status = Job.FAILED
+        job.finished_at = timezone.now()
+        saved = _this_run(job).update(status=job.status, error=job.error, finished_at=job.finished_at)
+    if not saved:
+        logger.warning("%s başka bir worker'a geçmiş (heartbeat kesildi); sonucu yazılmadı.", job)
+    return job
+
+
+def run_job_by_id(job_id: int) -> Optional[Job]:
+    """ JOBS_RUN_INLINE modu: işi worker beklemeden hemen çalıştırır """
+    with transaction.atomic():
+        job = Job.objects.select_for_update().filter(job_id=job_id, status=Job.PENDING).first()
+        if job is None:
+            return None
+        _start(job, timezone.now())
+    return run_job(job)
+
+
+def purge_finished(older_than: timedelta) -> int:
+    """ Biten (başarılı / başarısız) eski işleri siler; silinen satır sayısını döner """
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.DONE, Job.FAILED],
+        finished_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted
+
+
+# ---------------------------------------------------------
+# İŞ TÜRLERİ
+# ---------------------------------------------------------
+
+def _entity_text(entity_type: str, entity_id: int) -> Optional[str]:
+    model, text_field = TAGGED_ENTITIES[entity_type]
+    return model.objects.filter(pk=entity_id).values_list(text_field, flat=True).first()
+
+
+@job_handler(AUTO_TAG)
+def auto_tag(entity_type: str, entity_id: int) -> Dict[str, Any]:
+    """ Varlığın metnini tarar, eşleşen tag'leri ekler (bkz. core/tagging.py) """
+    new_tag_ids = tag_entity(entity_type, entity_id, _entity_text(entity_type, entity_id))
+    matcher = get_tag_matcher()
+    names = [matcher.name(tag_id) for tag_id in new_tag_ids]
+
+    if entity_type == 'researcher' and new_tag_ids:
+        # Toplu INSERT signal tetiklemez: öneri önbelleğini elle tazele
+        invalidate_feature_snapshot()
+        logger.info("Otomatik etiketlendi: researcher(%s) -> %s", entity_id, ", ".join(names))
+
+    return {"added_tags": names}
+
+
+@job_handler(EMBEDDING)
+def embedding(entity_type: str, entity_id: int) -> Dict[str, Any]:
+    """ Metin değiştiyse varlığın vektörünü yeniden hesaplar """
+    vector = store_embedding(entity_type, entity_id, _entity_text(entity_type, entity_id))
+    return {"stored": vector is not None}
+
+
+@job_handler(ONBOARD_ANALYSIS)
+def onboard_analysis(researcher_id: int, limit: int = 5) -> Dict[str, Any]:
+    """
+    Yeni araştırmacının analizi: etiketler ve bio vektörü hazır olsun
+    (signal'in açtığı işler henüz çalışmadıysa burada yapılır; sonradan
+    çalışanlar bir şey bulamayıp hemen biter), ardından öneriler hesaplanır.
+    """
+    tagged = auto_tag('researcher', researcher_id)
+    embedding('researcher', researcher_id)
+    return {
+        "added_tags": tagged["added_tags"],
+        "collaboration_suggestions": get_collaboration_suggestions(researcher_id, limit=limit),
+    }
+
+
+@job_handler(BULK_ANALYSIS)
+def bulk_analysis(entity_type: str, entity_ids: List[int], chunk_size: int = 1000) -> Dict[str, Any]:
+    """
+    Toplu içe aktarılan kayıtlar (bkz. core/onboarding.py): embedding'ler
+    batch halinde encode edilir, etiketler toplu INSERT ile eklenir.
+    """
+    model, text_field = TAGGED_ENTITIES[entity_type]
+    counts = {"tagged": 0, "encoded": 0}
+    for start in range(0, len(entity_ids), chunk_size):
+        rows = list(
+            model.objects
+            .filter(pk__in=entity_ids[start:start + chunk_size])
+            .values_list(model._meta.pk.attname, text_field)
+        )
+        counts["encoded"] += sync_embeddings(entity_type, rows)["encoded"]
+        counts["tagged"] += tag_entities(entity_type, rows)
+
+    # Toplu yazmalar signal tetiklemez: öneri önbelleğini elle tazele
+    invalidate_feature_snapshot()
+    return counts
+
+
+@job_handler(GRAPH_ANALYTICS)
+def graph_analytics() -> Dict[str, Any]:
+    """ Ağın merkezilik / topluluk analizi (bkz. core/analytics.py) """
+    analysis = run_analysis()
+    return {
+        "analysis_id": analysis.analysis_id,
+        "version": analysis.version,
+        "communities": analysis.community_count,
+        "duration": round(analysis.duration, 3),
+    }
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.embeddings import AI_AVAILABLE, EMBEDDED_ENTITIES, sync_embeddings
+
+
+class Command(BaseCommand):
+    help = "Bio / proje özeti / yayın başlıklarını encode edip embedding deposunu doldurur (sadece yeni/değişmiş olanlar)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity',
+            choices=list(EMBEDDED_ENTITIES) + ['all'],
+            default='researcher',
+        )
+        parser.add_argument('--batch-size', type=int, default=64)
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help="Hash aynı olsa bile tüm vektörleri yeniden hesapla.",
+        )
+
+    def handle(self, *args, **options):
+        if not AI_AVAILABLE:
+            raise CommandError("sentence-transformers yüklü değil, embedding hesaplanamaz.")
+
+        entity_types = list(EMBEDDED_ENTITIES) if options['entity'] == 'all' else [options['entity']]
+        for entity_type in entity_types:
+            model, text_field = EMBEDDED_ENTITIES[entity_type]
+            items = model.objects.values_list(model._meta.pk.attname, text_field).iterator(chunk_size=2000)
+            counts = sync_embeddings(
+                entity_type,
+                items,
+                batch_size=options['batch_size'],
+                force=options['force'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{entity_type}: {counts['encoded']} encode edildi, "
+                f"{counts['unchanged']} değişmemiş, {counts['skipped']} boş/kısa metin atlandı."
+            ))
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import EntityTag, Tag
+from core.tagging import TAGGED_ENTITIES, init_match_worker, match_chunk
+
+
+def _tags_hash(tags):
+    """ Tag listesinin özeti: checkpoint'e yazılır, liste değişmişse devam edilmez """
+    return hashlib.sha256(json.dumps(sorted(tags), ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _chunks(iterator, size):
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Araştırmacı bio'larını, proje özetlerini ve yayın başlıklarını tag adlarıyla "
+        "tarayıp eksik entity_tag satırlarını toplu olarak ekler. Kaldığı yerden devam edebilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity',
+            choices=list(TAGGED_ENTITIES) + ['all'],
+            default='all',
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Bir işçiye verilen satır sayısı.")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="1 = process havuzu kullanma.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Tek INSERT'teki en fazla satır.")
+        parser.add_argument(
+            '--checkpoint',
+            default=os.path.join(settings.BASE_DIR, '.backfill_tags_checkpoint.json'),
+            help="Her chunk yazıldıktan sonra son işlenen id'nin (ve tag listesinin özetinin) kaydedildiği dosya.",
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help="Checkpoint'teki id'den devam et (tag listesi o zamandan beri değiştiyse hata verir).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Hiçbir şey yazma, sadece say.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        tags = list(Tag.objects.values_list('tag_id', 'name'))
+        tags_hash = _tags_hash(tags)
+
+        checkpoint = {"tags_hash": tags_hash, "last_ids": {}}
+        if options['resume']:
+            saved = self._read_checkpoint()
+            if saved:
+                # Checkpoint'ten önceki satırlar eski tag listesiyle tarandı: yeni / adı
+                # değişen tag'ler onlarda hiç aranmamış olur
+                if saved.get("tags_hash") != tags_hash:
+                    raise CommandError(
+                        "Tag listesi checkpoint yazıldıktan sonra değişmiş; devam edilemez. "
+                        "--resume olmadan baştan çalıştırın."
+                    )
+                checkpoint = saved
+
+        entity_types = list(TAGGED_ENTITIES) if options['entity'] == 'all' else [options['entity']]
+
+        pool = None
+        if options['workers'] > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=options['workers'],
+                initializer=init_match_worker,
+                initargs=(tags,),
+            )
+        else:
+            init_match_worker(tags)
+
+        try:
+            for entity_type in entity_types:
+                self._backfill(entity_type, pool, checkpoint)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _backfill(self, entity_type, pool, checkpoint):
+        model, text_field = TAGGED_ENTITIES[entity_type]
+        pk = model._meta.pk.attname
+        last_id = checkpoint["last_ids"].get(entity_type)
+
+        qs = model.objects.exclude(**{f'{text_field}__isnull': True}).exclude(**{text_field: ''})
+        if last_id is not None:
+            qs = qs.filter(**{f'{pk}__gt': last_id})
+        # PostgreSQL'de iterator() sunucu taraflı cursor kullanır: tablo belleğe alınmaz
+        rows = qs.order_by(pk).values_list(pk, text_field).iterator(chunk_size=self.options['chunk_size'])
+
+        counts = {"scanned": 0, "matched": 0, "inserted": 0}
+        started = time.monotonic()
+
+        def finish(chunk_last_id, scanned, pairs):
+            counts["scanned"] += scanned
+            counts["matched"] += len(pairs)
+            counts["inserted"] += self._write(entity_type, pairs)
+            if not self.options['dry_run']:
+                checkpoint["last_ids"][entity_type] = chunk_last_id
+                self._write_checkpoint(checkpoint)
+
+        # Sonuçlar sırayla yazılır ki checkpoint'e kadar her şey gerçekten işlenmiş olsun;
+        # bellekte en fazla workers * 2 chunk bekler.
+        in_flight = deque()
+        max_in_flight = max(1, self.options['workers']) * 2
+        for chunk in _chunks(rows, self.options['chunk_size']):
+            if pool is None:
+                finish(chunk[-1][0], len(chunk), match_chunk(chunk))
+                continue
+            in_flight.append((chunk[-1][0], len(chunk), pool.submit(match_chunk, chunk)))
+            if len(in_flight) >= max_in_flight:
+                chunk_last_id, scanned, future = in_flight.popleft()
+                finish(chunk_last_id, scanned, future.result())
+
+        while in_flight:
+            chunk_last_id, scanned, future = in_flight.popleft()
+            finish(chunk_last_id, scanned, future.result())
+
+        label = "eklenecek" if self.options['dry_run'] else "eklendi"
+        self.stdout.write(self.style.SUCCESS(
+            f"{entity_type}: {counts['scanned']} satır tarandı, {counts['matched']} eşleşme, "
+            f"{counts['inserted']} yeni etiket {label} ({time.monotonic() - started:.1f} sn)."
+        ))
+
+    def _write(self, entity_type, pairs):
+        """ Zaten var olanları çıkarıp kalanları batch'ler halinde ekler; yeni satır sayısını döner """
+        if not pairs:
+            return 0
+
+        entity_ids = {entity_id for entity_id, _ in pairs}
+        existing = set(
+            EntityTag.objects
+            .filter(entity_type=entity_type, entity_id__in=entity_ids)
+            .values_list('entity_id', 'tag_id')
+        )
+        new_pairs = [pair for pair in pairs if pair not in existing]
+        if self.options['dry_run'] or not new_pairs:
+            return len(new_pairs)
+
+        EntityTag.objects.bulk_create(
+            [EntityTag(entity_type=entity_type, entity_id=entity_id, tag_id=tag_id) for entity_id, tag_id in new_pairs],
+            batch_size=self.options['batch_size'],
+            ignore_conflicts=True,
+        )
+        return len(new_pairs)
+
+    def _read_checkpoint(self):
+        try:
+            with open(self.options['checkpoint']) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_checkpoint(self, checkpoint):
+        path = self.options['checkpoint']
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
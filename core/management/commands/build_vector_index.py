@@ -0,0 +1,34 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.ann import build_entity_index, index_path
+from core.embeddings import EMBEDDED_ENTITIES
+
+
+class Command(BaseCommand):
+    help = (
+        "Embedding deposundan ANN indeksini kurup diske yazar. Worker'lar açılışta "
+        "bu dosyayı yükler ve sadece aradaki farkı uygular (k-means tekrar çalışmaz)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity',
+            choices=list(EMBEDDED_ENTITIES) + ['all'],
+            default='all',
+        )
+
+    def handle(self, *args, **options):
+        entity_types = list(EMBEDDED_ENTITIES) if options['entity'] == 'all' else [options['entity']]
+        for entity_type in entity_types:
+            started = time.monotonic()
+            index = build_entity_index(entity_type)
+            path = index_path(entity_type)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            index.save(path)
+            self.stdout.write(self.style.SUCCESS(
+                f"{entity_type}: {len(index)} vektör, {index.kind} indeks -> {path} "
+                f"({time.monotonic() - started:.1f} sn)"
+            ))
@@ -0,0 +1,31 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from core.export import CHUNK_SIZE, EXPORT_FORMATS, GRAPHML, export_network
+
+
+class Command(BaseCommand):
+    help = (
+        "Tüm işbirliği ağını NDJSON, GraphML veya GEXF olarak yazar. "
+        "Veri parça parça okunup yazıldığı için bellek kullanımı sabittir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fmt', choices=list(EXPORT_FORMATS), default=GRAPHML)
+        parser.add_argument('--output', '-o', default='-', help="Dosya yolu; '-' = standart çıktı.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Cursor'dan bir seferde okunan satır.")
+
+    def handle(self, *args, **options):
+        chunks = export_network(options['fmt'], chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+
+        written = 0
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        self.stderr.write(self.style.SUCCESS(f"{options['output']}: {written} karakter yazıldı."))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.ann import VECTOR_INDEXES
+from core.graph import COLLABORATION_GRAPH
+from core.materialized import TOP_N, refresh_materialized_suggestions
+from core.services import FEATURE_SNAPSHOT
+
+
+class Command(BaseCommand):
+    help = (
+        "Tüm araştırmacılar için ilk N işbirliği önerisini collaboration_suggestion "
+        "tablosuna yazar. Varsayılan olarak sadece girdileri değişenleri ve onlardan "
+        "etkilenenleri yeniden hesaplar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Herkesi yeniden hesapla.")
+        parser.add_argument('--top-n', type=int, default=TOP_N)
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="Arka plan modu: --interval saniyede bir artımlı yenileme yap.",
+        )
+        parser.add_argument('--interval', type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            # Bu process web worker'larının signal'lerini görmez: her turda taze veri oku
+            FEATURE_SNAPSHOT.invalidate()
+            COLLABORATION_GRAPH.invalidate()
+            VECTOR_INDEXES['researcher'].invalidate()
+
+            started = time.monotonic()
+            stats = refresh_materialized_suggestions(full=full, top_n=options['top_n'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{stats['researchers']} araştırmacı, {stats['changed']} değişmiş, "
+                f"{stats['removed']} silinmiş, {stats['recomputed']} yeniden hesaplandı "
+                f"({time.monotonic() - started:.1f} sn)"
+            ))
+
+            if not options['loop']:
+                break
+            full = False
+            time.sleep(options['interval'])
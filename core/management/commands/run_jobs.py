@@ -0,0 +1,67 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from core.jobs import claim_next, purge_finished, run_job
+from core.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "job tablosundaki arka plan işlerini (otomatik etiketleme, embedding, "
+        "öneri hesabı) çalıştıran worker. Birden fazla kopya aynı anda çalışabilir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Bekleyen işleri bitir ve çık.")
+        parser.add_argument('--max-jobs', type=int, default=None, help="Bu kadar işten sonra çık.")
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=getattr(settings, 'JOBS_POLL_INTERVAL', 1.0),
+            help="Kuyruk boşken kaç saniyede bir bakılsın.",
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=float,
+            default=getattr(settings, 'JOBS_KEEP_DAYS', 7),
+            help="Bundan eski biten işler silinir (0 = silme).",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        purged_at = None
+        while options['max_jobs'] is None or processed < options['max_jobs']:
+            # Uzun yaşayan process: kopmuş / süresi dolmuş bağlantıları istek gibi yenile
+            close_old_connections()
+            try:
+                job = claim_next()
+            except DatabaseError as exc:
+                # DB geçici olarak erişilemez: worker ölmesin, biraz sonra tekrar denesin
+                self.stderr.write(f"İş alınamadı: {exc}")
+                time.sleep(options['interval'])
+                continue
+            if job is None:
+                if options['keep_days'] and (purged_at is None or time.monotonic() - purged_at > 3600):
+                    purged = purge_finished(timedelta(days=options['keep_days']))
+                    purged_at = time.monotonic()
+                    if purged:
+                        self.stdout.write(f"{purged} eski iş silindi.")
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            started = time.monotonic()
+            job = run_job(job)
+            processed += 1
+            line = f"{job} {time.monotonic() - started:.2f} sn"
+            if job.status == Job.DONE:
+                self.stdout.write(self.style.SUCCESS(line))
+            elif job.status == Job.FAILED:
+                self.stdout.write(self.style.ERROR(f"{line}\n{job.error}"))
+            else:
+                self.stdout.write(self.style.WARNING(f"{line}, tekrar denenecek: {job.run_after:%H:%M:%S}"))
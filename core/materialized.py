@@ -0,0 +1,206 @@
+"""
+Önceden hesaplanmış (materialized) işbirliği önerileri.
+
+Her araştırmacının ilk N önerisi collaboration_suggestion tablosuna yazılır.
+Hangi girdilerle hesaplandığı (tag, skill, departman, bio, ağ komşuları) bir
+parmak izi (fingerprint) olarak saklanır; yenilemede sadece etkilenenler
+yeniden hesaplanır:
+  - parmak izi değişenler,
+  - değişen kişiyi kendi listesinde tutanlar,
+  - değişen kişinin yeni aday kümesindekiler (aday üretimi simetriktir:
+    X, Y'nin adayıysa Y de X'in adayıdır).
+Okumada da aynı kural geçerlidir: araştırmacının veya listesindeki bir adayın
+parmak izi saklanandan farklıysa liste bayattır, canlı hesaplanır.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .embeddings import text_hash
+from .graph import CollaborationGraph, get_collaboration_graph
+from .models import CollaborationSuggestion, CollaborationSuggestionState
+from .scoring import FeatureMatrices, rank_suggestions
+from .services import DEFAULT_NETWORK_SCORE, base_embeddings_for, get_feature_matrices
+
+# Her araştırmacı için saklanan öneri sayısı (endpoint'in üst sınırı 50)
+TOP_N = getattr(settings, 'SUGGESTIONS_TOP_N', 50)
+
+
+def researcher_fingerprint(matrices: FeatureMatrices, graph: CollaborationGraph, row: int) -> str:
+    r_id = int(matrices.ids[row])
+    graph_row = graph.index.get(r_id)
+    partners = sorted(graph.ids[p] for p in graph.neighbours(graph_row).tolist()) if graph_row is not None else []
+    payload = "|".join([
+        str(matrices.tag_ids[matrices.row_items(matrices.tags, row)].tolist()),
+        str(matrices.skill_ids[matrices.row_items(matrices.skills, row)].tolist()),
+        str(int(matrices.departments[row])),
+        text_hash(matrices.researchers[r_id]["bio"]),
+        str(int(matrices.has_embedding[row])),
+        str(partners),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _chunks(items: List[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _affected_researchers(
+    matrices: FeatureMatrices,
+    graph: CollaborationGraph,
+    changed: Set[int],
+    removed: Set[int],
+) -> Set[int]:
+    affected = set(changed)
+
+    # Değişen / silinen kişiyi listesinde tutanlar
+    moved = sorted(changed | removed)
+    for chunk in _chunks(moved, 1000):
+        affected.update(
+            CollaborationSuggestion.objects
+            .filter(candidate_id__in=chunk)
+            .values_list('researcher_id', flat=True)
+        )
+
+    # Değişen kişinin yeni aday kümesi; bu kişiler için değişen kişi yeni bir aday olabilir
+    for r_id in changed:
+        row = matrices.index[r_id]
+        embedding = matrices.embeddings[row] if matrices.has_embedding[row] else None
+        candidate_rows = matrices.candidate_rows(matrices.researcher_profile(row, graph, embedding), graph)
+        affected.update(matrices.ids[candidate_rows].tolist())
+
+    return affected
+
+
+def refresh_materialized_suggestions(full: bool = False, top_n: int = TOP_N, chunk_size: int = 500) -> Dict[str, int]:
+    """
+    Tabloyu günceller. full=True ise herkes yeniden hesaplanır.
+    Sayılardan oluşan bir özet döner.
+    """
+    matrices = get_feature_matrices()
+    graph = get_collaboration_graph()
+
+    current = {
+        int(r_id): researcher_fingerprint(matrices, graph, row)
+        for row, r_id in enumerate(matrices.ids.tolist())
+    }
+    stored = dict(CollaborationSuggestionState.objects.values_list('researcher_id', 'fingerprint'))
+
+    removed = set(stored) - set(current)
+    changed = {r_id for r_id, fingerprint in current.items() if stored.get(r_id) != fingerprint}
+
+    if full:
+        affected = set(current)
+    else:
+        affected = _affected_researchers(matrices, graph, changed, removed) & set(current)
+
+    for chunk in _chunks(sorted(removed), 1000):
+        with transaction.atomic():
+            CollaborationSuggestion.objects.filter(researcher_id__in=chunk).delete()
+            CollaborationSuggestionState.objects.filter(researcher_id__in=chunk).delete()
+
+    for chunk in _chunks(sorted(affected), chunk_size):
+        now = timezone.now()
+        rows, states = [], []
+        embeddings = base_embeddings_for(matrices, chunk)
+        for r_id in chunk:
+            suggestions = rank_suggestions(
+                matrices,
+                graph,
+                r_id,
+                embeddings.get(r_id),
+                limit=top_n,
+                network=DEFAULT_NETWORK_SCORE,
+            )
+            rows.extend(
+                CollaborationSuggestion(
+                    researcher_id=r_id,
+                    candidate_id=suggestion["researcher_id"],
+                    rank=rank,
+                    score=suggestion["score"],
+                    reasons=suggestion["reasons"],
+                )
+                for rank, suggestion in enumerate(suggestions, start=1)
+            )
+            states.append(CollaborationSuggestionState(
+                researcher_id=r_id,
+                fingerprint=current[r_id],
+                computed_at=now,
+            ))
+
+        with transaction.atomic():
+            CollaborationSuggestion.objects.filter(researcher_id__in=chunk).delete()
+            CollaborationSuggestion.objects.bulk_create(rows, batch_size=2000)
+            CollaborationSuggestionState.objects.bulk_create(
+                states,
+                update_conflicts=True,
+                unique_fields=['researcher_id'],
+                update_fields=['fingerprint', 'computed_at'],
+            )
+
+    return {
+        "researchers": len(current),
+        "changed": len(changed),
+        "removed": len(removed),
+        "recomputed": len(affected),
+    }
+
+
+def get_materialized_suggestions(
+    researcher_id: int,
+    limit: int = 10,
+) -> Optional[Tuple[List[Dict[str, Any]], datetime]]:
+    """
+    Tablodaki öneriler ve hesaplanma zamanı. Kayıt yoksa, SUGGESTIONS_MAX_AGE'den
+    eskiyse ya da araştırmacının veya listesindeki bir adayın girdileri son
+    yenilemeden beri değiştiyse None döner (çağıran canlı hesaplamaya düşer).
+    Yenilemede etkilenen kümeye giren de tam olarak bunlardır.
+    """
+    if limit > TOP_N:
+        return None
+
+    state = CollaborationSuggestionState.objects.filter(researcher_id=researcher_id).first()
+    if state is None:
+        return None
+
+    max_age = getattr(settings, 'SUGGESTIONS_MAX_AGE', 3600)
+    if max_age is not None and timezone.now() - state.computed_at > timedelta(seconds=max_age):
+        return None
+
+    matrices = get_feature_matrices()
+    graph = get_collaboration_graph()
+    row = matrices.index.get(researcher_id)
+    if row is None or researcher_fingerprint(matrices, graph, row) != state.fingerprint:
+        return None
+
+    # Sıralama bütün liste üzerinden yapıldı: gösterilmeyen adaylar da kontrol edilir
+    stored = list(CollaborationSuggestion.objects.filter(researcher_id=researcher_id).order_by('rank'))
+    candidate_states = dict(
+        CollaborationSuggestionState.objects
+        .filter(researcher_id__in=[item.candidate_id for item in stored])
+        .values_list('researcher_id', 'fingerprint')
+    )
+    for item in stored:
+        candidate_row = matrices.index.get(item.candidate_id)
+        if candidate_row is None:
+            # Aday o zamandan beri silinmiş
+            return None
+        if researcher_fingerprint(matrices, graph, candidate_row) != candidate_states.get(item.candidate_id):
+            return None
+
+    suggestions = []
+    for item in stored[:limit]:
+        info = matrices.researchers[item.candidate_id]
+        suggestions.append({
+            "researcher_id": item.candidate_id,
+            "full_name": info["full_name"],
+            "department_name": matrices.department_names.get(info["department_id"]),
+            "score": item.score,
+            "reasons": item.reasons,
+        })
+    return suggestions, state.computed_at
@@ -0,0 +1,153 @@
+# Generated by Django 4.2.27 on 2026-10-17 01:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('department_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=150)),
+                ('code', models.CharField(blank=True, max_length=50, null=True, unique=True)),
+                ('faculty', models.CharField(blank=True, max_length=150, null=True)),
+            ],
+            options={
+                'db_table': 'department',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='EntityTag',
+            fields=[
+                ('entity_tag_id', models.AutoField(primary_key=True, serialize=False)),
+                ('entity_type', models.CharField(max_length=30)),
+                ('entity_id', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'entity_tag',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FundingAgency',
+            fields=[
+                ('funding_agency_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200, unique=True)),
+                ('country', models.CharField(blank=True, max_length=100, null=True)),
+                ('website', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'db_table': 'funding_agency',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FundingAgencyGrant',
+            fields=[
+                ('grant_id', models.AutoField(primary_key=True, serialize=False)),
+                ('program_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=18)),
+                ('currency', models.CharField(default='TRY', max_length=10)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'funding_agency_grant',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('project_id', models.AutoField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('summary', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'project',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Publication',
+            fields=[
+                ('publication_id', models.AutoField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('venue', models.CharField(blank=True, max_length=200, null=True)),
+                ('year', models.IntegerField(blank=True, null=True)),
+                ('doi', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'publication',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Researcher',
+            fields=[
+                ('researcher_id', models.AutoField(primary_key=True, serialize=False)),
+                ('full_name', models.CharField(max_length=150)),
+                ('email', models.CharField(max_length=150, unique=True)),
+                ('title', models.CharField(blank=True, max_length=100, null=True)),
+                ('bio', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'researcher',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('skill_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'db_table': 'skill',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('tag_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'db_table': 'tag',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='EntityEmbedding',
+            fields=[
+                ('entity_embedding_id', models.AutoField(primary_key=True, serialize=False)),
+                ('entity_type', models.CharField(max_length=30)),
+                ('entity_id', models.IntegerField()),
+                ('text_hash', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=100)),
+                ('dimension', models.IntegerField()),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'entity_embedding',
+                'unique_together': {('entity_type', 'entity_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.27 on 2026-10-17 02:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollaborationSuggestionState',
+            fields=[
+                ('researcher_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'collaboration_suggestion_state',
+            },
+        ),
+        migrations.CreateModel(
+            name='CollaborationSuggestion',
+            fields=[
+                ('collaboration_suggestion_id', models.AutoField(primary_key=True, serialize=False)),
+                ('researcher_id', models.IntegerField(db_index=True)),
+                ('candidate_id', models.IntegerField(db_index=True)),
+                ('rank', models.IntegerField()),
+                ('score', models.FloatField()),
+                ('reasons', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'collaboration_suggestion',
+                'unique_together': {('researcher_id', 'rank')},
+            },
+        ),
+    ]
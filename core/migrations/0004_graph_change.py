@@ -0,0 +1,30 @@
+# Generated by Django 4.2.27 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphChange',
+            fields=[
+                ('change_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity', models.CharField(choices=[('node', 'Düğüm'), ('edge', 'Kenar')], max_length=4)),
+                ('op', models.CharField(choices=[('upsert', 'Ekle / güncelle'), ('remove', 'Sil')], max_length=6)),
+                ('source_id', models.IntegerField()),
+                ('target_id', models.IntegerField(blank=True, null=True)),
+                ('kind', models.CharField(blank=True, default='', max_length=20)),
+                ('weight', models.IntegerField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'graph_change',
+            },
+        ),
+    ]
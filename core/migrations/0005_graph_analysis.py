@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-17 02:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_graph_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphAnalysis',
+            fields=[
+                ('analysis_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(db_index=True)),
+                ('node_count', models.IntegerField()),
+                ('edge_count', models.IntegerField()),
+                ('community_count', models.IntegerField()),
+                ('modularity', models.FloatField(blank=True, null=True)),
+                ('betweenness_samples', models.IntegerField(blank=True, null=True)),
+                ('duration', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'graph_analysis',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResearcherCentrality',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('researcher_id', models.IntegerField()),
+                ('degree', models.IntegerField()),
+                ('weighted_degree', models.IntegerField()),
+                ('betweenness', models.FloatField()),
+                ('eigenvector', models.FloatField()),
+                ('community', models.IntegerField()),
+                ('is_bridge', models.BooleanField(default=False)),
+                ('analysis', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='core.graphanalysis')),
+            ],
+            options={
+                'db_table': 'researcher_centrality',
+                'indexes': [models.Index(fields=['analysis', 'community'], name='centrality_community_idx')],
+                'unique_together': {('analysis', 'researcher_id')},
+            },
+        ),
+    ]
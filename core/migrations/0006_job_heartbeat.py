@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-17 02:49
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending_jobs(apps, schema_editor):
+    # Unique index'ten önce: aynı dedup_key ile bekleyen kopyalardan ilki kalır
+    Job = apps.get_model('core', 'Job')
+    seen = set()
+    duplicates = []
+    for job_id, dedup_key in Job.objects.filter(status='pending').order_by('job_id').values_list('job_id', 'dedup_key'):
+        if dedup_key in seen:
+            duplicates.append(job_id)
+        seen.add(dedup_key)
+    Job.objects.filter(job_id__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_graph_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(drop_duplicate_pending_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedup_key',), name='job_pending_dedup_key_uniq'),
+        ),
+    ]
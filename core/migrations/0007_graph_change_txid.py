@@ -0,0 +1,69 @@
+# Generated by Django 4.2.27 on 2026-10-17 02:52
+
+from django.db import migrations, models
+
+# Her satıra onu yazan transaction'ın id'si yazılır (commit sırası, bkz. core/changes.py)
+POSTGRES_TRIGGER = """
+    CREATE FUNCTION graph_change_set_txid() RETURNS trigger AS $$
+    BEGIN
+        NEW.txid := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER graph_change_txid BEFORE INSERT ON graph_change
+    FOR EACH ROW EXECUTE FUNCTION graph_change_set_txid();
+"""
+
+# SQLite yazmaları sıraya koyar: id sırası commit sırasıdır
+SQLITE_TRIGGER = """
+    CREATE TRIGGER graph_change_txid AFTER INSERT ON graph_change
+    BEGIN
+        UPDATE graph_change SET txid = NEW.change_id WHERE change_id = NEW.change_id;
+    END;
+"""
+
+
+def add_txid_trigger(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Eski satırlar: versiyonlar change_id'ydi, istemcilerin elindeki since
+            # değerleri geçerli kalsın diye txid = change_id. Gelecek transaction
+            # id'lerinden küçük kalmaları için gerekirse aşağı kaydırılır.
+            cursor.execute("SELECT pg_current_xact_id()::text::bigint")
+            xid = cursor.fetchone()[0]
+            cursor.execute(
+                "UPDATE graph_change SET txid = change_id - GREATEST(0, (SELECT MAX(change_id) FROM graph_change) - %s + 1)",
+                [xid],
+            )
+            cursor.execute(POSTGRES_TRIGGER)
+        elif connection.vendor == 'sqlite':
+            cursor.execute("UPDATE graph_change SET txid = change_id")
+            cursor.execute(SQLITE_TRIGGER)
+
+
+def drop_txid_trigger(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("DROP TRIGGER IF EXISTS graph_change_txid ON graph_change")
+            cursor.execute("DROP FUNCTION IF EXISTS graph_change_set_txid()")
+        elif connection.vendor == 'sqlite':
+            cursor.execute("DROP TRIGGER IF EXISTS graph_change_txid")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='graphchange',
+            name='txid',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(add_txid_trigger, drop_txid_trigger),
+    ]
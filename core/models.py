@@ -188,4 +188,185 @@ class Skill(models.Model):
         managed = False
 
     def _str_(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class EntityEmbedding(models.Model):
+    """
+    Researcher bio / proje özeti gibi metinlerin AI vektörleri.
+    text_hash sayesinde metin değişmedikçe model tekrar çalıştırılmaz.
+    """
+    entity_embedding_id = models.AutoField(primary_key=True)
+    entity_type = models.CharField(max_length=30)   # researcher / project / publication
+    entity_id = models.IntegerField()
+    text_hash = models.CharField(max_length=64)     # sha256(metin)
+    model_name = models.CharField(max_length=100)
+    dimension = models.IntegerField()
+    vector = models.BinaryField()                   # float32 dizisi (normalize edilmiş)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'entity_embedding'
+        unique_together = (('entity_type', 'entity_id'),)
+
+    def __str__(self):
+        return f"{self.entity_type}({self.entity_id}) -> {self.model_name}"
+
+
+class CollaborationSuggestion(models.Model):
+    """
+    Önceden hesaplanmış (materialized) işbirliği önerileri.
+    refresh_suggestions komutu doldurur, /collaboration-suggestions/ buradan okur.
+    """
+    collaboration_suggestion_id = models.AutoField(primary_key=True)
+    researcher_id = models.IntegerField(db_index=True)
+    candidate_id = models.IntegerField(db_index=True)
+    rank = models.IntegerField()
+    score = models.FloatField()
+    reasons = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = 'collaboration_suggestion'
+        unique_together = (('researcher_id', 'rank'),)
+
+    def __str__(self):
+        return f"{self.researcher_id} -> {self.candidate_id} ({self.score})"
+
+
+class CollaborationSuggestionState(models.Model):
+    """
+    Bir araştırmacının önerileri hangi girdilerle (tag, skill, departman,
+    bio vektörü, ağ komşuları) hesaplandı? Parmak izi değişmediyse yeniden
+    hesaplamaya gerek yoktur.
+    """
+    researcher_id = models.IntegerField(primary_key=True)
+    fingerprint = models.CharField(max_length=64)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'collaboration_suggestion_state'
+
+    def __str__(self):
+        return f"{self.researcher_id} @ {self.computed_at}"
+
+
+class Job(models.Model):
+    """
+    Veritabanı tabanlı arka plan işi (bkz. core/jobs.py, run_jobs komutu).
+    HTTP isteğinin beklemesi gerekmeyen işler (otomatik etiketleme, embedding,
+    öneri hesabı) buraya yazılır ve worker tarafından sırayla çalıştırılır.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Bekliyor'),
+        (RUNNING, 'Çalışıyor'),
+        (DONE, 'Tamamlandı'),
+        (FAILED, 'Başarısız'),
+    ]
+
+    job_id = models.BigAutoField(primary_key=True)
+    kind = models.CharField(max_length=50)
+    # Aynı işin kuyrukta birden fazla bekleyen kopyası olmasın diye (tür + payload)
+    dedup_key = models.CharField(max_length=255, db_index=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    attempts = models.IntegerField(default=0)
+    run_after = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Çalışan worker bunu düzenli günceller; kesilirse iş başka worker'a verilir
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'job'
+        indexes = [models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx')]
+        constraints = [
+            # Aynı işin en fazla bir bekleyen kopyası (eş zamanlı enqueue'larda da)
+            models.UniqueConstraint(
+                fields=['dedup_key'],
+                condition=models.Q(status='pending'),
+                name='job_pending_dedup_key_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.job_id} {self.kind} ({self.status})"
+
+
+class GraphChange(models.Model):
+    """
+    İşbirliği ağının değişiklik günlüğü (bkz. core/changes.py).
+    txid (commit sırası) ağın versiyonudur: istemci elindeki versiyondan sonraki satırları
+    (/api/network/changes/?since=) uygulayarak tüm ağı yeniden indirmeden güncellenir.
+    """
+    NODE = 'node'
+    EDGE = 'edge'
+    UPSERT = 'upsert'
+    REMOVE = 'remove'
+
+    change_id = models.BigAutoField(primary_key=True)
+    entity = models.CharField(max_length=4, choices=[(NODE, 'Düğüm'), (EDGE, 'Kenar')])
+    op = models.CharField(max_length=6, choices=[(UPSERT, 'Ekle / güncelle'), (REMOVE, 'Sil')])
+    source_id = models.IntegerField()                           # düğümde researcher_id, kenarda küçük id
+    target_id = models.IntegerField(null=True, blank=True)      # kenarda büyük id
+    kind = models.CharField(max_length=20, blank=True, default='')  # kenar türü: project / publication
+    weight = models.IntegerField(null=True, blank=True)         # kenarın yeni ağırlığı
+    data = models.JSONField(null=True, blank=True)              # düğümün label / group / title'ı
+    # Satırı yazan transaction (commit sırası için); INSERT'te trigger doldurur, bkz. core/changes.py
+    txid = models.BigIntegerField(null=True, blank=True, db_index=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = 'graph_change'
+
+    def __str__(self):
+        return f"v{self.change_id} {self.entity} {self.op} {self.source_id}"
+
+
+class GraphAnalysis(models.Model):
+    """
+    İşbirliği ağının bir versiyonu için hesaplanmış merkezilik ve topluluk
+    analizi (bkz. core/analytics.py). Arka plan işiyle hesaplanır; endpoint'ler
+    her istekte yeniden hesaplamak yerine son analizi okur.
+    """
+    analysis_id = models.BigAutoField(primary_key=True)
+    version = models.BigIntegerField(db_index=True)                  # hesaplandığı ağ versiyonu (graph_change.txid)
+    node_count = models.IntegerField()
+    edge_count = models.IntegerField()
+    community_count = models.IntegerField()
+    modularity = models.FloatField(null=True, blank=True)
+    betweenness_samples = models.IntegerField(null=True, blank=True)  # None: tam hesap
+    duration = models.FloatField()                                   # sn
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'graph_analysis'
+
+    def __str__(self):
+        return f"v{self.version} ({self.node_count} düğüm, {self.community_count} topluluk)"
+
+
+class ResearcherCentrality(models.Model):
+    """ Bir analizde araştırmacının merkezilik skorları ve topluluğu """
+    id = models.BigAutoField(primary_key=True)
+    analysis = models.ForeignKey(GraphAnalysis, on_delete=models.CASCADE, related_name='scores')
+    researcher_id = models.IntegerField()
+    degree = models.IntegerField()                  # işbirlikçi sayısı
+    weighted_degree = models.IntegerField()         # ortak proje + yayın toplamı
+    betweenness = models.FloatField()
+    eigenvector = models.FloatField()
+    community = models.IntegerField()               # 0 en büyük topluluk
+    is_bridge = models.BooleanField(default=False)  # çıkarılırsa ağ bölünür (articulation point)
+
+    class Meta:
+        db_table = 'researcher_centrality'
+        unique_together = (('analysis', 'researcher_id'),)
+        indexes = [models.Index(fields=['analysis', 'community'], name='centrality_community_idx')]
+
+    def __str__(self):
+        return f"{self.researcher_id} @ {self.analysis_id}"
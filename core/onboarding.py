@@ -0,0 +1,335 @@
+"""
+Araştırmacı ekleme (onboarding).
+
+İlişki tabloları (researcher_skill, entity_tag) satır başına bir INSERT yerine
+tek bir çok satırlı INSERT ile doldurulur.
+
+Toplu içe aktarma (POST /api/researchers/bulk-onboard/): CSV veya NDJSON akışı
+satır satır okunur (dosya belleğe alınmaz), doğrulanır ve BULK_ONBOARD_BATCH_SIZE
+satırlık batch'ler halinde, her batch ayrı bir transaction'da yazılır. Hatalı
+satırlar diğerlerini durdurmaz, satır numarasıyla raporlanır. bulk_create
+signal tetiklemediği için satır başına iş açılmaz; etiketleme ve embedding en
+sonda tek bir arka plan işiyle toplu yapılır (bkz. core/jobs.py).
+
+Beklenen alanlar (CSV başlığı veya NDJSON anahtarları):
+    full_name, email, department_id (veya department_code), title, bio,
+    skill_ids / skills, tag_ids / tags
+Liste alanları NDJSON'da dizi, CSV'de ';' ile ayrılmış değerlerdir; id veya ad
+(büyük/küçük harf duyarsız) olabilir.
+"""
+import codecs
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, connection, transaction
+
+from .changes import log_nodes
+from .models import Department, Researcher, Skill, Tag
+
+# SQLite'ın eski sürümlerindeki 999 parametre sınırının altında kalır
+MAX_ROWS_PER_INSERT = 400
+
+BULK_BATCH_SIZE = getattr(settings, 'BULK_ONBOARD_BATCH_SIZE', 500)
+MAX_REPORTED_ERRORS = getattr(settings, 'BULK_ONBOARD_MAX_ERRORS', 1000)
+
+CSV_FORMAT = 'csv'
+NDJSON_FORMAT = 'ndjson'
+BULK_FORMATS = (CSV_FORMAT, NDJSON_FORMAT)
+
+
+def _insert_rows(sql_prefix: str, row_template: str, rows: Sequence[Tuple]) -> None:
+    """ rows'u MAX_ROWS_PER_INSERT'lük çok satırlı INSERT'lerle yazar """
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), MAX_ROWS_PER_INSERT):
+            chunk = rows[start:start + MAX_ROWS_PER_INSERT]
+            cursor.execute(
+                sql_prefix + ", ".join([row_template] * len(chunk)),
+                [value for row in chunk for value in row],
+            )
+
+
+def insert_researcher_skills(pairs: Iterable[Tuple[int, int]]) -> None:
+    """ (researcher_id, skill_id) çiftleri; tekrarlar atılır, level varsayılan 1 """
+    rows = list(dict.fromkeys(pairs))
+    if rows:
+        _insert_rows(
+            "INSERT INTO researcher_skill (researcher_id, skill_id, level) VALUES ",
+            "(%s, %s, 1)",
+            rows,
+        )
+
+
+def insert_researcher_tags(pairs: Iterable[Tuple[int, int]]) -> None:
+    """ (researcher_id, tag_id) çiftleri; tekrarlar atılır """
+    rows = list(dict.fromkeys(pairs))
+    if rows:
+        _insert_rows(
+            "INSERT INTO entity_tag (entity_type, entity_id, tag_id) VALUES ",
+            "('researcher', %s, %s)",
+            rows,
+        )
+
+
+# ---------------------------------------------------------
+# TOPLU İÇE AKTARMA
+# ---------------------------------------------------------
+
+def iter_rows(byte_lines: Iterable[bytes], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    (satır no, kayıt) üretir. Kayıt sözlük değilse (bozuk JSON vb.) yerinde
+    hata mesajı döner; akış bundan etkilenmez.
+    """
+    lines = codecs.iterdecode(byte_lines, 'utf-8-sig')
+    if fmt == CSV_FORMAT:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"Geçersiz JSON: {exc}"
+            continue
+        yield line_no, row if isinstance(row, dict) else "Her satır bir JSON nesnesi olmalıdır."
+
+
+class _Lookups:
+    """ Departman / skill / tag id ve adları; içe aktarma başında bir kez okunur """
+
+    def __init__(self):
+        self.department_ids = set(Department.objects.values_list('department_id', flat=True))
+        self.department_codes = {
+            code.lower(): department_id
+            for department_id, code in Department.objects.values_list('department_id', 'code')
+            if code
+        }
+        self.skills = self._named(Skill.objects.values_list('skill_id', 'name'))
+        self.tags = self._named(Tag.objects.values_list('tag_id', 'name'))
+
+    @staticmethod
+    def _named(rows) -> Tuple[set, Dict[str, int]]:
+        rows = list(rows)
+        return {item_id for item_id, _ in rows}, {name.lower(): item_id for item_id, name in rows if name}
+
+
+def _split(value: Any) -> List[Any]:
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(';') if part.strip()]
+    return [value]
+
+
+def _resolve(values: List[Any], known: Tuple[set, Dict[str, int]]) -> Tuple[List[int], List[str]]:
+    ids, names = known
+    resolved, unknown = [], []
+    for value in values:
+        text = str(value).strip()
+        if text.isdigit() and int(text) in ids:
+            resolved.append(int(text))
+        elif text.lower() in names:
+            resolved.append(names[text.lower()])
+        else:
+            unknown.append(text)
+    return list(dict.fromkeys(resolved)), unknown
+
+
+def _text(row: Dict[str, Any], field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def validate_row(row: Dict[str, Any], lookups: _Lookups) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+    """ Kayıt geçerliyse (temizlenmiş kayıt, {}), değilse (None, {alan: hata}) """
+    errors = {}
+    full_name, email, title = _text(row, 'full_name'), _text(row, 'email'), _text(row, 'title')
+
+    if not full_name:
+        errors['full_name'] = "Zorunlu alan."
+    elif len(full_name) > 150:
+        errors['full_name'] = "En fazla 150 karakter olabilir."
+
+    if not email:
+        errors['email'] = "Zorunlu alan."
+    else:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = "Geçerli bir e-posta adresi değil."
+        if len(email) > 150:
+            errors['email'] = "En fazla 150 karakter olabilir."
+
+    if len(title) > 100:
+        errors['title'] = "En fazla 100 karakter olabilir."
+
+    department_id = None
+    department = _text(row, 'department_id')
+    code = _text(row, 'department_code')
+    if department:
+        if department.isdigit() and int(department) in lookups.department_ids:
+            department_id = int(department)
+        else:
+            errors['department_id'] = f"Departman bulunamadı: {department}"
+    elif code:
+        department_id = lookups.department_codes.get(code.lower())
+        if department_id is None:
+            errors['department_code'] = f"Departman bulunamadı: {code}"
+    else:
+        errors['department_id'] = "Zorunlu alan (veya department_code)."
+
+    skill_ids, unknown = _resolve(_split(row.get('skill_ids')) + _split(row.get('skills')), lookups.skills)
+    if unknown:
+        errors['skills'] = f"Bilinmeyen skill: {', '.join(unknown)}"
+    tag_ids, unknown = _resolve(_split(row.get('tag_ids')) + _split(row.get('tags')), lookups.tags)
+    if unknown:
+        errors['tags'] = f"Bilinmeyen tag: {', '.join(unknown)}"
+
+    if errors:
+        return None, errors
+    return {
+        "full_name": full_name,
+        "email": email,
+        "department_id": department_id,
+        "title": title,
+        "bio": _text(row, 'bio'),
+        "skill_ids": skill_ids,
+        "tag_ids": tag_ids,
+    }, {}
+
+
+def _create(records: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, int]]:
+    """ Kayıtları ve ilişkilerini yazar; [(satır no, researcher_id)] döner """
+    researchers = Researcher.objects.bulk_create([
+        Researcher(
+            full_name=record["full_name"],
+            email=record["email"],
+            department_id=record["department_id"],
+            title=record["title"],
+            bio=record["bio"],
+        )
+        for _, record in records
+    ])
+    created = []
+    skill_pairs, tag_pairs = [], []
+    for (line_no, record), researcher in zip(records, researchers):
+        created.append((line_no, researcher.researcher_id))
+        skill_pairs += [(researcher.researcher_id, skill_id) for skill_id in record["skill_ids"]]
+        tag_pairs += [(researcher.researcher_id, tag_id) for tag_id in record["tag_ids"]]
+    insert_researcher_skills(skill_pairs)
+    insert_researcher_tags(tag_pairs)
+    log_nodes(researchers)
+    return created
+
+
+class BulkOnboardReport:
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.total = 0
+        self.valid = 0
+        self.researcher_ids: List[int] = []
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        # Akış yarıda okunamadıysa (bozuk kodlama vb.) sebebi; o ana kadar yazılanlar kalır
+        self.aborted: Optional[str] = None
+
+    def error(self, line_no: int, email: Optional[str], errors: Dict[str, str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "email": email, "errors": errors})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "total_rows": self.total,
+            "valid_rows": self.valid,
+            "created": len(self.researcher_ids),
+            "failed": self.failed,
+            "researcher_ids": self.researcher_ids,
+            # Veritabanındaki e-posta çakışmaları batch yazılırken bulunur: satır sırasına diz
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "errors_truncated": self.failed > len(self.errors),
+            "aborted": self.aborted,
+        }
+
+
+def _write_batch(batch: List[Tuple[int, Dict[str, Any]]], report: BulkOnboardReport) -> None:
+    existing = set(
+        Researcher.objects
+        .filter(email__in=[record["email"] for _, record in batch])
+        .values_list('email', flat=True)
+    )
+    records = []
+    for line_no, record in batch:
+        if record["email"] in existing:
+            report.error(line_no, record["email"], {"email": "Bu e-posta ile kayıtlı bir araştırmacı var."})
+        else:
+            records.append((line_no, record))
+    report.valid += len(records)
+    if not records or report.dry_run:
+        return
+
+    try:
+        with transaction.atomic():
+            created = _create(records)
+    except DatabaseError:
+        # Batch'te çakışan bir satır var (örn. aynı anda eklenen e-posta):
+        # diğerlerini kaybetmemek için satır satır dene
+        created = []
+        for line_no, record in records:
+            try:
+                with transaction.atomic():
+                    created += _create([(line_no, record)])
+            except DatabaseError as exc:
+                report.error(line_no, record["email"], {"non_field_errors": str(exc)})
+    report.researcher_ids += [researcher_id for _, researcher_id in created]
+
+
+def bulk_onboard(
+    byte_lines: Iterable[bytes],
+    fmt: str,
+    batch_size: int = BULK_BATCH_SIZE,
+    dry_run: bool = False,
+) -> BulkOnboardReport:
+    """ Akışı okuyup geçerli satırları batch'ler halinde yazar; raporu döner """
+    report = BulkOnboardReport(dry_run)
+    lookups = _Lookups()
+    seen_emails = set()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    try:
+        for line_no, row in iter_rows(byte_lines, fmt):
+            report.total += 1
+            if isinstance(row, str):
+                report.error(line_no, None, {"non_field_errors": row})
+                continue
+
+            record, errors = validate_row(row, lookups)
+            email = record["email"] if record else (_text(row, 'email') or None)
+            if record and email in seen_emails:
+                errors = {"email": "Bu e-posta dosyada daha önce geçti."}
+            if errors:
+                report.error(line_no, email, errors)
+                continue
+
+            seen_emails.add(email)
+            batch.append((line_no, record))
+            if len(batch) >= batch_size:
+                _write_batch(batch, report)
+                batch = []
+    except (UnicodeDecodeError, csv.Error) as exc:
+        report.aborted = f"Dosya okunamadı: {exc}"
+
+    if batch:
+        _write_batch(batch, report)
+    return report
@@ -0,0 +1,110 @@
+"""
+Dashboard ve network endpoint'lerinin sorguları.
+
+Senkron view'lar (core/views.py) bunları sırayla, async view'lar
+(core/async_views.py) birbirinden bağımsız olanları eş zamanlı çalıştırır.
+"""
+from typing import Any, Callable, Dict, List
+
+from django.db import connection
+from django.db.models import Count, Sum
+
+from .models import Department, FundingAgencyGrant, Project, Publication, Researcher
+
+
+def _total_funding():
+    # Toplam hibe miktarını hesapla (Currency ayrımı yapmadan basit toplam - geliştirilebilir)
+    return FundingAgencyGrant.objects.aggregate(Sum('amount'))['amount__sum'] or 0
+
+
+# Özet sayı kartları: anahtar -> sorgu (birbirinden bağımsız)
+GENERAL_STATS_QUERIES: Dict[str, Callable[[], Any]] = {
+    "total_researchers": lambda: Researcher.objects.count(),
+    "total_projects": lambda: Project.objects.count(),
+    "active_projects": lambda: Project.objects.filter(status__icontains='active').count(),
+    "total_publications": lambda: Publication.objects.count(),
+    "total_funding_amount": _total_funding,
+}
+
+
+def general_stats() -> Dict[str, Any]:
+    return {key: query() for key, query in GENERAL_STATS_QUERIES.items()}
+
+
+def department_distribution() -> List[Dict[str, Any]]:
+    # Group By işlemi: Department'a göre grupla ve say
+    return list(
+        Department.objects.annotate(
+            researcher_count=Count('researchers')
+        ).values('name', 'researcher_count').order_by('-researcher_count')
+    )
+
+
+def top_skills(limit: int = 10) -> List[Dict[str, Any]]:
+    # SQL Sorgusu: Skill tablosunu researcher_skill ile birleştir ve say
+    sql = """
+        SELECT s.name, COUNT(rs.researcher_id) as usage_count
+        FROM skill s
+        JOIN researcher_skill rs ON s.skill_id = rs.skill_id
+        GROUP BY s.name
+        ORDER BY usage_count DESC
+        LIMIT %s;
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [limit])
+        rows = cursor.fetchall()
+
+    # SQL sonucunu JSON formatına çevir
+    return [
+        {"skill": row[0], "researcher_count": row[1]}
+        for row in rows
+    ]
+
+
+def network_nodes() -> List[Dict[str, Any]]:
+    # Her araştırmacı bir düğümdür.
+    return [
+        {
+            "id": r.researcher_id,
+            "label": r.full_name,
+            "group": r.department.name if r.department else "Unknown",
+            "title": r.title  # Mouse ile üzerine gelince görünsün diye
+        }
+        for r in Researcher.objects.select_related('department').all()
+    ]
+
+
+# Aynı projede / yayında olanları bul (Self Join)
+# x1.researcher_id < x2.researcher_id koşulu, (Ali-Ayşe) ve (Ayşe-Ali) diye iki kere saymayı önler.
+NETWORK_EDGE_SQL = {
+    "project": """
+        SELECT pr1.researcher_id, pr2.researcher_id, COUNT(*) as weight
+        FROM project_researcher pr1
+        JOIN project_researcher pr2 ON pr1.project_id = pr2.project_id
+        WHERE pr1.researcher_id < pr2.researcher_id
+        GROUP BY pr1.researcher_id, pr2.researcher_id
+    """,
+    "publication": """
+        SELECT ap1.researcher_id, ap2.researcher_id, COUNT(*) as weight
+        FROM author_publication ap1
+        JOIN author_publication ap2 ON ap1.publication_id = ap2.publication_id
+        WHERE ap1.researcher_id < ap2.researcher_id
+        GROUP BY ap1.researcher_id, ap2.researcher_id
+    """,
+}
+
+
+def network_edges(kind: str) -> List[Dict[str, Any]]:
+    with connection.cursor() as cursor:
+        cursor.execute(NETWORK_EDGE_SQL[kind])
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "from": source,
+            "to": target,
+            "value": weight,   # Çizgi kalınlığı
+            "type": kind       # İlişki türü
+        }
+        for source, target, weight in rows
+    ]
@@ -0,0 +1,622 @@
+"""
+Vektörel skor motoru.
+
+Tüm araştırmacı popülasyonu tek seferde matrislere dökülür; tag/skill
+örtüşmesi, departman eşleşmesi, ortak bağlantı sayısı ve cosine benzerliği
+aday başına Python döngüsü yerine NumPy/SciPy dizi işlemleriyle hesaplanır.
+
+Herkes skorlanmaz: ters indeksler (tag -> araştırmacılar, skill -> ...,
+departman -> ..., 2 adım komşular, anlamsal komşular) eşiği geçebilecek
+herkesi kapsayan bir aday kümesi üretir ve sadece o küme skorlanır. Anlamsal
+komşular varsayılan olarak vektör matrisinin tamamı taranarak bulunur; sonuç
+tüm adayları skorlayan eski döngüyle aynıdır. SUGGESTION_SEMANTIC_ANN = True
+ise ANN indeksi kullanılır ve sonuç yaklaşıktır (bkz. semantic_neighbours).
+
+Network bileşeni iki şekilde hesaplanabilir: ortak bağlantı sayısı (varsayılan)
+veya kişiselleştirilmiş PageRank yakınlığı (2-3 adım uzaktakileri de yakalar).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from .ann import semantic_neighbours
+from .embeddings import is_embeddable, text_hash
+from .graph import CollaborationGraph
+
+# Formül: %30 Tag + %20 Skill + %10 Dept + %20 Network + %20 AI
+W_TAG = 0.3
+W_SKILL = 0.2
+W_DEPARTMENT = 0.1
+W_NETWORK = 0.2
+W_SEMANTIC = 0.2
+
+MIN_SCORE = 0.1             # Bunun altı (ve eşiti) öneri listesine girmez
+NETWORK_SATURATION = 3.0    # 3 ortak arkadaş = Max puan
+NO_DEPARTMENT = -1          # department_id NULL olanlar
+
+# Network skoru yöntemleri
+NETWORK_COMMON_PARTNERS = 'common_partners'  # min(ortak bağlantı / 3, 1)
+NETWORK_PAGERANK = 'pagerank'                # PPR yakınlığı / en yakın adayınki
+NETWORK_MODES = (NETWORK_COMMON_PARTNERS, NETWORK_PAGERANK)
+
+# Aday budamasında anlamsal komşular ANN indeksinden mi (hızlı, yaklaşık) yoksa
+# vektör matrisinin taranmasından mı (kesin) bulunsun
+SEMANTIC_ANN = getattr(settings, 'SUGGESTION_SEMANTIC_ANN', False)
+
+# Toplu öneride (rank_batch) aynı anda skorlanan araştırmacı sayısı:
+# bellekte (bu sayı x popülasyon) boyutlu skor matrisleri tutulur
+BATCH_CHUNK = getattr(settings, 'SUGGESTION_BATCH_CHUNK', 64)
+
+
+def _incidence_matrix(
+    index: Dict[int, int],
+    memberships: Dict[int, Set[int]],
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    {researcher_id: {item_id, ...}} -> (n x m) 0/1 CSR matrisi ve sütun -> item_id dizisi.
+    """
+    item_ids = np.array(sorted({i for items in memberships.values() for i in items}), dtype=np.int64)
+    column = {item_id: col for col, item_id in enumerate(item_ids)}
+
+    rows, cols = [], []
+    for r_id, items in memberships.items():
+        row = index.get(r_id)
+        if row is None:
+            continue
+        for item_id in items:
+            rows.append(row)
+            cols.append(column[item_id])
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+        shape=(len(index), len(item_ids)),
+    )
+    matrix.sort_indices()
+    return matrix, item_ids
+
+
+class FeatureMatrices:
+    """
+    Skorlama için gereken tüm özelliklerin dizi hali.
+    Satır sırası researcher tablosundan gelen sıradır (eski döngüyle aynı).
+    """
+
+    def __init__(
+        self,
+        researchers: Dict[int, Dict[str, Any]],
+        department_names: Dict[int, str],
+        researcher_tags: Dict[int, Set[int]],
+        tag_names: Dict[int, str],
+        researcher_skills: Dict[int, Set[int]],
+        skill_names: Dict[int, str],
+        embeddings: Dict[int, Tuple[str, np.ndarray]],
+    ):
+        self.researchers = researchers
+        self.department_names = department_names
+        self.tag_names = tag_names
+        self.skill_names = skill_names
+
+        self.ids = np.fromiter(researchers.keys(), dtype=np.int64, count=len(researchers))
+        self.index = {r_id: row for row, r_id in enumerate(self.ids.tolist())}
+        n = len(self.ids)
+
+        self.tags, self.tag_ids = _incidence_matrix(self.index, researcher_tags)
+        self.skills, self.skill_ids = _incidence_matrix(self.index, researcher_skills)
+
+        # Ters indeksler: tag/skill sütunu -> o tag'e sahip araştırmacı satırları
+        self.tag_members = self.tags.T.tocsr()
+        self.skill_members = self.skills.T.tocsr()
+
+        self.departments = np.array(
+            [
+                NO_DEPARTMENT if info["department_id"] is None else info["department_id"]
+                for info in researchers.values()
+            ],
+            dtype=np.int64,
+        )
+        # departman -> satırlar (NULL departmanlılar da kendi aralarında eşleşir)
+        order = np.argsort(self.departments, kind='stable')
+        dept_values, starts = np.unique(self.departments[order], return_index=True)
+        self.department_members = {
+            int(dept): rows
+            for dept, rows in zip(dept_values.tolist(), np.split(order, starts[1:]))
+        }
+
+        # AI vektörleri: sadece bio'su vektörlenebilir ve hash'i güncel olanlar
+        dim = next((vec.shape[0] for _, vec in embeddings.values()), 0)
+        self.embeddings = np.zeros((n, dim), dtype=np.float32)
+        self.has_embedding = np.zeros(n, dtype=bool)
+        for r_id, (stored_hash, vector) in embeddings.items():
+            row = self.index.get(r_id)
+            if row is None:
+                continue
+            bio = researchers[r_id]["bio"]
+            if is_embeddable(bio) and stored_hash == text_hash(bio):
+                self.embeddings[row] = vector
+                self.has_embedding[row] = True
+
+        # Ağ ayrı tutulur (core/graph.py) ve artımlı güncellenir; burada sadece
+        # satır eşleşmesi önbelleğe alınır: (graph, graph boyutu, graph satırı -> bizim satır)
+        self._graph_rows = (None, -1, None)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row_items(self, matrix: sparse.csr_matrix, row: int) -> np.ndarray:
+        return matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+
+    def _from_graph_rows(self, graph: CollaborationGraph) -> np.ndarray:
+        """ graph satırı -> bu matrislerin satırı (bizde olmayanlar -1) """
+        cached_graph, cached_size, mapping = self._graph_rows
+        if cached_graph is not graph or cached_size != len(graph.ids):
+            size = len(graph.ids)
+            mapping = np.full(size, -1, dtype=np.int64)
+            graph_rows = graph.rows_for(self.ids)
+            known = graph_rows >= 0
+            mapping[graph_rows[known]] = np.flatnonzero(known)
+            self._graph_rows = (graph, size, mapping)
+        return mapping
+
+    def researcher_profile(
+        self,
+        base_row: int,
+        graph: CollaborationGraph,
+        base_embedding: Optional[np.ndarray] = None,
+    ) -> 'Profile':
+        graph_row = graph.index.get(int(self.ids[base_row]))
+        return Profile(
+            tag_cols=self.row_items(self.tags, base_row),
+            skill_cols=self.row_items(self.skills, base_row),
+            departments=[int(self.departments[base_row])],
+            partners=graph.neighbours(graph_row) if graph_row is not None else None,
+            sources=[graph_row] if graph_row is not None else None,
+            embedding=base_embedding,
+            exclude=[base_row],
+        )
+
+    def team_profile(
+        self,
+        rows: np.ndarray,
+        graph: CollaborationGraph,
+        embeddings: List[np.ndarray],
+    ) -> 'Profile':
+        """
+        Ekibin birleşik profili: tag/skill/departman birleşimi, ekip dışındaki
+        tüm komşular ve üyelerin vektörlerinin (normalize) ortalaması.
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        graph_rows = graph.rows_for(self.ids[rows])
+        graph_rows = graph_rows[graph_rows >= 0]
+        partners = np.unique(graph.adjacency()[graph_rows].indices) if len(graph_rows) else None
+        if partners is not None:
+            partners = np.setdiff1d(partners, graph_rows, assume_unique=True)
+
+        embedding = None
+        if embeddings:
+            mean = np.mean(np.vstack(embeddings), axis=0)
+            norm = np.linalg.norm(mean)
+            if norm > 0:
+                embedding = (mean / norm).astype(np.float32)
+
+        return Profile(
+            tag_cols=np.unique(self.tags[rows].indices),
+            skill_cols=np.unique(self.skills[rows].indices),
+            departments=np.unique(self.departments[rows]),
+            partners=partners,
+            sources=graph_rows,
+            embedding=embedding,
+            exclude=rows,
+        )
+
+    def project_profile(
+        self,
+        tag_ids: Iterable[int],
+        member_ids: Iterable[int],
+        pi_id: Optional[int],
+        department_id: Optional[int],
+        graph: CollaborationGraph,
+        embedding: Optional[np.ndarray] = None,
+    ) -> 'Profile':
+        """
+        Projeye katılabilecek araştırmacılar için profil: projenin tag'leri,
+        mevcut üyelerin skill'leri, projenin departmanı, proje özetinin vektörü
+        ve PI'ın yakın çevresi (PI ve komşuları; ortak bağlantı = adayın
+        bunlardan kaçıyla çalıştığı). Mevcut üyeler önerilmez.
+        """
+        tag_ids = np.unique(np.fromiter(tag_ids, dtype=np.int64))
+        member_rows = np.array([self.index[r_id] for r_id in member_ids if r_id in self.index], dtype=np.int64)
+
+        partners, sources = None, None
+        pi_graph_row = graph.index.get(pi_id)
+        if pi_graph_row is not None:
+            partners = np.union1d(graph.neighbours(pi_graph_row), [pi_graph_row])
+            sources = [pi_graph_row]
+
+        return Profile(
+            tag_cols=_columns(self.tag_ids, tag_ids),
+            skill_cols=np.unique(self.skills[member_rows].indices),
+            departments=[] if department_id is None else [department_id],
+            partners=partners,
+            sources=sources,
+            embedding=embedding,
+            exclude=member_rows,
+            # Hiçbir araştırmacıda olmayan proje tag'leri de paydaya girer
+            tag_count=len(tag_ids),
+        )
+
+    def common_partners(self, profile: 'Profile', graph: CollaborationGraph) -> Tuple[np.ndarray, np.ndarray]:
+        """ Profille en az bir ortak komşusu olanlar: (satırlar, ortak komşu sayıları) """
+        if not len(profile.partners):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        graph_rows, counts = graph.second_hop(profile.partners)
+        mapping = self._from_graph_rows(graph)
+        inside = graph_rows < len(mapping)
+        rows = np.full(len(graph_rows), -1, dtype=np.int64)
+        rows[inside] = mapping[graph_rows[inside]]
+        known = rows >= 0
+        return rows[known], counts[known]
+
+    def proximity_scores(self, profile: 'Profile', graph: CollaborationGraph) -> np.ndarray:
+        """
+        Profilin ağdaki kaynaklarından kişiselleştirilmiş PageRank yakınlığı,
+        (len(self),) boyutlu. Aday olamayanlar hariç en yakın kişi 1.0 olacak
+        şekilde ölçeklenir; ulaşılamayanlar 0'dır.
+        """
+        proximity = np.zeros(len(self.ids), dtype=np.float64)
+        graph_rows, values = graph.personalized_pagerank(profile.sources)
+        mapping = self._from_graph_rows(graph)
+        inside = graph_rows < len(mapping)
+        rows, values = mapping[graph_rows[inside]], values[inside]
+        keep = (rows >= 0) & ~np.isin(rows, profile.exclude)
+        rows, values = rows[keep], values[keep]
+        if len(values):
+            proximity[rows] = values / values.max()
+        return proximity
+
+    def semantic_neighbours(self, base_embedding: np.ndarray, min_similarity: float) -> np.ndarray:
+        """
+        Cosine benzerliği min_similarity ve üzeri olan satırlar.
+
+        Varsayılan: bellekteki vektör matrisi taranır, sonuç kesindir.
+        SUGGESTION_SEMANTIC_ANN = True ise arama ANN indeksinden yapılır
+        (bkz. core/ann.py, ANN_INDEX_BACKEND). IVF indeksinde sorgulanmayan
+        listelerdeki adaylar kaçabilir: öneriler yaklaşık olur.
+        """
+        if not self.embeddings.shape[1]:
+            return np.empty(0, dtype=np.int64)
+        if not SEMANTIC_ANN:
+            sims = self.embeddings @ base_embedding
+            return np.flatnonzero(self.has_embedding & (sims >= min_similarity)).astype(np.int64)
+        ids, _ = semantic_neighbours('researcher', base_embedding, min_similarity)
+        index = self.index
+        rows = np.fromiter((index.get(r_id, -1) for r_id in ids.tolist()), dtype=np.int64, count=len(ids))
+        rows = rows[rows >= 0]
+        return rows[self.has_embedding[rows]]
+
+    def department_rows(self, departments: np.ndarray) -> np.ndarray:
+        parts = [self.department_members[d] for d in departments.tolist() if d in self.department_members]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def candidate_rows(self, profile: 'Profile', graph: CollaborationGraph) -> np.ndarray:
+        """
+        Toplam skoru MIN_SCORE'u geçebilecek herkesi içeren aday satırları (artan sırada).
+
+        Ortak tag, skill veya ortak komşusu olmayan bir adayın skoru en fazla
+        W_DEPARTMENT * dept + W_SEMANTIC * semantic olabilir. Bu yüzden geri
+        kalanlar için sadece iki durum eşiği geçebilir:
+          - aynı departman ve semantic > (MIN_SCORE - W_DEPARTMENT) / W_SEMANTIC
+          - farklı departman ve semantic > MIN_SCORE / W_SEMANTIC
+        """
+        parts = [
+            self.tag_members[profile.tag_cols].indices,
+            self.skill_members[profile.skill_cols].indices,
+            self.common_partners(profile, graph)[0],
+        ]
+
+        same_department = self.department_rows(profile.departments)
+        department_threshold = (MIN_SCORE - W_DEPARTMENT) / W_SEMANTIC
+        if department_threshold < 0:
+            parts.append(same_department)
+        elif profile.embedding is not None and self.embeddings.shape[1]:
+            sims = self.embeddings[same_department] @ profile.embedding
+            parts.append(same_department[self.has_embedding[same_department] & (sims >= department_threshold)])
+
+        if profile.embedding is not None:
+            parts.append(self.semantic_neighbours(profile.embedding, MIN_SCORE / W_SEMANTIC))
+
+        # PPR yakınlığı > 0 olan herkes (aynı departmanda küçük bir yakınlık bile eşiği geçirebilir)
+        if profile.proximity is not None:
+            parts.append(np.flatnonzero(profile.proximity))
+
+        rows = np.unique(np.concatenate([np.asarray(p, dtype=np.int64) for p in parts]))
+        return rows[~np.isin(rows, profile.exclude)]
+
+    def score_components(
+        self,
+        profile: 'Profile',
+        rows: np.ndarray,
+        graph: CollaborationGraph,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Profile göre verilen aday satırlarının bileşen skorları ve toplamı.
+        Her değer (len(rows),) boyutlu bir dizidir.
+        """
+        # A. İçerik Skoru (Tag & Skill): ortak eleman sayısı = M[rows] · profil göstergesi
+        tag_common = self.tags[rows] @ _indicator(profile.tag_cols, self.tags.shape[1])
+        skill_common = self.skills[rows] @ _indicator(profile.skill_cols, self.skills.shape[1])
+        tag_score = tag_common / profile.tag_count
+        skill_score = skill_common / profile.skill_count
+
+        # B. Departman Bonusu
+        dept_score = np.isin(self.departments[rows], profile.departments).astype(np.float64)
+
+        # C. Network Skoru (Triadic Closure): ortak komşu sayısı = A · A[partners]ᵀ
+        partner_rows, partner_counts = self.common_partners(profile, graph)
+        common_partners = np.zeros(len(rows), dtype=np.float64)
+        if len(partner_rows) and len(rows):
+            order = np.argsort(partner_rows)
+            partner_rows, partner_counts = partner_rows[order], partner_counts[order]
+            pos = np.minimum(np.searchsorted(partner_rows, rows), len(partner_rows) - 1)
+            hit = partner_rows[pos] == rows
+            common_partners[hit] = partner_counts[pos[hit]]
+        if profile.proximity is not None:
+            network_score = profile.proximity[rows]
+        else:
+            network_score = np.minimum(common_partners / NETWORK_SATURATION, 1.0)
+
+        # D. AI Semantic Skor: normalize vektörlerde cosine = dot product
+        semantic_score = np.zeros(len(rows), dtype=np.float64)
+        if profile.embedding is not None and self.embeddings.shape[1]:
+            sims = self.embeddings[rows] @ profile.embedding
+            semantic_score = np.where(self.has_embedding[rows], np.maximum(sims, 0.0), 0.0).astype(np.float64)
+
+        # Ağırlıklı Final Skor (tek bir dizi ifadesi)
+        total = (W_TAG * tag_score) + \
+                (W_SKILL * skill_score) + \
+                (W_DEPARTMENT * dept_score) + \
+                (W_NETWORK * network_score) + \
+                (W_SEMANTIC * semantic_score)
+
+        return {
+            "tag": tag_score,
+            "skill": skill_score,
+            "department": dept_score,
+            "network": network_score,
+            "semantic": semantic_score,
+            "common_partners": common_partners,
+            "total": total,
+        }
+
+    def batch_score_components(
+        self,
+        base_rows: np.ndarray,
+        graph: CollaborationGraph,
+        base_embeddings: List[Optional[np.ndarray]],
+    ) -> Dict[str, np.ndarray]:
+        """
+        score_components'ın çok araştırmacılı hali: her biri tek araştırmacının
+        profiliyle (researcher_profile, ortak bağlantı yöntemi) herkese karşı skorlanır.
+        Değerler (len(base_rows), len(self)) boyutludur; ortak tag / skill / komşu
+        sayıları tek bir seyrek matris çarpımıyla (M[base_rows] · Mᵀ, A[base] · A) bulunur.
+        Kişinin kendi sütunu da hesaplanır, dışarıda bırakmak çağırana kalmıştır.
+        """
+        base_rows = np.asarray(base_rows, dtype=np.int64)
+        tag_count = np.maximum(np.diff(self.tags.indptr)[base_rows], 1)[:, None]
+        skill_count = np.maximum(np.diff(self.skills.indptr)[base_rows], 1)[:, None]
+        tag_score = (self.tags[base_rows] @ self.tags.T).toarray() / tag_count
+        skill_score = (self.skills[base_rows] @ self.skills.T).toarray() / skill_count
+
+        dept_score = (self.departments[base_rows][:, None] == self.departments[None, :]).astype(np.float64)
+
+        # Ortak komşu sayısı: A[base] · A satırları, graph sütunlarından bizim sütunlara
+        common_partners = np.zeros((len(base_rows), len(self.ids)), dtype=np.float64)
+        graph_rows = graph.rows_for(self.ids[base_rows])
+        in_graph = np.flatnonzero(graph_rows >= 0)
+        if len(in_graph):
+            adjacency = graph.adjacency()
+            second_hop = (adjacency[graph_rows[in_graph]] @ adjacency).tocoo()
+            mapping = self._from_graph_rows(graph)
+            cols = mapping[second_hop.col]
+            known = cols >= 0
+            common_partners[in_graph[second_hop.row[known]], cols[known]] = second_hop.data[known]
+        network_score = np.minimum(common_partners / NETWORK_SATURATION, 1.0)
+
+        semantic_score = np.zeros((len(base_rows), len(self.ids)), dtype=np.float64)
+        with_vector = [i for i, vector in enumerate(base_embeddings) if vector is not None]
+        if with_vector and self.embeddings.shape[1]:
+            vectors = np.vstack([np.asarray(base_embeddings[i], dtype=np.float32) for i in with_vector])
+            sims = (self.embeddings @ vectors.T).T
+            semantic_score[with_vector] = np.where(self.has_embedding[None, :], np.maximum(sims, 0.0), 0.0)
+
+        total = (W_TAG * tag_score) + \
+                (W_SKILL * skill_score) + \
+                (W_DEPARTMENT * dept_score) + \
+                (W_NETWORK * network_score) + \
+                (W_SEMANTIC * semantic_score)
+
+        return {
+            "semantic": semantic_score,
+            "common_partners": common_partners,
+            "total": total,
+        }
+
+    def reasons(
+        self,
+        profile: 'Profile',
+        row: int,
+        common_partners: float,
+        semantic_score: float,
+    ) -> Dict[str, Any]:
+        common_tag_ids = self.tag_ids[np.intersect1d(profile.tag_cols, self.row_items(self.tags, row))]
+        common_skill_ids = self.skill_ids[np.intersect1d(profile.skill_cols, self.row_items(self.skills, row))]
+        reasons = {
+            "common_tags": [self.tag_names[t] for t in common_tag_ids.tolist()],
+            "common_skills": [self.skill_names[s] for s in common_skill_ids.tolist()],
+            "common_connections": int(common_partners),
+            "semantic_match": f"%{int(semantic_score * 100)}"  # AI ne kadar benzetti?
+        }
+        if profile.proximity is not None:
+            reasons["network_proximity"] = f"%{int(profile.proximity[row] * 100)}"
+        return reasons
+
+
+class Profile:
+    """
+    Skorlamanın hedefi. Tek bir araştırmacı, bir ekip (birleşik profil) veya
+    başka bir varlık bu alanlara indirgenip aynı motorla skorlanır.
+    """
+
+    def __init__(
+        self,
+        tag_cols: np.ndarray,
+        skill_cols: np.ndarray,
+        departments: np.ndarray,
+        partners: Optional[np.ndarray] = None,
+        sources: Optional[np.ndarray] = None,
+        embedding: Optional[np.ndarray] = None,
+        exclude: Optional[np.ndarray] = None,
+        tag_count: Optional[int] = None,
+        skill_count: Optional[int] = None,
+    ):
+        """
+        tag_cols / skill_cols: FeatureMatrices sütunları (ortak tag/skill)
+        departments: Eşleşme bonusu veren departmanlar (NO_DEPARTMENT dahil)
+        partners: Profilin ağdaki komşuları (graph satırları)
+        sources: PageRank yürüyüşünün başladığı graph satırları
+        embedding: Normalize vektör
+        exclude: Aday olamayacak satırlar (kişinin kendisi, ekip üyeleri)
+        tag_count / skill_count: Skor paydası; verilmezse sütun sayısı (en az 1)
+        """
+        self.tag_cols = np.asarray(tag_cols, dtype=np.int64)
+        self.skill_cols = np.asarray(skill_cols, dtype=np.int64)
+        self.departments = np.asarray(departments, dtype=np.int64)
+        self.partners = np.empty(0, dtype=np.int64) if partners is None else np.asarray(partners, dtype=np.int64)
+        self.sources = np.empty(0, dtype=np.int64) if sources is None else np.asarray(sources, dtype=np.int64)
+        self.embedding = None if embedding is None else np.asarray(embedding, dtype=np.float32)
+        self.exclude = np.empty(0, dtype=np.int64) if exclude is None else np.asarray(exclude, dtype=np.int64)
+        self.tag_count = (tag_count if tag_count is not None else len(self.tag_cols)) or 1
+        self.skill_count = (skill_count if skill_count is not None else len(self.skill_cols)) or 1
+        # NETWORK_PAGERANK modunda FeatureMatrices.proximity_scores ile doldurulur
+        self.proximity: Optional[np.ndarray] = None
+
+
+def _columns(item_ids: np.ndarray, wanted: np.ndarray) -> np.ndarray:
+    """ Sıralı item_ids içinde wanted'ın sütunları (olmayanlar atlanır) """
+    pos = np.searchsorted(item_ids, wanted)
+    found = pos < len(item_ids)
+    found[found] = item_ids[pos[found]] == wanted[found]
+    return pos[found]
+
+
+def _indicator(columns: np.ndarray, size: int) -> np.ndarray:
+    vector = np.zeros(size, dtype=np.float64)
+    vector[columns] = 1.0
+    return vector
+
+
+def rank_suggestions(
+    matrices: FeatureMatrices,
+    graph: CollaborationGraph,
+    base_researcher_id: int,
+    base_embedding: Optional[np.ndarray] = None,
+    limit: int = 10,
+    network: str = NETWORK_COMMON_PARTNERS,
+) -> List[Dict[str, Any]]:
+    base_row = matrices.index.get(base_researcher_id)
+    if base_row is None:
+        return []
+    profile = matrices.researcher_profile(base_row, graph, base_embedding)
+    return rank_profile(matrices, graph, profile, limit, network=network)
+
+
+def rank_profile(
+    matrices: FeatureMatrices,
+    graph: CollaborationGraph,
+    profile: Profile,
+    limit: int = 10,
+    network: str = NETWORK_COMMON_PARTNERS,
+) -> List[Dict[str, Any]]:
+    if network == NETWORK_PAGERANK:
+        profile.proximity = matrices.proximity_scores(profile, graph)
+
+    # Sadece eşiği geçebilecek adaylar skorlanır
+    rows = matrices.candidate_rows(profile, graph)
+    scores = matrices.score_components(profile, rows, graph)
+    return _top_suggestions(matrices, profile, rows, scores["total"], scores, limit)
+
+
+def rank_batch(
+    matrices: FeatureMatrices,
+    graph: CollaborationGraph,
+    base_researcher_ids: List[int],
+    base_embeddings: Dict[int, np.ndarray],
+    limit: int = 10,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    rank_suggestions'ın (ortak bağlantı yöntemi) toplu hali, sonuçlar aynıdır.
+    Araştırmacılar BATCH_CHUNK'lık gruplar halinde tek matris çarpımıyla
+    herkese karşı skorlanır, sonra her satırdan ilk `limit` seçilir.
+    Bilinmeyen id'ler sonuçta yer almaz.
+    """
+    known = [r_id for r_id in dict.fromkeys(base_researcher_ids) if r_id in matrices.index]
+    everyone = np.arange(len(matrices.ids), dtype=np.int64)
+    results = {}
+    for start in range(0, len(known), BATCH_CHUNK):
+        chunk = known[start:start + BATCH_CHUNK]
+        base_rows = np.array([matrices.index[r_id] for r_id in chunk], dtype=np.int64)
+        vectors = [base_embeddings.get(r_id) for r_id in chunk]
+        scores = matrices.batch_score_components(base_rows, graph, vectors)
+
+        for i, r_id in enumerate(chunk):
+            total = scores["total"][i].copy()
+            total[base_rows[i]] = 0.0      # kişinin kendisi önerilmez
+            profile = matrices.researcher_profile(base_rows[i], graph, vectors[i])
+            row_scores = {"common_partners": scores["common_partners"][i], "semantic": scores["semantic"][i]}
+            results[r_id] = _top_suggestions(matrices, profile, everyone, total, row_scores, limit)
+    return results
+
+
+def _top_suggestions(
+    matrices: FeatureMatrices,
+    profile: Profile,
+    rows: np.ndarray,
+    total: np.ndarray,
+    scores: Dict[str, np.ndarray],
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """ rows adaylarından toplam skoru (total) en yüksek `limit` tanesi, gerekçeleriyle """
+    passing = np.flatnonzero(total > MIN_SCORE)  # Çok düşükleri ele
+
+    # 1. Faz (sayısal): sadece ilk `limit` skor seçilir, tüm liste sıralanmaz.
+    # k'inci skora eşit olanlar elenmez (eşitlik sırası aşağıda belirlenir).
+    if len(passing) > limit:
+        kth = len(passing) - limit
+        threshold = np.partition(total[passing], kth)[kth]
+        passing = passing[total[passing] >= threshold]
+
+    # Ham skora göre azalan; eşitlikte araştırmacı sırası (eski döngüdeki gibi)
+    order = np.lexsort((rows[passing], -total[passing]))
+    ranked = [(round(float(total[i]), 4), i) for i in passing[order][:limit].tolist()]
+
+    # 2. Faz (açıklama): isim/gerekçe sözlükleri sadece kazananlar için kurulur
+    suggestions = []
+    for score, i in ranked:
+        row = int(rows[i])
+        candidate_id = int(matrices.ids[row])
+        info = matrices.researchers[candidate_id]
+        suggestions.append({
+            "researcher_id": candidate_id,
+            "full_name": info["full_name"],
+            "department_name": matrices.department_names.get(info["department_id"]),
+            "score": score,
+            "reasons": matrices.reasons(
+                profile,
+                row,
+                scores["common_partners"][i],
+                float(scores["semantic"][i]),
+            ),
+        })
+    return suggestions
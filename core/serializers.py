@@ -9,6 +9,7 @@ from .models import (
     Tag,
     EntityTag,
     Skill,
+    Job,
 )
 
 
@@ -98,4 +99,20 @@ class EntityTagSerializer(serializers.ModelSerializer):
 class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
-        fields = ['skill_id', 'name']
\ No newline at end of file
+        fields = ['skill_id', 'name']
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'job_id',
+            'kind',
+            'payload',
+            'status',
+            'result',
+            'error',
+            'attempts',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
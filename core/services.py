@@ -1,28 +1,32 @@
+import time
 from collections import defaultdict
-from typing import List, Dict, Any, Set, Tuple 
-from django.db import connection
-from .models import Department, Researcher
-
-# AI / NLP Kütüphaneleri
-try:
-    from sentence_transformers import SentenceTransformer, util
-    # Küçük ve hızlı bir model kullanıyoruz (all-MiniLM-L6-v2)
-    # Bu model metinleri 384 boyutlu vektörlere çevirir.
-    AI_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-    AI_AVAILABLE = True
-    print("✅ AI Modeli Yüklendi: Semantic Search Aktif")
-except ImportError:
-    AI_MODEL = None
-    AI_AVAILABLE = False
-    print("⚠️ UYARI: sentence-transformers yüklü değil. Semantic Search çalışmayacak.")
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple 
+from django.conf import settings
+from django.db import connection, transaction
+from .models import Department, Project, Researcher
+from .admission import admission_stats
+from .ann import VECTOR_INDEXES
+from .embeddings import (
+    AI_AVAILABLE,
+    EMBEDDING_BATCHER,
+    encode_texts,
+    get_embedding,
+    get_embeddings,
+    is_embeddable,
+    is_model_loaded,
+    load_embeddings,
+)
+from .graph import COLLABORATION_GRAPH, PROJECT, get_collaboration_graph
+from .scoring import NETWORK_COMMON_PARTNERS, FeatureMatrices, rank_batch, rank_profile, rank_suggestions
+from .snapshot import VersionedSnapshot
 
 # ---------------------------------------------------------
 # VERİ YÜKLEME YARDIMCILARI
 # ---------------------------------------------------------
 
 def _load_researcher_basic_data():
-    """ ID, İsim, Bio ve Bölüm verilerini çeker """
-    sql = "SELECT researcher_id, full_name, email, department_id, bio FROM researcher"
+    """ ID, İsim, Unvan, Bio ve Bölüm verilerini çeker """
+    sql = "SELECT researcher_id, full_name, email, department_id, bio, title FROM researcher"
     with connection.cursor() as cursor:
         cursor.execute(sql)
         rows = cursor.fetchall()
@@ -34,7 +38,8 @@ def _load_researcher_basic_data():
             "full_name": row[1],
             "email": row[2],
             "department_id": row[3],
-            "bio": row[4] or "" # Bio boşsa boş string yap
+            "bio": row[4] or "", # Bio boşsa boş string yap
+            "title": row[5],
         }
     return researchers
 
@@ -79,124 +84,229 @@ def _load_researcher_skills() -> Tuple[Dict[int, Set[int]], Dict[int, str]]:
         skill_names[s_id] = s_name
     return researcher_skills, skill_names
 
-def _load_collaboration_network() -> Dict[int, Set[int]]:
-    network = defaultdict(set)
-    
-    # Proje ve Yayın Arkadaşlıklarını Birleştir
-    sql = """
-        SELECT pr1.researcher_id, pr2.researcher_id
-        FROM project_researcher pr1
-        JOIN project_researcher pr2 ON pr1.project_id = pr2.project_id
-        WHERE pr1.researcher_id != pr2.researcher_id
-        UNION
-        SELECT ap1.researcher_id, ap2.researcher_id
-        FROM author_publication ap1
-        JOIN author_publication ap2 ON ap1.publication_id = ap2.publication_id
-        WHERE ap1.researcher_id != ap2.researcher_id
+# ---------------------------------------------------------
+# ÖZELLİK ÖNBELLEĞİ (SNAPSHOT)
+# ---------------------------------------------------------
+
+def _build_feature_matrices() -> FeatureMatrices:
+    """ Tüm tabloları bir kez okuyup skorlama matrislerini kurar """
+    return FeatureMatrices(
+        _load_researcher_basic_data(),
+        _load_department_names(),
+        *_load_researcher_tags(),
+        *_load_researcher_skills(),
+        load_embeddings('researcher') if AI_AVAILABLE else {},
+    )
+
+
+# Öneri network skorunun varsayılan yöntemi (bkz. core/scoring.py, NETWORK_MODES)
+DEFAULT_NETWORK_SCORE = getattr(settings, 'SUGGESTION_NETWORK_SCORE', NETWORK_COMMON_PARTNERS)
+
+# Worker içindeki tüm istekler bu kopyayı paylaşır (bkz. core/signals.py)
+FEATURE_SNAPSHOT = VersionedSnapshot(
+    _build_feature_matrices,
+    max_age=getattr(settings, 'FEATURE_SNAPSHOT_MAX_AGE', 300),
+)
+
+
+def invalidate_feature_snapshot() -> None:
     """
-    with connection.cursor() as cursor:
-        cursor.execute(sql)
-        for r1, r2 in cursor.fetchall():
-            network[r1].add(r2)
-            
-    return network
+    Raw SQL ile yapılan yazmalardan (researcher_skill, entity_tag) sonra
+    çağrılmalı; transaction içindeysek commit sonrasına ertelenir.
+    Ağ değişiklikleri için core.graph.record_membership kullanılır.
+    """
+    transaction.on_commit(FEATURE_SNAPSHOT.invalidate)
+
 
 # ---------------------------------------------------------
 # ANA ALGORİTMA (HYBRID: GRAPH + SEMANTIC AI)
 # ---------------------------------------------------------
 
+def base_embedding_for(matrices: FeatureMatrices, base_researcher_id: int):
+    """
+    Hedef kişinin vektörü depodan gelir (yoksa sadece onun için model çalışır).
+    Adayların vektörleri SADECE depodan okunur, istek sırasında encode edilmez.
+    """
+    base_row = matrices.index[base_researcher_id]
+    if matrices.has_embedding[base_row]:
+        return matrices.embeddings[base_row]
+    base_bio = matrices.researchers[base_researcher_id]["bio"]
+    if AI_AVAILABLE and is_embeddable(base_bio):
+        return get_embedding('researcher', base_researcher_id, base_bio)
+    return None
+
+
+def base_embeddings_for(matrices: FeatureMatrices, researcher_ids: Iterable[int]) -> Dict[int, Any]:
+    """
+    base_embedding_for'un toplu hali. Depoda vektörü olmayanlar tek bir
+    model çağrısında encode edilir. Vektörü olmayanlar sonuçta yer almaz.
+    """
+    result, missing = {}, {}
+    for r_id in researcher_ids:
+        row = matrices.index[r_id]
+        if matrices.has_embedding[row]:
+            result[r_id] = matrices.embeddings[row]
+        else:
+            missing[r_id] = matrices.researchers[r_id]["bio"]
+    if AI_AVAILABLE and missing:
+        result.update(get_embeddings('researcher', missing))
+    return result
+
+
+def get_feature_matrices(*researcher_ids: int) -> FeatureMatrices:
+    """
+    Önbellekteki özellik matrisleri. Verilen araştırmacılardan biri önbellekte
+    yoksa (başka bir worker'da yeni eklenmiş olabilir) bir kez tazelenir.
+    """
+    matrices = FEATURE_SNAPSHOT.get()
+    unknown = [r_id for r_id in researcher_ids if r_id not in matrices.index]
+    if unknown and Researcher.objects.filter(researcher_id__in=unknown).exists():
+        FEATURE_SNAPSHOT.invalidate()
+        matrices = FEATURE_SNAPSHOT.get()
+    return matrices
+
+
 def get_collaboration_suggestions(
     base_researcher_id: int,
     limit: int = 10,
+    network: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     
-    # 1) Verileri Yükle
-    researchers = _load_researcher_basic_data()
-    department_names = _load_department_names()
-    
-    if base_researcher_id not in researchers:
+    # 1) Verileri önbellekten al (değişiklik yoksa DB'ye gidilmez)
+    matrices = get_feature_matrices(base_researcher_id)
+    if base_researcher_id not in matrices.index:
+        return []
+
+    # 2) Tüm adayları tek seferde skorla (bkz. core/scoring.py)
+    return rank_suggestions(
+        matrices,
+        get_collaboration_graph(),
+        base_researcher_id,
+        base_embedding_for(matrices, base_researcher_id),
+        limit=limit,
+        network=network or DEFAULT_NETWORK_SCORE,
+    )
+
+
+def get_batch_collaboration_suggestions(
+    researcher_ids: List[int],
+    limit: int = 10,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Birden çok araştırmacı için öneriler: veri önbelleği, ağ ve eksik
+    vektörlerin encode'u hepsi için bir kez yapılır, skorlar toplu matris
+    çarpımıyla hesaplanır (bkz. core.scoring.rank_batch). Bilinmeyen id'ler boş liste alır.
+    """
+    matrices = get_feature_matrices(*researcher_ids)
+    known = [r_id for r_id in dict.fromkeys(researcher_ids) if r_id in matrices.index]
+    embeddings = base_embeddings_for(matrices, known)
+
+    results = {r_id: [] for r_id in researcher_ids}
+    results.update(rank_batch(matrices, get_collaboration_graph(), known, embeddings, limit=limit))
+    return results
+
+
+def get_team_collaboration_suggestions(
+    researcher_ids: List[int],
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Ekip modu: adaylar üyelerin birleşik profiline göre skorlanır
+    (tag/skill/departman birleşimi, ekibin ağ komşuları, bio vektörlerinin ortalaması).
+    Ekip üyeleri önerilmez.
+    """
+    matrices = get_feature_matrices(*researcher_ids)
+    known = [r_id for r_id in dict.fromkeys(researcher_ids) if r_id in matrices.index]
+    if not known:
         return []
 
-    base_info = researchers[base_researcher_id]
-    base_dept_id = base_info["department_id"]
-    base_bio = base_info["bio"]
-
-    researcher_tags, tag_names = _load_researcher_tags()
-    researcher_skills, skill_names = _load_researcher_skills()
-    network_graph = _load_collaboration_network()
-
-    base_tags = researcher_tags.get(base_researcher_id, set())
-    base_skills = researcher_skills.get(base_researcher_id, set())
-    base_partners = network_graph.get(base_researcher_id, set())
-
-    base_tag_count = len(base_tags) or 1
-    base_skill_count = len(base_skills) or 1
-
-    # --- AI SEMANTIC HAZIRLIK ---
-    # Eğer AI modeli yüklüyse, hedef kişinin biyografisini vektöre çevir
-    base_embedding = None
-    if AI_AVAILABLE and base_bio and len(base_bio) > 10:
-        base_embedding = AI_MODEL.encode(base_bio, convert_to_tensor=True)
-
-    suggestions = []
-
-    # 2) Adayları Tara
-    for candidate_id, info in researchers.items():
-        if candidate_id == base_researcher_id:
-            continue
-
-        # A. İçerik Skoru (Tag & Skill)
-        cand_tags = researcher_tags.get(candidate_id, set())
-        cand_skills = researcher_skills.get(candidate_id, set())
-        
-        common_tag_ids = base_tags.intersection(cand_tags)
-        common_skill_ids = base_skills.intersection(cand_skills)
-        
-        tag_score = len(common_tag_ids) / base_tag_count
-        skill_score = len(common_skill_ids) / base_skill_count
-        
-        # B. Departman Bonusu
-        dept_score = 1.0 if base_dept_id == info["department_id"] else 0.0
-
-        # C. Network Skoru (Triadic Closure)
-        cand_partners = network_graph.get(candidate_id, set())
-        common_partners = base_partners.intersection(cand_partners)
-        network_score = min(len(common_partners) / 3.0, 1.0) # 3 ortak arkadaş = Max puan
-
-        # D. AI Semantic Skor (Anlamsal Benzerlik) 🧠
-        semantic_score = 0.0
-        if base_embedding is not None and info["bio"] and len(info["bio"]) > 10:
-            # Adayın biyografisini vektöre çevir
-            cand_embedding = AI_MODEL.encode(info["bio"], convert_to_tensor=True)
-            # Cosine Similarity hesapla (0 ile 1 arası değer döner)
-            similarity = util.cos_sim(base_embedding, cand_embedding)
-            semantic_score = float(similarity[0][0])
-            # Negatif benzerlikleri 0 yapalım
-            semantic_score = max(0.0, semantic_score)
-
-        # 3) Ağırlıklı Final Skor
-        # Formül: %30 Tag + %20 Skill + %10 Dept + %20 Network + %20 AI
-        total_score = (0.3 * tag_score) + \
-                      (0.2 * skill_score) + \
-                      (0.1 * dept_score) + \
-                      (0.2 * network_score) + \
-                      (0.2 * semantic_score)
-
-        if total_score <= 0.1: # Çok düşükleri ele
-            continue
-
-        suggestions.append({
-            "researcher_id": candidate_id,
-            "full_name": info["full_name"],
-            "department_name": department_names.get(info["department_id"]),
-            "score": round(float(total_score), 4),
-            "reasons": {
-                "common_tags": [tag_names[t] for t in common_tag_ids],
-                "common_skills": [skill_names[s] for s in common_skill_ids],
-                "common_connections": len(common_partners),
-                "semantic_match": f"%{int(semantic_score * 100)}" # AI ne kadar benzetti?
-            }
-        })
-
-    suggestions.sort(key=lambda x: x["score"], reverse=True)
-    return suggestions[:limit]
\ No newline at end of file
+    graph = get_collaboration_graph()
+    embeddings = base_embeddings_for(matrices, known)
+    profile = matrices.team_profile(
+        [matrices.index[r_id] for r_id in known],
+        graph,
+        [embeddings[r_id] for r_id in known if r_id in embeddings],
+    )
+    return rank_profile(matrices, graph, profile, limit=limit)
+
+
+def get_project_researcher_suggestions(
+    project_id: int,
+    limit: int = 10,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Projeye uygun araştırmacılar (bkz. FeatureMatrices.project_profile).
+    Öneri motoruyla aynı matrisleri, ağı ve vektör indeksini kullanır.
+    Proje yoksa None döner.
+    """
+    project = Project.objects.filter(project_id=project_id).values('summary', 'pi_id', 'department_id').first()
+    if project is None:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT tag_id FROM entity_tag
+            WHERE entity_type = 'project' AND entity_id = %s
+        """, [project_id])
+        tag_ids = [row[0] for row in cursor.fetchall()]
+
+    graph = get_collaboration_graph()
+    member_ids = {graph.ids[row] for row in graph.members[PROJECT].get(project_id, ())}
+    member_ids.add(project['pi_id'])
+    matrices = get_feature_matrices(project['pi_id'])
+
+    # Projenin departmanı yoksa PI'ın departmanı esas alınır
+    department_id = project['department_id']
+    if department_id is None and project['pi_id'] in matrices.researchers:
+        department_id = matrices.researchers[project['pi_id']]["department_id"]
+
+    profile = matrices.project_profile(
+        tag_ids,
+        member_ids,
+        project['pi_id'],
+        department_id,
+        graph,
+        get_embedding('project', project_id, project['summary']),
+    )
+    return rank_profile(matrices, graph, profile, limit=limit)
+
+
+# ---------------------------------------------------------
+# HAZIRLIK (READINESS / WARMUP)
+# ---------------------------------------------------------
+
+def readiness() -> Dict[str, Any]:
+    """ Model ve önbelleklerin durumu; hiçbir şeyi yüklemez/kurmaz """
+    caches = {
+        "feature_snapshot": FEATURE_SNAPSHOT.status(),
+        "collaboration_graph": COLLABORATION_GRAPH.status(),
+        "researcher_vector_index": VECTOR_INDEXES['researcher'].status(),
+    }
+    model_ready = is_model_loaded() or not AI_AVAILABLE
+    return {
+        "ready": model_ready and all(cache["built"] for cache in caches.values()),
+        "model": {"available": AI_AVAILABLE, "loaded": is_model_loaded()},
+        "caches": caches,
+        "embedding_batcher": EMBEDDING_BATCHER.stats(),
+        "admission": admission_stats(),
+    }
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Modeli yükler, bir kez inference çalıştırır ve öneri önbelleklerini kurar.
+    Her adımın süresini (saniye) döner.
+    """
+    timings = {}
+
+    def timed(name, func):
+        started = time.monotonic()
+        func()
+        timings[name] = round(time.monotonic() - started, 3)
+
+    if AI_AVAILABLE:
+        timed("model", lambda: encode_texts(["warmup"]))
+        timed("researcher_vector_index", VECTOR_INDEXES['researcher'].get)
+    timed("feature_snapshot", FEATURE_SNAPSHOT.get)
+    timed("collaboration_graph", COLLABORATION_GRAPH.get)
+    return timings
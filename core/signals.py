@@ -1,37 +1,203 @@
 # core/signals.py
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Researcher, Tag, EntityTag
-import re
+from .models import Department, Researcher, Project, Publication, Tag, EntityTag, EntityEmbedding, Skill
+from .embeddings import AI_AVAILABLE, delete_embedding, embeddings_written, vector_from_bytes
+from .ann import index_remove, index_upsert, index_upsert_many
+from .services import invalidate_feature_snapshot
+from .changes import group_members, group_removed, log_node, log_node_removed, log_nodes
+from .graph import PROJECT, PUBLICATION, forget_group, forget_researcher
+from .jobs import AUTO_TAG, EMBEDDING, enqueue
+from .tagging import invalidate_label_matrix, invalidate_tag_matcher
 
 @receiver(post_save, sender=Researcher)
 def auto_tag_researcher(sender, instance, created, **kwargs):
     """
     Bir araştırmacı kaydedildiğinde (insert veya update),
-    biyografisini tarar ve veritabanındaki Tag'ler ile eşleşenleri otomatik atar.
+    biyografisini Tag'ler ile eşleştirme işi kuyruğa eklenir (bkz. core/jobs.py).
+    Kelime sınırı ve büyük/küçük harf duyarsızlığı eski regex ile aynıdır:
+    'Java' ararken 'Javascript'i bulmaz.
     """
     if not instance.bio:
         return
+    enqueue(AUTO_TAG, entity_type='researcher', entity_id=instance.researcher_id)
 
-    # 1. Tüm mevcut etiketleri çek (Performans için cache'lenebilir ama şimdilik düz çekelim)
-    all_tags = Tag.objects.all()
-
-    found_tags = []
-    
-    # 2. Regex ile kelime araması yap (Büyük/Küçük harf duyarsız)
-    # \b kelime sınırı demektir. Yani 'Java' ararken 'Javascript'i bulmaz.
-    for tag in all_tags:
-        pattern = r'\b' + re.escape(tag.name) + r'\b'
-        if re.search(pattern, instance.bio, re.IGNORECASE):
-            found_tags.append(tag)
-
-    # 3. Bulunan etiketleri EntityTag tablosuna ekle
-    for tag in found_tags:
-        # get_or_create: Zaten varsa tekrar ekleme
-        EntityTag.objects.get_or_create(
-            entity_type='researcher',
-            entity_id=instance.researcher_id,
-            tag=tag
+
+@receiver(post_save, sender=Project)
+def auto_tag_project(sender, instance, **kwargs):
+    if instance.summary:
+        enqueue(AUTO_TAG, entity_type='project', entity_id=instance.project_id)
+
+
+@receiver(post_save, sender=Publication)
+def auto_tag_publication(sender, instance, **kwargs):
+    if instance.title:
+        enqueue(AUTO_TAG, entity_type='publication', entity_id=instance.publication_id)
+
+
+@receiver(post_save, sender=Researcher)
+def refresh_researcher_embedding(sender, instance, **kwargs):
+    """
+    Bio değiştiyse araştırmacının vektörü arka planda güncellenir.
+    Hash aynıysa model hiç çalışmaz.
+    """
+    if AI_AVAILABLE:
+        enqueue(EMBEDDING, entity_type='researcher', entity_id=instance.researcher_id)
+
+
+@receiver(post_delete, sender=Researcher)
+def drop_researcher_embedding(sender, instance, **kwargs):
+    delete_embedding('researcher', instance.researcher_id)
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_embedding(sender, instance, **kwargs):
+    if AI_AVAILABLE:
+        enqueue(EMBEDDING, entity_type='project', entity_id=instance.project_id)
+
+
+@receiver(post_delete, sender=Project)
+def drop_project_embedding(sender, instance, **kwargs):
+    delete_embedding('project', instance.project_id)
+
+
+@receiver(post_save, sender=Publication)
+def refresh_publication_embedding(sender, instance, **kwargs):
+    if AI_AVAILABLE:
+        enqueue(EMBEDDING, entity_type='publication', entity_id=instance.publication_id)
+
+
+@receiver(post_delete, sender=Publication)
+def drop_publication_embedding(sender, instance, **kwargs):
+    delete_embedding('publication', instance.publication_id)
+
+
+@receiver(post_save, sender=EntityEmbedding)
+def update_vector_index(sender, instance, **kwargs):
+    # ANN indeksini baştan kurmadan sadece bu vektörü ekle/güncelle
+    entity_type, entity_id, vector = instance.entity_type, instance.entity_id, vector_from_bytes(instance.vector)
+    transaction.on_commit(lambda: index_upsert(entity_type, entity_id, vector))
+
+
+@receiver(embeddings_written)
+def update_vector_index_batch(sender, entity_type, entity_ids, vectors, **kwargs):
+    # sync_embeddings bulk_create ile yazar, post_save gelmez; sinyal zaten commit sonrası
+    index_upsert_many(entity_type, entity_ids, vectors)
+    invalidate_feature_snapshot()
+
+
+@receiver(post_delete, sender=EntityEmbedding)
+def remove_from_vector_index(sender, instance, **kwargs):
+    entity_type, entity_id = instance.entity_type, instance.entity_id
+    transaction.on_commit(lambda: index_remove(entity_type, entity_id))
+
+
+@receiver(post_delete, sender=Researcher)
+def drop_researcher_from_graph(sender, instance, **kwargs):
+    # project_researcher / author_publication satırları DB'de cascade ile silinir
+    forget_researcher(instance.researcher_id)
+    log_node_removed(instance.researcher_id)
+
+
+@receiver(pre_delete, sender=Project)
+def remember_project_members(sender, instance, **kwargs):
+    # project_researcher satırları proje ile birlikte gider: üyeler silinmeden önce okunur
+    instance._members = group_members(PROJECT, instance.project_id)
+
+
+@receiver(post_delete, sender=Project)
+def drop_project_from_graph(sender, instance, **kwargs):
+    group_removed(PROJECT, instance.project_id, getattr(instance, '_members', ()))
+    forget_group(PROJECT, instance.project_id)
+
+
+@receiver(pre_delete, sender=Publication)
+def remember_publication_authors(sender, instance, **kwargs):
+    instance._members = group_members(PUBLICATION, instance.publication_id)
+
+
+@receiver(post_delete, sender=Publication)
+def drop_publication_from_graph(sender, instance, **kwargs):
+    group_removed(PUBLICATION, instance.publication_id, getattr(instance, '_members', ()))
+    forget_group(PUBLICATION, instance.publication_id)
+
+
+# Ağ düğümünde görünen alanlar
+NODE_FIELDS = ('full_name', 'department', 'title')
+
+
+def _node_changing(update_fields) -> bool:
+    return not update_fields or bool(set(NODE_FIELDS) & set(update_fields))
+
+
+@receiver(pre_save, sender=Researcher)
+def remember_researcher_node(sender, instance, update_fields=None, **kwargs):
+    # Kayıttan önceki ad / departman / unvan: post_save'de değişip değişmediğine bakılır
+    instance._node_before = None
+    if instance.pk is not None and _node_changing(update_fields):
+        instance._node_before = (
+            Researcher.objects.filter(pk=instance.pk).values_list('full_name', 'department_id', 'title').first()
         )
-        print(f"✅ OTOMATİK ETİKETLENDİ: {instance.full_name} -> {tag.name}")
\ No newline at end of file
+
+
+@receiver(post_save, sender=Researcher)
+def log_researcher_node(sender, instance, update_fields=None, **kwargs):
+    # Düğüm alanları değiştiyse günlüğe yaz (sadece bio vb. değiştiyse yazılmaz)
+    if not _node_changing(update_fields):
+        return
+    if getattr(instance, '_node_before', None) == (instance.full_name, instance.department_id, instance.title):
+        return
+    log_node(instance)
+
+
+@receiver(pre_save, sender=Department)
+def remember_department_name(sender, instance, **kwargs):
+    instance._name_before = None
+    if instance.pk is not None:
+        instance._name_before = Department.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Department)
+def log_department_nodes(sender, instance, created, **kwargs):
+    # Departman adı araştırmacı düğümlerinin group alanıdır: adı değişince düğümleri de günlüğe yaz
+    if created or instance._name_before == instance.name:
+        return
+    log_nodes(Researcher.objects.filter(department_id=instance.pk).only('researcher_id', 'full_name', 'department_id', 'title').iterator())
+
+
+@receiver(post_save, sender=Researcher)
+@receiver(post_delete, sender=Researcher)
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=EntityTag)
+@receiver(post_delete, sender=EntityTag)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=EntityEmbedding)
+@receiver(post_delete, sender=EntityEmbedding)
+def invalidate_suggestion_features(sender, **kwargs):
+    """
+    Öneri algoritmasının kullandığı tablolardan biri değişti:
+    önbellekteki özellik kopyası bir sonraki istekte yeniden kurulsun.
+    """
+    invalidate_feature_snapshot()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def rebuild_tag_matcher(sender, **kwargs):
+    # Tag eklendi / silindi / adı değişti: otomatik etiketleme otomatı yeniden kurulsun
+    invalidate_tag_matcher()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def rebuild_label_matrix(sender, **kwargs):
+    # Anlamsal öneri matrisi: sadece yeni / adı değişen tag ve skill'ler encode edilir
+    invalidate_label_matrix()
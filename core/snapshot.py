@@ -0,0 +1,79 @@
+"""
+Process içi versiyonlu önbellek.
+
+Aynı worker'daki tüm istekler tek bir kopyayı paylaşır. Veri değiştiğinde
+(signal'ler) sadece versiyon sayacı artırılır; yeni kopya bir sonraki
+okumada tembel (lazy) olarak kurulur. Değişiklik olmadıkça istekler
+veritabanına hiç gitmez.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class VersionedSnapshot:
+
+    def __init__(self, builder: Callable[[], Any], max_age: Optional[float] = None):
+        """
+        builder: Kopyayı sıfırdan kuran fonksiyon.
+        max_age: Saniye. Diğer process'lerdeki (worker, management command)
+                 yazmalar bu process'in signal'lerini tetiklemediği için
+                 kopya en fazla bu kadar süre bayat kalabilir. None = süresiz.
+        """
+        self._builder = builder
+        self._max_age = max_age
+        self._version = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._value = None
+        self._value_version = -1
+        self._built_at = 0.0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def built_at(self) -> float:
+        return self._built_at
+
+    def invalidate(self, *args, **kwargs) -> None:
+        # Signal receiver olarak da kullanılabilsin diye *args/**kwargs alır
+        with self._lock:
+            self._version += 1
+
+    def is_fresh(self) -> bool:
+        if self._value_version != self._version:
+            return False
+        if self._max_age is not None and time.monotonic() - self._built_at > self._max_age:
+            return False
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """ Hazırlık (readiness) raporu için """
+        built = self._value_version >= 0
+        return {
+            "built": built,
+            "fresh": built and self.is_fresh(),
+            "version": self._version,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if built else None,
+        }
+
+    def peek(self) -> Any:
+        """Varsa mevcut kopyayı (bayat olsa bile) kurmadan döner."""
+        return self._value
+
+    def get(self) -> Any:
+        if self.is_fresh():
+            return self._value
+
+        # Aynı anda gelen istekler kopyayı tek bir kez kursun
+        with self._build_lock:
+            if self.is_fresh():
+                return self._value
+            version = self._version
+            value = self._builder()
+            self._value = value
+            self._value_version = version
+            self._built_at = time.monotonic()
+            return value
@@ -0,0 +1,182 @@
+"""
+Ağın parçaları: ego ağı, departman ve tag alt ağları, iki araştırmacı arasındaki yol.
+
+/api/network/ her istekte bütün araştırmacıları ve iki self-join'i çalıştırıp
+tüm ağı döner. Buradakiler ise önbellekteki komşuluk matrisinden (core/graph.py)
+ve özellik kopyasından (core/services.py) okunur; maliyet sadece dönen alt
+ağın büyüklüğü kadardır. Yanıt biçimi /api/network/ ile aynıdır.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from .graph import PROJECT, PUBLICATION, CollaborationGraph, get_collaboration_graph
+from .models import Project, Publication, Researcher, Tag
+from .scoring import FeatureMatrices
+from .services import get_feature_matrices
+
+SUBGRAPH_MAX_NODES = getattr(settings, 'NETWORK_SUBGRAPH_MAX_NODES', 2000)
+EGO_MAX_DEPTH = getattr(settings, 'NETWORK_EGO_MAX_DEPTH', 3)
+PATH_MAX_HOPS = getattr(settings, 'NETWORK_PATH_MAX_HOPS', 6)
+
+
+def _node(matrices: FeatureMatrices, researcher_id: int) -> Dict[str, Any]:
+    info = matrices.researchers[researcher_id]
+    return {
+        "id": researcher_id,
+        "label": info["full_name"],
+        "group": matrices.department_names.get(info["department_id"], "Unknown"),
+        "title": info["title"],
+    }
+
+
+def _subgraph(
+    matrices: FeatureMatrices,
+    graph: CollaborationGraph,
+    researcher_ids: Sequence[int],
+    truncated: bool = False,
+) -> Dict[str, Any]:
+    """ Verilen araştırmacılar ve sadece kendi aralarındaki kenarlar """
+    researcher_ids = np.asarray(researcher_ids, dtype=np.int64)
+    rows = graph.rows_for(researcher_ids)
+    return {
+        "nodes": [_node(matrices, researcher_id) for researcher_id in researcher_ids.tolist()],
+        "edges": [
+            {"from": source, "to": target, "value": weight, "type": kind}
+            for kind, source, target, weight in graph.subgraph_edges(rows[rows >= 0])
+        ],
+        "truncated": truncated,
+    }
+
+
+def _most_connected(graph: CollaborationGraph, researcher_ids: np.ndarray, max_nodes: int) -> np.ndarray:
+    """ max_nodes'dan fazlaysa en çok bağlantısı olanlar kalır """
+    if len(researcher_ids) <= max_nodes:
+        return researcher_ids
+    rows = graph.rows_for(researcher_ids)
+    degrees = np.zeros(len(rows), dtype=np.int64)
+    degrees[rows >= 0] = graph.degrees(rows[rows >= 0])
+    return np.sort(researcher_ids[np.argsort(-degrees, kind='stable')[:max_nodes]])
+
+
+def ego_network(researcher_id: int, depth: int = 1, max_nodes: int = SUBGRAPH_MAX_NODES) -> Optional[Dict[str, Any]]:
+    """
+    Araştırmacı ve en fazla depth adım uzağındaki işbirlikçileri; düğümlerde
+    "hop" = uzaklık. Araştırmacı yoksa None.
+    """
+    matrices = get_feature_matrices(researcher_id)
+    if researcher_id not in matrices.index:
+        return None
+
+    graph = get_collaboration_graph()
+    row = graph.index.get(researcher_id)
+    if row is None:
+        # Hiç ortak işi yok: ağda sadece kendisi
+        result = _subgraph(matrices, graph, [researcher_id])
+        result["nodes"][0]["hop"] = 0
+        return result
+
+    rows, hops, truncated = graph.neighbourhood(row, depth, max_nodes)
+    # Önbellekteki özellik kopyasından daha yeni olabilecek araştırmacılar atlanır
+    known = [(graph.ids[r], int(hop)) for r, hop in zip(rows.tolist(), hops.tolist()) if graph.ids[r] in matrices.index]
+    result = _subgraph(matrices, graph, [r_id for r_id, _ in known], truncated)
+    for node, (_, hop) in zip(result["nodes"], known):
+        node["hop"] = hop
+    return result
+
+
+def department_network(department_id: int, max_nodes: int = SUBGRAPH_MAX_NODES) -> Optional[Dict[str, Any]]:
+    """ Departmandaki araştırmacılar ve aralarındaki işbirlikleri. Departman yoksa None. """
+    matrices = get_feature_matrices()
+    if department_id not in matrices.department_names:
+        return None
+
+    rows = matrices.department_members.get(department_id, np.empty(0, dtype=np.int64))
+    graph = get_collaboration_graph()
+    researcher_ids = _most_connected(graph, np.sort(matrices.ids[rows]), max_nodes)
+    return _subgraph(matrices, graph, researcher_ids, truncated=len(researcher_ids) < len(rows))
+
+
+def tag_network(tag_id: int, max_nodes: int = SUBGRAPH_MAX_NODES) -> Optional[Dict[str, Any]]:
+    """ tag'e sahip araştırmacılar ve aralarındaki işbirlikleri. Tag yoksa None. """
+    matrices = get_feature_matrices()
+    col = int(np.searchsorted(matrices.tag_ids, tag_id))
+    if col < len(matrices.tag_ids) and matrices.tag_ids[col] == tag_id:
+        rows = matrices.tag_members[col].indices
+    elif Tag.objects.filter(tag_id=tag_id).exists():
+        rows = np.empty(0, dtype=np.int64)    # Tag var ama kimsede yok
+    else:
+        return None
+
+    graph = get_collaboration_graph()
+    researcher_ids = _most_connected(graph, np.sort(matrices.ids[rows]), max_nodes)
+    return _subgraph(matrices, graph, researcher_ids, truncated=len(researcher_ids) < len(rows))
+
+
+def _titles(model, ids: List[int]) -> List[Dict[str, Any]]:
+    pk = model._meta.pk.attname
+    titles = dict(model.objects.filter(pk__in=ids).values_list(pk, 'title'))
+    return [{"id": group_id, "title": titles.get(group_id)} for group_id in ids]
+
+
+def collaboration_path(source_id: int, target_id: int, max_hops: int = PATH_MAX_HOPS) -> Optional[Dict[str, Any]]:
+    """
+    İki araştırmacıyı bağlayan en kısa işbirliği zinciri ve her adımdaki
+    ortak proje / yayınlar. Araştırmacılardan biri yoksa None; max_hops
+    adımda bağlantı yoksa found: false.
+    """
+    researchers = {
+        row['researcher_id']: row
+        for row in Researcher.objects
+        .filter(researcher_id__in=[source_id, target_id])
+        .values('researcher_id', 'full_name', 'department__name', 'title')
+    }
+    if source_id not in researchers or target_id not in researchers:
+        return None
+
+    graph = get_collaboration_graph()
+    source, target = graph.index.get(source_id), graph.index.get(target_id)
+    if source_id == target_id:
+        rows = []
+    elif source is None or target is None:
+        rows = None     # Hiç ortak işi yok
+    else:
+        rows = graph.shortest_path(source, target, max_hops)
+    if rows is None:
+        return {"from": source_id, "to": target_id, "found": False, "hops": None, "nodes": [], "links": []}
+
+    path = [graph.ids[row] for row in rows] or [source_id]
+    researchers.update(
+        (row['researcher_id'], row)
+        for row in Researcher.objects
+        .filter(researcher_id__in=path[1:-1])
+        .values('researcher_id', 'full_name', 'department__name', 'title')
+    )
+
+    links = []
+    for a, b in zip(rows, rows[1:]):
+        shared = graph.shared_groups(a, b)
+        links.append({
+            "from": graph.ids[a],
+            "to": graph.ids[b],
+            "projects": _titles(Project, shared[PROJECT]),
+            "publications": _titles(Publication, shared[PUBLICATION]),
+        })
+
+    return {
+        "from": source_id,
+        "to": target_id,
+        "found": True,
+        "hops": len(path) - 1,
+        "nodes": [
+            {
+                "id": researcher_id,
+                "label": researchers[researcher_id]['full_name'],
+                "group": researchers[researcher_id]['department__name'] or "Unknown",
+                "title": researchers[researcher_id]['title'],
+            }
+            for researcher_id in path if researcher_id in researchers
+        ],
+        "links": links,
+    }
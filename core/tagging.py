@@ -0,0 +1,382 @@
+"""
+Metinlerden otomatik etiket (Tag) çıkarma.
+
+Eski yöntem her kayıtta tüm Tag'leri çekip tag başına bir regex derleyip
+çalıştırıyordu. Burada tüm tag adlarından tek bir Aho-Corasick otomatı kurulur
+ve önbelleğe alınır (Tag değişince yeniden kurulur, bkz. core/signals.py).
+Metin tek geçişte taranır; otomatın bulduğu adaylar, eski davranışla birebir
+aynı sonuç için tag'in derlenmiş regex'iyle (\\b...\\b, IGNORECASE) doğrulanır.
+Otomat sadece ASCII adları içerir: regex'in IGNORECASE eşitliği ASCII dışında
+Python sürümüne göre değişen özel durumlar içerir (µ ~ μ, ς ~ σ, ...). ASCII
+olmayan adlar (ör. "Görüntü İşleme") eski yöntemle, her metinde regex'le denenir.
+
+Anlamsal öneri: tüm Tag ve Skill adları bir kez vektörlenip tek bir matriste
+tutulur (Tag / Skill değişince yeniden kurulur). Bir metin, vektörüyle tek bir
+matris-vektör çarpımında bütün adlara puanlanır; böylece "deep neural networks"
+geçen bir bio "Machine Learning" tag'ini de önerebilir. AUTO_TAG_SEMANTIC açıksa
+otomatik etiketleme de bunu kullanır.
+"""
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+
+from .embeddings import EMBEDDING_BATCHER, encode_texts, get_embedding, load_embeddings, text_hash
+from .models import EntityTag, Project, Publication, Researcher, Skill, Tag
+from .snapshot import VersionedSnapshot
+
+# IGNORECASE'te bir ASCII harfine eşit sayılan ASCII dışı harfler. Tam liste:
+# tüm Unicode'u tarayan test (core/tests.py) regex motoruyla karşılaştırır.
+_ASCII_CASES = {'İ': 'i', 'ı': 'i', 'ſ': 's', '\u212a': 'k'}  # \u212a: Kelvin işareti
+
+_ASCII_FOLD = str.maketrans({
+    **{chr(code): chr(code).lower() for code in range(ord('A'), ord('Z') + 1)},
+    **_ASCII_CASES,
+})
+
+
+def fold(text: str) -> str:
+    """ ASCII adlar için büyük/küçük harf farkını kaldırır; uzunluk değişmez """
+    return text.translate(_ASCII_FOLD)
+
+
+class TagMatcher:
+
+    def __init__(self, tags: Iterable[Tuple[int, str]]):
+        # Aho-Corasick: durum -> {karakter: durum}, başarısızlık bağlantıları, çıktılar
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._names: Dict[int, str] = {}
+        self._patterns: Dict[int, re.Pattern] = {}
+        # Boş veya ASCII olmayan adlı tag'ler otomatta yoktur; her metinde regex ile denenir
+        self._always: List[int] = []
+
+        for tag_id, name in tags:
+            self._names[tag_id] = name
+            self._patterns[tag_id] = re.compile(r'\b' + re.escape(name) + r'\b', re.IGNORECASE)
+            key = fold(name)
+            if not key or not key.isascii():
+                self._always.append(tag_id)
+                continue
+            state = 0
+            for ch in key:
+                state = self._goto[state].get(ch) or self._add_state(state, ch)
+            self._out[state].append(tag_id)
+
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def name(self, tag_id: int) -> Optional[str]:
+        return self._names.get(tag_id)
+
+    def _add_state(self, state: int, ch: str) -> int:
+        self._goto.append({})
+        self._fail.append(0)
+        self._out.append([])
+        new_state = len(self._goto) - 1
+        self._goto[state][ch] = new_state
+        return new_state
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def candidates(self, text: str) -> List[int]:
+        """ Adı (harf farkı gözetmeksizin) metinde geçebilecek tag'ler; kelime sınırı kontrolsüz """
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for ch in fold(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return sorted(found)
+
+    def match(self, text: Optional[str]) -> List[int]:
+        """
+        Metinde tam kelime olarak geçen tag'lerin id'leri (artan sırada).
+        Sonuç, her tag için re.search(r'\\b' + re.escape(ad) + r'\\b', metin, re.IGNORECASE)
+        ile aynıdır.
+        """
+        if not text:
+            return []
+        return [tag_id for tag_id in self.candidates(text) if self._patterns[tag_id].search(text)]
+
+
+def _build_tag_matcher() -> TagMatcher:
+    return TagMatcher(Tag.objects.values_list('tag_id', 'name').iterator())
+
+
+# Otomatik etiketlenen varlıklar: entity_type -> (model, metin alanı)
+TAGGED_ENTITIES = {
+    'researcher': (Researcher, 'bio'),
+    'project': (Project, 'summary'),
+    'publication': (Publication, 'title'),
+}
+
+
+# Tag tablosu değiştikçe signal'ler ile tazelenir; diğer process'lerdeki
+# değişiklikler için en fazla TAG_MATCHER_MAX_AGE saniye bayat kalır.
+TAG_MATCHER = VersionedSnapshot(
+    _build_tag_matcher,
+    max_age=getattr(settings, 'TAG_MATCHER_MAX_AGE', 300),
+)
+
+
+def get_tag_matcher() -> TagMatcher:
+    return TAG_MATCHER.get()
+
+
+def add_entity_tags(entity_type: str, entity_id: int, tag_ids: Iterable[int]) -> List[int]:
+    """
+    Eksik entity_tag satırlarını tek bir toplu INSERT ile ekler
+    (eş zamanlı eklenmiş olanlar çakışmada atlanır). Yeni eklenen tag id'lerini döner.
+    """
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return []
+    existing = set(
+        EntityTag.objects
+        .filter(entity_type=entity_type, entity_id=entity_id, tag_id__in=tag_ids)
+        .values_list('tag_id', flat=True)
+    )
+    new_ids = sorted(tag_ids - existing)
+    if new_ids:
+        EntityTag.objects.bulk_create(
+            [EntityTag(entity_type=entity_type, entity_id=entity_id, tag_id=tag_id) for tag_id in new_ids],
+            ignore_conflicts=True,
+        )
+    return new_ids
+
+
+def tag_entity(entity_type: str, entity_id: int, text: Optional[str], semantic: Optional[bool] = None) -> List[int]:
+    """
+    Metni tarar, eşleşen tag'leri varlığa ekler; yeni eklenenleri döner.
+    semantic (varsayılan AUTO_TAG_SEMANTIC): adı geçmeyen ama anlamca yakın
+    tag'ler de (AUTO_TAG_SEMANTIC_THRESHOLD üstü, en fazla AUTO_TAG_SEMANTIC_LIMIT) eklenir.
+    """
+    if not text:
+        return []
+    tag_ids = set(get_tag_matcher().match(text))
+
+    if AUTO_TAG_SEMANTIC if semantic is None else semantic:
+        vector = get_embedding(entity_type, entity_id, text)
+        if vector is not None:
+            suggested = suggest_labels(vector, AUTO_TAG_SEMANTIC_THRESHOLD, AUTO_TAG_SEMANTIC_LIMIT)
+            tag_ids.update(item["id"] for item in suggested["tags"])
+
+    return add_entity_tags(entity_type, entity_id, tag_ids)
+
+
+def tag_entities(entity_type: str, rows: Iterable[Tuple[int, Optional[str]]], semantic: Optional[bool] = None) -> int:
+    """
+    tag_entity'nin toplu hali: [(entity_id, metin), ...] için eksik entity_tag
+    satırlarını tek seferde ekler; yeni satır sayısını döner. Anlamsal modda
+    vektörler depodan okunur (önce sync_embeddings çalıştırılmış olmalı).
+    """
+    rows = [(entity_id, text) for entity_id, text in rows if text]
+    if not rows:
+        return 0
+
+    matcher = get_tag_matcher()
+    vectors = {}
+    if AUTO_TAG_SEMANTIC if semantic is None else semantic:
+        vectors = load_embeddings(entity_type, [entity_id for entity_id, _ in rows])
+
+    pairs = set()
+    for entity_id, text in rows:
+        tag_ids = set(matcher.match(text))
+        stored = vectors.get(entity_id)
+        if stored is not None and stored[0] == text_hash(text):
+            suggested = suggest_labels(stored[1], AUTO_TAG_SEMANTIC_THRESHOLD, AUTO_TAG_SEMANTIC_LIMIT)
+            tag_ids.update(item["id"] for item in suggested["tags"])
+        pairs.update((entity_id, tag_id) for tag_id in tag_ids)
+
+    existing = set(
+        EntityTag.objects
+        .filter(entity_type=entity_type, entity_id__in={entity_id for entity_id, _ in rows})
+        .values_list('entity_id', 'tag_id')
+    )
+    new_pairs = sorted(pairs - existing)
+    EntityTag.objects.bulk_create(
+        [EntityTag(entity_type=entity_type, entity_id=entity_id, tag_id=tag_id) for entity_id, tag_id in new_pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    return len(new_pairs)
+
+
+# ---------------------------------------------------------
+# TOPLU ETİKETLEME (process havuzu, bkz. backfill_tags komutu)
+# ---------------------------------------------------------
+
+_worker_matcher: Optional[TagMatcher] = None
+
+
+def init_match_worker(tags: List[Tuple[int, str]]) -> None:
+    """ Havuz process'i başlarken otomatı bir kez kurar (DB'ye gitmez) """
+    global _worker_matcher
+    _worker_matcher = TagMatcher(tags)
+
+
+def match_chunk(rows: List[Tuple[int, Optional[str]]]) -> List[Tuple[int, int]]:
+    """ [(entity_id, metin), ...] -> [(entity_id, tag_id), ...] """
+    matcher = _worker_matcher or get_tag_matcher()
+    return [
+        (entity_id, tag_id)
+        for entity_id, text in rows
+        for tag_id in matcher.match(text)
+    ]
+
+
+def invalidate_tag_matcher() -> None:
+    """ Tag tablosu değiştiğinde çağrılır; commit sonrasına ertelenir """
+    transaction.on_commit(TAG_MATCHER.invalidate)
+
+
+# ---------------------------------------------------------
+# ANLAMSAL ETİKET / YETENEK ÖNERİSİ
+# ---------------------------------------------------------
+
+SEMANTIC_TAG_THRESHOLD = getattr(settings, 'SEMANTIC_TAG_THRESHOLD', 0.4)
+AUTO_TAG_SEMANTIC = getattr(settings, 'AUTO_TAG_SEMANTIC', False)
+AUTO_TAG_SEMANTIC_THRESHOLD = getattr(settings, 'AUTO_TAG_SEMANTIC_THRESHOLD', 0.5)
+AUTO_TAG_SEMANTIC_LIMIT = getattr(settings, 'AUTO_TAG_SEMANTIC_LIMIT', 5)
+
+LABEL_KINDS = ('tag', 'skill')
+
+
+class LabelMatrix:
+    """ Tag ve skill adlarının normalize vektörleri, satır satır tek bir (n, dim) matriste """
+
+    def __init__(self, labels: List[Tuple[str, int, str]], vectors: np.ndarray):
+        self.kinds = [kind for kind, _, _ in labels]
+        self.ids = [label_id for _, label_id, _ in labels]
+        self.names = [name for _, _, name in labels]
+        self.matrix = vectors
+
+    def __len__(self):
+        return len(self.ids)
+
+    def score(
+        self,
+        vector: np.ndarray,
+        threshold: float,
+        limit: int,
+        exclude: Optional[Dict[str, Set[int]]] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Cosine benzerliği threshold'u geçen adlar, türüne göre ({"tags": [...], "skills": [...]})
+        azalan puan sırasında, tür başına en fazla limit tane.
+        """
+        result = {f"{kind}s": [] for kind in LABEL_KINDS}
+        if not len(self):
+            return result
+
+        scores = self.matrix @ np.asarray(vector, dtype=np.float32)
+        rows = np.flatnonzero(scores >= threshold)
+        exclude = exclude or {}
+        for row in rows[np.argsort(-scores[rows], kind='stable')]:
+            kind, label_id = self.kinds[row], self.ids[row]
+            bucket = result[f"{kind}s"]
+            if len(bucket) >= limit or label_id in exclude.get(kind, ()):
+                continue
+            bucket.append({"id": label_id, "name": self.names[row], "score": round(float(scores[row]), 4)})
+        return result
+
+
+# ad -> vektör: matris yeniden kurulurken sadece yeni / değişmiş adlar encode edilir
+_label_vectors: Dict[str, np.ndarray] = {}
+
+
+def _build_label_matrix() -> LabelMatrix:
+    global _label_vectors
+    labels = [('tag', tag_id, name) for tag_id, name in Tag.objects.values_list('tag_id', 'name') if name]
+    labels += [('skill', skill_id, name) for skill_id, name in Skill.objects.values_list('skill_id', 'name') if name]
+    if not labels:
+        return LabelMatrix([], np.zeros((0, 0), dtype=np.float32))
+
+    names = {name for _, _, name in labels}
+    missing = sorted(names - _label_vectors.keys())
+    known = {name: vector for name, vector in _label_vectors.items() if name in names}
+    if missing:
+        known.update(zip(missing, encode_texts(missing)))
+    _label_vectors = known
+    return LabelMatrix(labels, np.stack([known[name] for _, _, name in labels]))
+
+
+LABEL_MATRIX = VersionedSnapshot(
+    _build_label_matrix,
+    max_age=getattr(settings, 'LABEL_MATRIX_MAX_AGE', 3600),
+)
+
+
+def get_label_matrix() -> LabelMatrix:
+    return LABEL_MATRIX.get()
+
+
+def invalidate_label_matrix() -> None:
+    """ Tag veya Skill tablosu değiştiğinde çağrılır; commit sonrasına ertelenir """
+    transaction.on_commit(LABEL_MATRIX.invalidate)
+
+
+def suggest_labels(
+    vector: np.ndarray,
+    threshold: float = SEMANTIC_TAG_THRESHOLD,
+    limit: int = 10,
+    exclude: Optional[Dict[str, Set[int]]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    return get_label_matrix().score(vector, threshold, limit, exclude)
+
+
+def suggest_labels_for_text(
+    text: str,
+    threshold: float = SEMANTIC_TAG_THRESHOLD,
+    limit: int = 10,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """ Kaydedilmemiş serbest metin (örn. kayıt formundaki bio) için öneriler """
+    return suggest_labels(EMBEDDING_BATCHER.encode(text), threshold, limit)
+
+
+def suggest_researcher_labels(
+    researcher_id: int,
+    threshold: float = SEMANTIC_TAG_THRESHOLD,
+    limit: int = 10,
+) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Araştırmacının bio vektörüne göre henüz sahip olmadığı tag ve skill'ler.
+    Araştırmacı yoksa None.
+    """
+    bios = list(Researcher.objects.filter(researcher_id=researcher_id).values_list('bio', flat=True)[:1])
+    if not bios:
+        return None
+
+    vector = get_embedding('researcher', researcher_id, bios[0])
+    if vector is None:
+        return {f"{kind}s": [] for kind in LABEL_KINDS}
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT skill_id FROM researcher_skill WHERE researcher_id = %s", [researcher_id])
+        skill_ids = {row[0] for row in cursor.fetchall()}
+    tag_ids = set(
+        EntityTag.objects
+        .filter(entity_type='researcher', entity_id=researcher_id)
+        .values_list('tag_id', flat=True)
+    )
+    return suggest_labels(vector, threshold, limit, exclude={'tag': tag_ids, 'skill': skill_ids})
@@ -0,0 +1,66 @@
+"""
+Test veritabanı kurulumu.
+
+Mevcut şemanın tabloları (researcher, project, tag, ...) managed = False
+modellerdir, migration'larla oluşturulmaz; ilişki tablolarının
+(researcher_skill, project_researcher, author_publication) ise modeli yoktur.
+Testler başlamadan önce bunlar test veritabanında oluşturulur.
+
+settings.TEST_RUNNER = 'core.test_runner.LegacySchemaRunner'
+"""
+from django.apps import apps
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+LINK_TABLES = {
+    'researcher_skill': """
+        CREATE TABLE researcher_skill (
+            researcher_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            level INTEGER,
+            PRIMARY KEY (researcher_id, skill_id)
+        )
+    """,
+    'project_researcher': """
+        CREATE TABLE project_researcher (
+            project_id INTEGER NOT NULL,
+            researcher_id INTEGER NOT NULL,
+            role VARCHAR(50),
+            contribution_pct NUMERIC(5, 2),
+            joined_at DATE,
+            PRIMARY KEY (project_id, researcher_id)
+        )
+    """,
+    'author_publication': """
+        CREATE TABLE author_publication (
+            publication_id INTEGER NOT NULL,
+            researcher_id INTEGER NOT NULL,
+            author_order INTEGER,
+            PRIMARY KEY (publication_id, researcher_id)
+        )
+    """,
+}
+
+
+def create_legacy_schema(connection) -> None:
+    """ Eksik olan managed = False tablolarını ve ilişki tablolarını oluşturur (--keepdb ile güvenli) """
+    existing = set(connection.introspection.table_names())
+    models = [
+        model for model in apps.get_app_config('core').get_models()
+        if not model._meta.managed and model._meta.db_table not in existing
+    ]
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+        for table, ddl in LINK_TABLES.items():
+            if table not in existing:
+                editor.execute(ddl)
+
+
+class LegacySchemaRunner(DiscoverRunner):
+
+    def setup_databases(self, **kwargs):
+        old_config = super().setup_databases(**kwargs)
+        for alias in connections:
+            create_legacy_schema(connections[alias])
+        return old_config
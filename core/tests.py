@@ -1,3 +1,2194 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import networkx as nx
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .admission import EXPORT, GATES, NETWORK, SUGGESTIONS, GatedStream
+from .ann import VECTOR_INDEXES, BruteForceIndex, IVFIndex, VectorIndex, get_vector_index
+from .analytics import communities, compute, is_stale, run_analysis
+from .async_views import _admission
+from .changes import changed_since, changes_since, if_none_match, settled_version
+from .embeddings import (
+    EmbeddingBatcher,
+    get_model,
+    is_embeddable,
+    is_model_loaded,
+    load_embeddings,
+    preload_model,
+    store_embedding,
+    sync_embeddings,
+    text_hash,
+)
+from .export import EXPORT_FORMATS, GEXF, GRAPHML, NDJSON, export_network
+from .graph import (
+    COLLABORATION_GRAPH,
+    MEMBERSHIP_TABLES,
+    PPR_RESTART,
+    PPR_TOLERANCE,
+    PROJECT,
+    PUBLICATION,
+    CollaborationGraph,
+)
+from .jobs import AUTO_TAG, BULK_ANALYSIS, GRAPH_ANALYTICS, HANDLERS, STALE_AFTER, claim_next, enqueue, run_job
+from .materialized import TOP_N, get_materialized_suggestions, refresh_materialized_suggestions, researcher_fingerprint
+from .models import (
+    CollaborationSuggestion,
+    CollaborationSuggestionState,
+    Department,
+    EntityEmbedding,
+    EntityTag,
+    GraphAnalysis,
+    GraphChange,
+    Job,
+    Project,
+    Publication,
+    Researcher,
+    ResearcherCentrality,
+    Skill,
+    Tag,
+)
+from .onboarding import (
+    BULK_FORMATS,
+    CSV_FORMAT,
+    NDJSON_FORMAT,
+    _create as _create_researchers,
+    bulk_onboard,
+    insert_researcher_skills,
+    iter_rows,
+)
+from .scoring import MIN_SCORE, NETWORK_PAGERANK, FeatureMatrices, rank_batch, rank_suggestions
+from .services import FEATURE_SNAPSHOT, get_collaboration_suggestions, get_feature_matrices
+from .snapshot import VersionedSnapshot
+from .tagging import LABEL_MATRIX, _ASCII_CASES, TagMatcher, get_label_matrix, suggest_labels_for_text
+
+
+# ---------------------------------------------------------
+# EMBEDDING DEPOSU (core/embeddings.py)
+# ---------------------------------------------------------
+
+def _fake_encode(texts, batch_size=64):
+    vectors = np.zeros((len(texts), 8), dtype=np.float32)
+    for row, text in enumerate(texts):
+        vectors[row, len(text) % 8] = 1.0
+    return vectors
+
+
+@mock.patch('core.embeddings.AI_AVAILABLE', True)
+class EmbeddingStoreTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('core.embeddings.encode_texts', side_effect=_fake_encode)
+        self.encode = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.researcher = Researcher.objects.create(
+            full_name="Elif Demir", email="elif@example.com", bio="Kuantum optiği ve fotonik devreler",
+        )
+
+    def _encoded_texts(self):
+        return [text for call in self.encode.call_args_list for text in call.args[0]]
+
+    def test_same_text_is_not_encoded_again(self):
+        r_id, bio = self.researcher.researcher_id, self.researcher.bio
+        first = store_embedding('researcher', r_id, bio)
+        self.assertEqual(self._encoded_texts(), [bio])
+
+        np.testing.assert_array_equal(store_embedding('researcher', r_id, bio), first)
+        self.assertEqual(sync_embeddings('researcher', [(r_id, bio)]), {"encoded": 0, "unchanged": 1, "skipped": 0})
+        self.assertEqual(self._encoded_texts(), [bio])
+        stored_hash, vector = load_embeddings('researcher')[r_id]
+        self.assertEqual(stored_hash, text_hash(bio))
+        np.testing.assert_array_equal(vector, first)
+
+    def test_edited_bio_is_encoded_again(self):
+        r_id = self.researcher.researcher_id
+        store_embedding('researcher', r_id, self.researcher.bio)
+
+        self.researcher.bio = "Kuantum optiği, fotonik devreler ve kuantum sensörler"
+        self.researcher.save()
+        vector = store_embedding('researcher', r_id, self.researcher.bio)
+        self.assertEqual(len(self._encoded_texts()), 2)
+        np.testing.assert_array_equal(vector, _fake_encode([self.researcher.bio])[0])
+        self.assertEqual(load_embeddings('researcher')[r_id][0], text_hash(self.researcher.bio))
+        self.assertEqual(EntityEmbedding.objects.filter(entity_type='researcher', entity_id=r_id).count(), 1)
+
+        # Sadece değişenler encode edilir
+        other_bio = "Polimer kimyası ve kataliz"
+        counts = sync_embeddings('researcher', [(r_id, self.researcher.bio), (r_id + 1, other_bio), (r_id + 2, "kısa")])
+        self.assertEqual(counts, {"encoded": 1, "unchanged": 1, "skipped": 1})
+        self.assertEqual(self._encoded_texts()[-1], other_bio)
+
+    def test_text_too_short_drops_the_vector(self):
+        r_id = self.researcher.researcher_id
+        store_embedding('researcher', r_id, self.researcher.bio)
+        self.assertIsNone(store_embedding('researcher', r_id, "kısa"))
+        self.assertEqual(load_embeddings('researcher'), {})
+
+
+# ---------------------------------------------------------
+# ÖZELLİK ÖNBELLEĞİ (core/snapshot.py, core/signals.py)
+# ---------------------------------------------------------
+
+class FeatureSnapshotTests(TestCase):
+
+    def _bumps(self, write):
+        before = FEATURE_SNAPSHOT.version
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        return FEATURE_SNAPSHOT.version > before
+
+    def test_writes_invalidate_the_snapshot(self):
+        department = Department.objects.create(name="Fizik")
+        researcher = Researcher.objects.create(full_name="Elif Demir", email="elif@example.com")
+        tag = Tag.objects.create(name="Kuantum")
+        skill = Skill.objects.create(name="Python")
+
+        self.assertTrue(self._bumps(lambda: EntityTag.objects.create(
+            entity_type='researcher', entity_id=researcher.researcher_id, tag=tag,
+        )))
+        self.assertTrue(self._bumps(lambda: EntityTag.objects.filter(tag=tag).delete()))
+        self.assertTrue(self._bumps(lambda: Tag.objects.filter(pk=tag.pk).first().save()))
+        self.assertTrue(self._bumps(lambda: Skill.objects.create(name="Spektroskopi")))
+        self.assertTrue(self._bumps(skill.delete))
+        self.assertTrue(self._bumps(lambda: Department.objects.filter(pk=department.pk).first().save()))
+        self.assertTrue(self._bumps(researcher.save))
+        # Geri alınan transaction önbelleği boşaltmaz
+        before = FEATURE_SNAPSHOT.version
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Tag.objects.create(name="Optik")
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+        self.assertEqual(FEATURE_SNAPSHOT.version, before)
+
+    def test_snapshot_rebuilds_with_new_data(self):
+        researcher = Researcher.objects.create(full_name="Elif Demir", email="elif@example.com")
+        tag = Tag.objects.create(name="Kuantum")
+        FEATURE_SNAPSHOT.invalidate()
+        matrices = FEATURE_SNAPSHOT.get()
+        self.assertIs(FEATURE_SNAPSHOT.get(), matrices)
+        self.assertEqual(matrices.row_items(matrices.tags, matrices.index[researcher.researcher_id]).tolist(), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EntityTag.objects.create(entity_type='researcher', entity_id=researcher.researcher_id, tag=tag)
+        rebuilt = FEATURE_SNAPSHOT.get()
+        self.assertIsNot(rebuilt, matrices)
+        row = rebuilt.index[researcher.researcher_id]
+        self.assertEqual(rebuilt.tag_ids[rebuilt.row_items(rebuilt.tags, row)].tolist(), [tag.tag_id])
+
+    def test_build_overtaken_by_invalidate_is_not_fresh(self):
+        started, release = threading.Event(), threading.Event()
+        source = {"value": "eski"}
+
+        def build():
+            value = source["value"]
+            started.set()
+            release.wait(5)
+            return value
+
+        snapshot = VersionedSnapshot(build)
+        results = []
+        builder = threading.Thread(target=lambda: results.append(snapshot.get()))
+        builder.start()
+        started.wait(5)
+        # Kurulum sürerken veri değişti
+        source["value"] = "yeni"
+        snapshot.invalidate()
+        release.set()
+        builder.join(5)
+
+        self.assertEqual(results, ["eski"])
+        self.assertFalse(snapshot.is_fresh())
+        self.assertFalse(snapshot.status()["fresh"])
+        self.assertEqual(snapshot.get(), "yeni")
+        self.assertTrue(snapshot.is_fresh())
+
+    def test_concurrent_readers_share_one_build(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        snapshot = VersionedSnapshot(build)
+        values = []
+        readers = [threading.Thread(target=lambda: values.append(snapshot.get())) for _ in range(8)]
+        for reader in readers:
+            reader.start()
+        for reader in readers:
+            reader.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(value) for value in values}), 1)
+
+    def test_max_age(self):
+        snapshot = VersionedSnapshot(object, max_age=60)
+        first = snapshot.get()
+        self.assertIs(snapshot.get(), first)
+        with mock.patch('core.snapshot.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNot(snapshot.get(), first)
+
+
+# ---------------------------------------------------------
+# İŞBİRLİĞİ AĞI (core/graph.py)
+# ---------------------------------------------------------
+
+def _edge_weights(graph, kind):
+    """ {(researcher_id, researcher_id): ağırlık}: satır sırasından bağımsız karşılaştırma için """
+    coo = graph.weights(kind).tocoo()
+    return {(graph.ids[i], graph.ids[j]): w for i, j, w in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist())}
+
+
+def _insert_membership(kind, group_id, researcher_id):
+    table, column = MEMBERSHIP_TABLES[kind]
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {table} ({column}, researcher_id) VALUES (%s, %s)", [group_id, researcher_id])
+
+
+class CollaborationGraphTests(TestCase):
+
+    def test_deltas_match_reload(self):
+        rng = random.Random(11)
+        memberships = set()
+        for _ in range(80):
+            membership = (rng.choice([PROJECT, PUBLICATION]), rng.randint(1, 15), rng.randint(1, 30))
+            if membership not in memberships:
+                memberships.add(membership)
+                _insert_membership(*membership)
+        graph = CollaborationGraph.load()
+
+        for step in range(300):
+            kind, group_id, researcher_id = rng.choice([PROJECT, PUBLICATION]), rng.randint(1, 18), rng.randint(1, 35)
+            table, column = MEMBERSHIP_TABLES[kind]
+            if (kind, group_id, researcher_id) in memberships:
+                memberships.discard((kind, group_id, researcher_id))
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DELETE FROM {table} WHERE {column} = %s AND researcher_id = %s", [group_id, researcher_id])
+                self.assertTrue(graph.remove_membership(kind, group_id, researcher_id))
+            else:
+                memberships.add((kind, group_id, researcher_id))
+                _insert_membership(kind, group_id, researcher_id)
+                self.assertTrue(graph.add_membership(kind, group_id, researcher_id))
+            if step % 37 == 0:
+                graph.adjacency()   # bekleyen deltalar ara ara uygulansın
+
+        # Bütün grup ve bütün üyelikleriyle bir araştırmacı
+        graph.remove_group(PROJECT, 3)
+        graph.remove_researcher(7)
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM project_researcher WHERE project_id = 3 OR researcher_id = 7")
+            cursor.execute("DELETE FROM author_publication WHERE researcher_id = 7")
+
+        reloaded = CollaborationGraph.load()
+        for kind in (PROJECT, PUBLICATION):
+            self.assertEqual(_edge_weights(graph, kind), _edge_weights(reloaded, kind))
+
+    def test_duplicate_and_unknown_deltas_are_ignored(self):
+        graph = CollaborationGraph()
+        self.assertTrue(graph.add_membership(PROJECT, 1, 10))
+        self.assertTrue(graph.add_membership(PROJECT, 1, 11))
+        self.assertFalse(graph.add_membership(PROJECT, 1, 11))
+        self.assertFalse(graph.remove_membership(PROJECT, 2, 10))
+        self.assertFalse(graph.remove_membership(PUBLICATION, 1, 10))
+        self.assertEqual(_edge_weights(graph, PROJECT), {(10, 11): 1.0, (11, 10): 1.0})
+
+    def test_project_delete_updates_the_cached_graph(self):
+        a, b = (
+            Researcher.objects.create(full_name=name, email=f"{name.lower()}@example.com")
+            for name in ("Ayşe", "Berk")
+        )
+        project = Project.objects.create(title="Kuantum Sensörler", status="active", pi=a)
+        COLLABORATION_GRAPH.invalidate()
+        graph = COLLABORATION_GRAPH.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            for researcher in (a, b):
+                self.client.post(f'/api/projects/{project.project_id}/researchers/', {'researcher_id': researcher.researcher_id})
+        self.assertEqual(_edge_weights(graph, PROJECT), {(a.researcher_id, b.researcher_id): 1.0, (b.researcher_id, a.researcher_id): 1.0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertIs(COLLABORATION_GRAPH.peek(), graph)
+        self.assertEqual(_edge_weights(graph, PROJECT), {})
+        self.assertEqual(graph.neighbours(graph.index[a.researcher_id]).tolist(), [])
+
+
+# ---------------------------------------------------------
+# ÖNERİ SKORLAMA (core/scoring.py)
+# ---------------------------------------------------------
+
+# En fazla iki sıfırdan farklı bileşen: iki vektörün çarpımı hangi sırayla
+# toplanırsa toplansın aynı float çıkar (matris çarpımı ile tekil dot aynı)
+SEMANTIC_PALETTE = [
+    (0.6, 0.8, 0.0, 0.0),
+    (0.8, 0.6, 0.0, 0.0),
+    (1.0, 0.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0, 0.0),
+    (0.0, 0.0, 0.6, 0.8),
+    (0.0, 0.0, 1.0, 0.0),
+]
+
+
+def _scoring_fixture(seed: int = 7, n: int = 60):
+    rng = random.Random(seed)
+    researchers, tags, skills, embeddings = {}, {}, {}, {}
+    for r_id in range(1, n + 1):
+        bio = "kısa" if r_id % 7 == 0 else f"araştırmacı {r_id} biyografisi"
+        researchers[r_id] = {
+            "full_name": f"R{r_id}",
+            "department_id": rng.choice([1, 2, 3, None]),
+            "bio": bio,
+        }
+        tags[r_id] = set(rng.sample(range(1, 9), rng.randint(0, 3)))
+        skills[r_id] = set(rng.sample(range(1, 7), rng.randint(0, 2)))
+        if is_embeddable(bio) and r_id % 5:
+            embeddings[r_id] = (text_hash(bio), np.array(rng.choice(SEMANTIC_PALETTE), dtype=np.float32))
+
+    groups = {
+        PROJECT: [rng.sample(range(1, n + 1), rng.randint(2, 4)) for _ in range(25)],
+        PUBLICATION: [rng.sample(range(1, n + 1), rng.randint(2, 3)) for _ in range(15)],
+    }
+    graph = CollaborationGraph()
+    for kind, members in groups.items():
+        for group_id, group in enumerate(members, start=1):
+            for r_id in group:
+                graph.add_membership(kind, group_id, r_id)
+
+    matrices = FeatureMatrices(
+        researchers,
+        {1: "D1", 2: "D2", 3: "D3"},
+        tags,
+        {t: f"T{t}" for t in range(1, 9)},
+        skills,
+        {s: f"S{s}" for s in range(1, 7)},
+        embeddings,
+    )
+    return matrices, graph, researchers, tags, skills, embeddings, groups
+
+
+def _reference_suggestions(base_id, researchers, tags, skills, embeddings, groups, limit):
+    """ Vektörleştirmeden önceki aday başına döngü (skorlar ham değere göre sıralanır) """
+    network = {r_id: set() for r_id in researchers}
+    for members in groups.values():
+        for group in members:
+            for r_id in group:
+                network[r_id].update(other for other in group if other != r_id)
+
+    base = researchers[base_id]
+    base_tags, base_skills, base_partners = tags[base_id], skills[base_id], network[base_id]
+    base_vector = embeddings[base_id][1] if base_id in embeddings else None
+
+    suggestions = []
+    for position, (candidate_id, info) in enumerate(researchers.items()):
+        if candidate_id == base_id:
+            continue
+        common_tags = base_tags & tags[candidate_id]
+        common_skills = base_skills & skills[candidate_id]
+        tag_score = len(common_tags) / (len(base_tags) or 1)
+        skill_score = len(common_skills) / (len(base_skills) or 1)
+        dept_score = 1.0 if base["department_id"] == info["department_id"] else 0.0
+        common_partners = base_partners & network[candidate_id]
+        network_score = min(len(common_partners) / 3.0, 1.0)
+        semantic_score = 0.0
+        if base_vector is not None and candidate_id in embeddings:
+            semantic_score = max(0.0, float(np.dot(embeddings[candidate_id][1], base_vector)))
+
+        total = (0.3 * tag_score) + (0.2 * skill_score) + (0.1 * dept_score) + \
+                (0.2 * network_score) + (0.2 * semantic_score)
+        if total <= MIN_SCORE:
+            continue
+        suggestions.append((-total, position, {
+            "researcher_id": candidate_id,
+            "score": round(float(total), 4),
+            "common_tags": sorted(f"T{t}" for t in common_tags),
+            "common_skills": sorted(f"S{s}" for s in common_skills),
+            "common_connections": len(common_partners),
+            "semantic_match": f"%{int(semantic_score * 100)}",
+        }))
+    suggestions.sort(key=lambda item: item[:2])
+    return [item[2] for item in suggestions[:limit]]
+
+
+class SuggestionScoringTests(TestCase):
+    """ Budanmış aday kümesiyle vektörel skorlama, herkesi tek tek skorlayan döngüyle aynı sonucu vermeli """
+
+    def setUp(self):
+        (self.matrices, self.graph, self.researchers, self.tags,
+         self.skills, self.embeddings, self.groups) = _scoring_fixture()
+
+    def _suggestions(self, base_id, limit):
+        base_row = self.matrices.index[base_id]
+        base_vector = self.matrices.embeddings[base_row] if self.matrices.has_embedding[base_row] else None
+        return [
+            {
+                "researcher_id": item["researcher_id"],
+                "score": item["score"],
+                "common_tags": sorted(item["reasons"]["common_tags"]),
+                "common_skills": sorted(item["reasons"]["common_skills"]),
+                "common_connections": item["reasons"]["common_connections"],
+                "semantic_match": item["reasons"]["semantic_match"],
+            }
+            for item in rank_suggestions(self.matrices, self.graph, base_id, base_vector, limit=limit)
+        ]
+
+    def test_matches_reference_loop(self):
+        for base_id in self.researchers:
+            for limit in (5, len(self.researchers)):
+                expected = _reference_suggestions(
+                    base_id, self.researchers, self.tags, self.skills, self.embeddings, self.groups, limit,
+                )
+                self.assertEqual(self._suggestions(base_id, limit), expected, f"researcher {base_id}, limit {limit}")
+
+    def test_semantic_only_candidates_are_kept(self):
+        # Ortak tag / skill / bağlantısı olmayan ama bio'su çok benzeyen aday da elenmemeli
+        semantic_only = 0
+        for base_id in self.researchers:
+            full = self._suggestions(base_id, len(self.researchers))
+            semantic_only += sum(
+                1 for item in full
+                if not item["common_tags"] and not item["common_skills"] and not item["common_connections"]
+            )
+        self.assertGreater(semantic_only, 0)
+
+
+# ---------------------------------------------------------
+# ANN İNDEKSLERİ (core/ann.py)
+# ---------------------------------------------------------
+
+def _unit_vectors(rng: np.random.Generator, n: int, dim: int = 16) -> np.ndarray:
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class VectorIndexTests(TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.ids = np.arange(100, 400, dtype=np.int64)
+        self.vectors = _unit_vectors(rng, len(self.ids))
+        self.queries = _unit_vectors(rng, 20)
+
+    def _exact(self, query, k, ids=None, vectors=None):
+        ids = self.ids if ids is None else ids
+        vectors = self.vectors if vectors is None else vectors
+        sims = vectors @ query
+        order = np.argsort(-sims, kind='stable')[:k]
+        return ids[order].tolist()
+
+    def test_interface_is_abstract(self):
+        class PartialIndex(VectorIndex):
+            def __len__(self):
+                return 0
+
+        with self.assertRaises(TypeError):
+            VectorIndex()
+        with self.assertRaises(TypeError):
+            PartialIndex()
+
+    def test_brute_force_is_exact(self):
+        index = BruteForceIndex().build(self.ids, self.vectors)
+        for query in self.queries:
+            ids, sims = index.query(query, 10)
+            self.assertEqual(ids.tolist(), self._exact(query, 10))
+            self.assertTrue(np.all(np.diff(sims) <= 0))
+
+    def test_ivf_probing_every_list_matches_brute_force(self):
+        index = IVFIndex(n_lists=8, n_probe=8).build(self.ids, self.vectors)
+        for query in self.queries:
+            self.assertEqual(index.query(query, 10)[0].tolist(), self._exact(query, 10))
+
+    def test_add_and_remove(self):
+        rng = np.random.default_rng(5)
+        for index in (BruteForceIndex().build(self.ids, self.vectors), IVFIndex(n_lists=8, n_probe=8).build(self.ids, self.vectors)):
+            # 150 güncellenir, 400-409 eklenir, 100-109 çıkarılır
+            new_ids = np.concatenate([np.array([150]), np.arange(400, 410)])
+            new_vectors = _unit_vectors(rng, len(new_ids))
+            index.add(new_ids, new_vectors)
+            index.remove(np.arange(100, 110))
+
+            expected = {i: v for i, v in zip(self.ids.tolist(), self.vectors) if not 100 <= i < 110}
+            expected.update(zip(new_ids.tolist(), new_vectors))
+            self.assertEqual(len(index), len(expected))
+            ids, vectors = index.items()
+            self.assertEqual(sorted(ids.tolist()), sorted(expected))
+            exp_ids = np.array(list(expected))
+            exp_vectors = np.stack(list(expected.values()))
+            for query in self.queries:
+                self.assertEqual(index.query(query, 10)[0].tolist(), self._exact(query, 10, exp_ids, exp_vectors))
+
+    def test_query_during_concurrent_updates_is_consistent(self):
+        # Sorgu, yazmalar sürerken bile id'leri doğru vektörlerle eşleştirmeli
+        rng = np.random.default_rng(9)
+        extra_ids = np.arange(1000, 1200, dtype=np.int64)
+        extra_vectors = _unit_vectors(rng, len(extra_ids))
+        truth = dict(zip(self.ids.tolist(), self.vectors))
+        truth.update(zip(extra_ids.tolist(), extra_vectors))
+
+        for index in (BruteForceIndex().build(self.ids, self.vectors), IVFIndex(n_lists=8, n_probe=8).build(self.ids, self.vectors)):
+            stop = threading.Event()
+            errors = []
+
+            def writer():
+                while not stop.is_set():
+                    for start in range(0, len(extra_ids), 10):
+                        index.add(extra_ids[start:start + 10], extra_vectors[start:start + 10])
+                    index.remove(extra_ids)
+
+            thread = threading.Thread(target=writer)
+            thread.start()
+            try:
+                for attempt in range(300):
+                    query = self.queries[attempt % len(self.queries)]
+                    try:
+                        ids, sims = index.query(query, 20)
+                        for entity_id, sim in zip(ids.tolist(), sims.tolist()):
+                            self.assertAlmostEqual(sim, float(truth[entity_id] @ query), places=5)
+                    except Exception as exc:  # IndexError vb. de hatadır
+                        errors.append(exc)
+            finally:
+                stop.set()
+                thread.join()
+            self.assertEqual(errors, [])
+
+
+# ---------------------------------------------------------
+# TOPLU EMBEDDING GÜNCELLEMESİ VE MODEL YÜKLEME (core/embeddings.py)
+# ---------------------------------------------------------
+
+@mock.patch('core.embeddings.encode_texts', _fake_encode)
+@mock.patch('core.embeddings.AI_AVAILABLE', True)
+class SyncEmbeddingsTests(TestCase):
+
+    def test_batch_write_updates_index_and_features(self):
+        # Toplu yazma post_save göndermez; indeks ve öneri önbelleği yine de commit'te güncellenmeli
+        index = get_vector_index('researcher')
+        version = FEATURE_SNAPSHOT.version
+        texts = [(r_id, f"araştırmacı {r_id} için yeterince uzun bir biyografi metni") for r_id in (11, 12, 13)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = sync_embeddings('researcher', texts)
+            self.assertEqual(counts["encoded"], 3)
+            self.assertEqual(len(index), 0)     # commit'ten önce değil
+
+        self.assertIs(VECTOR_INDEXES['researcher'].peek(), index)
+        ids, vectors = index.items()
+        self.assertEqual(sorted(ids.tolist()), [11, 12, 13])
+        expected = dict(zip([r_id for r_id, _ in texts], _fake_encode([text for _, text in texts])))
+        for entity_id, vector in zip(ids.tolist(), vectors):
+            np.testing.assert_array_equal(vector, expected[entity_id])
+        self.assertGreater(FEATURE_SNAPSHOT.version, version)
+
+
+class LazyModelTests(TestCase):
+
+    def setUp(self):
+        self.loaded = []
+        loaded = self.loaded
+
+        class FakeSentenceTransformer:
+            def __init__(self, name):
+                time.sleep(0.02)
+                loaded.append(name)
+
+        module = mock.Mock(SentenceTransformer=FakeSentenceTransformer)
+        for patcher in (
+            mock.patch.dict(sys.modules, {'sentence_transformers': module}),
+            mock.patch('core.embeddings._model', None),
+            mock.patch('sys.stdout', io.StringIO()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_model_is_loaded_once_on_first_use(self):
+        self.assertFalse(is_model_loaded())
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(get_model())) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(self.loaded), 1)
+        self.assertEqual(len({id(model) for model in models}), 1)
+        self.assertTrue(is_model_loaded())
+
+    def test_preload(self):
+        with mock.patch('core.embeddings.AI_AVAILABLE', False):
+            self.assertFalse(preload_model())
+        self.assertEqual(self.loaded, [])
+        with mock.patch('core.embeddings.AI_AVAILABLE', True):
+            self.assertTrue(preload_model())
+            self.assertTrue(preload_model())
+        self.assertEqual(len(self.loaded), 1)
+        self.assertIs(get_model(), get_model())
+
+
+# ---------------------------------------------------------
+# EMBEDDING MİKRO-BATCH KUYRUĞU (core/embeddings.py EmbeddingBatcher)
+# ---------------------------------------------------------
+
+class EmbeddingBatcherTests(TestCase):
+
+    def setUp(self):
+        self.batches = []
+        self.fail = False
+        batches = self.batches
+
+        def encode(texts, batch_size=64):
+            batches.append(list(texts))
+            if self.fail:
+                raise RuntimeError("model hatası")
+            return _fake_encode(texts)
+
+        patcher = mock.patch('core.embeddings.encode_texts', encode)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_requests_share_a_batch(self):
+        batcher = EmbeddingBatcher(max_batch_size=32, max_wait_ms=500)
+        texts = [f"metin {i}" + "x" * i for i in range(10)]
+        barrier = threading.Barrier(len(texts))
+        results = {}
+
+        def request(text):
+            barrier.wait()
+            results[text] = batcher.encode(text, timeout=5)
+
+        threads = [threading.Thread(target=request, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(sorted(self.batches[0]), sorted(texts))
+        for text in texts:
+            np.testing.assert_array_equal(results[text], _fake_encode([text])[0])
+        stats = batcher.stats()
+        self.assertEqual((stats["batches"], stats["items"]), (1, 10))
+
+    def test_batch_size_is_bounded(self):
+        batcher = EmbeddingBatcher(max_batch_size=4, max_wait_ms=500)
+        futures = [batcher.submit(f"metin {i}") for i in range(10)]
+        vectors = [future.result(5) for future in futures]
+        self.assertEqual([len(batch) for batch in self.batches], [4, 4, 2])
+        self.assertEqual(len(vectors), 10)
+
+    def test_lone_request_waits_at_most_max_wait(self):
+        batcher = EmbeddingBatcher(max_batch_size=32, max_wait_ms=30)
+        started = time.monotonic()
+        batcher.encode("tek başına bir metin", timeout=5)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(self.batches, [["tek başına bir metin"]])
+        self.assertLess(batcher.stats()["max_queue_latency_ms"], 1000)
+
+    def test_error_reaches_every_waiter(self):
+        self.fail = True
+        batcher = EmbeddingBatcher(max_batch_size=8, max_wait_ms=200)
+        futures = [batcher.submit(f"metin {i}") for i in range(3)]
+        for future in futures:
+            with self.assertRaisesRegex(RuntimeError, "model hatası"):
+                future.result(5)
+
+        # Kuyruk hatadan sonra çalışmaya devam eder
+        self.fail = False
+        np.testing.assert_array_equal(batcher.encode("yeni metin", timeout=5), _fake_encode(["yeni metin"])[0])
+
+
+# ---------------------------------------------------------
+# ÖNCEDEN HESAPLANMIŞ ÖNERİLER (core/materialized.py)
+# ---------------------------------------------------------
+
+# ad: (departman, tag'ler, skill'ler); projeler: ad -> üyeler
+SUGGESTION_PEOPLE = {
+    "Ayşe": ("Fizik", ("Kuantum", "Optik"), ("Python",)),
+    "Berk": ("Fizik", ("Kuantum",), ()),
+    "Cem": ("Fizik", ("Optik",), ("Spektroskopi",)),
+    "Derya": ("Kimya", ("Kataliz",), ("Python",)),
+    "Ece": ("Kimya", ("Kataliz", "Polimer"), ()),
+    "Fatih": (None, (), ()),
+    "Gül": ("Kimya", ("Kuantum",), ("Spektroskopi",)),
+}
+SUGGESTION_PROJECTS = {
+    "Kuantum Sensörler": ("Ayşe", "Derya"),
+    "Yeşil Kataliz": ("Derya", "Ece"),
+}
+
+
+def _suggestion_fixture():
+    """ SUGGESTION_PEOPLE / SUGGESTION_PROJECTS veritabanına yazılır; önbellekler boşaltılır """
+    departments = {name: Department.objects.create(name=name) for name in ("Fizik", "Kimya")}
+    tags = {name: Tag.objects.create(name=name) for name in ("Kuantum", "Optik", "Kataliz", "Polimer")}
+    skills = {name: Skill.objects.create(name=name) for name in ("Python", "Spektroskopi")}
+    people = {}
+    for name, (department, tag_names, skill_names) in SUGGESTION_PEOPLE.items():
+        researcher = Researcher.objects.create(
+            full_name=name, email=f"{name.lower()}@example.com", department=departments.get(department),
+        )
+        people[name] = researcher
+        for tag_name in tag_names:
+            EntityTag.objects.create(entity_type='researcher', entity_id=researcher.researcher_id, tag=tags[tag_name])
+        with connection.cursor() as cursor:
+            for skill_name in skill_names:
+                cursor.execute(
+                    "INSERT INTO researcher_skill (researcher_id, skill_id) VALUES (%s, %s)",
+                    [researcher.researcher_id, skills[skill_name].skill_id],
+                )
+    projects = {}
+    for title, members in SUGGESTION_PROJECTS.items():
+        projects[title] = Project.objects.create(title=title, status="active", pi=people[members[0]])
+        for name in members:
+            _insert_membership(PROJECT, projects[title].project_id, people[name].researcher_id)
+    FEATURE_SNAPSHOT.invalidate()
+    COLLABORATION_GRAPH.invalidate()
+    return people, tags, projects
+
+
+class MaterializedSuggestionTests(TestCase):
+
+    def setUp(self):
+        self.people, self.tags, _ = _suggestion_fixture()
+        self.ayse = self.people["Ayşe"].researcher_id
+
+    def _get(self, researcher_id, **params):
+        return self.client.get(f'/api/researchers/{researcher_id}/collaboration-suggestions/', params)
+
+    def _states(self):
+        return dict(CollaborationSuggestionState.objects.values_list('researcher_id', 'computed_at'))
+
+    def _retag(self, name, tag_name):
+        # Sinyaller önbelleği commit sonrasında boşaltır
+        with self.captureOnCommitCallbacks(execute=True):
+            EntityTag.objects.create(entity_type='researcher', entity_id=self.people[name].researcher_id, tag=self.tags[tag_name])
+
+    def test_served_from_table_after_refresh(self):
+        response = self._get(self.ayse)
+        self.assertEqual(response["X-Suggestions-Source"], "live")
+        live = response.json()
+
+        stats = refresh_materialized_suggestions()
+        self.assertEqual(stats["researchers"], len(SUGGESTION_PEOPLE))
+        self.assertEqual(stats["recomputed"], len(SUGGESTION_PEOPLE))
+        response = self._get(self.ayse)
+        self.assertEqual(response["X-Suggestions-Source"], "materialized")
+        self.assertEqual(
+            response["X-Suggestions-Computed-At"],
+            CollaborationSuggestionState.objects.get(researcher_id=self.ayse).computed_at.isoformat(),
+        )
+        self.assertEqual(response.json(), live)
+
+        # Başka network yöntemi, tablodakinden uzun liste veya süresi dolmuş kayıt: canlı hesaplanır
+        self.assertEqual(self._get(self.ayse, network=NETWORK_PAGERANK)["X-Suggestions-Source"], "live")
+        self.assertIsNone(get_materialized_suggestions(self.ayse, limit=TOP_N + 1))
+        with self.settings(SUGGESTIONS_MAX_AGE=0):
+            self.assertIsNone(get_materialized_suggestions(self.ayse))
+
+    def test_fingerprint_follows_inputs(self):
+        def fingerprint(name):
+            matrices, graph = get_feature_matrices(), COLLABORATION_GRAPH.get()
+            return researcher_fingerprint(matrices, graph, matrices.index[self.people[name].researcher_id])
+
+        before = fingerprint("Berk")
+        with self.captureOnCommitCallbacks(execute=True):
+            Researcher.objects.filter(pk=self.people["Berk"].pk).update(email="berk.k@example.com")
+        FEATURE_SNAPSHOT.invalidate()
+        self.assertEqual(fingerprint("Berk"), before)
+
+        self._retag("Berk", "Optik")
+        self.assertNotEqual(fingerprint("Berk"), before)
+
+        # Ağ komşuları da girdidir
+        before = fingerprint("Berk")
+        _insert_membership(PROJECT, 99, self.people["Berk"].researcher_id)
+        _insert_membership(PROJECT, 99, self.people["Fatih"].researcher_id)
+        COLLABORATION_GRAPH.invalidate()
+        self.assertNotEqual(fingerprint("Berk"), before)
+
+    def test_refresh_recomputes_only_affected(self):
+        refresh_materialized_suggestions()
+        self.assertEqual(refresh_materialized_suggestions()["recomputed"], 0)
+
+        before = self._states()
+        listing_cem = set(CollaborationSuggestion.objects.filter(
+            candidate_id=self.people["Cem"].researcher_id,
+        ).values_list('researcher_id', flat=True))
+        self.assertIn(self.ayse, listing_cem)
+
+        self._retag("Cem", "Kataliz")
+        stats = refresh_materialized_suggestions()
+        self.assertEqual(stats["changed"], 1)
+        after = self._states()
+        recomputed = {r_id for r_id in after if after[r_id] != before[r_id]}
+        # Cem, onu listesinde tutanlar ve yeni tag'i ile adayı olan Derya / Ece
+        self.assertTrue(listing_cem | {self.people[name].researcher_id for name in ("Cem", "Derya", "Ece")} <= recomputed)
+        self.assertNotIn(self.people["Fatih"].researcher_id, recomputed)
+        self.assertEqual(stats["recomputed"], len(recomputed))
+
+    def test_candidate_change_falls_back_to_live(self):
+        refresh_materialized_suggestions()
+        listed = [item["researcher_id"] for item in get_materialized_suggestions(self.ayse, limit=TOP_N)[0]]
+        self.assertIn(self.people["Cem"].researcher_id, listed)
+
+        # Ayşe'nin kendi girdileri aynı, ama listesindeki Cem değişti
+        self._retag("Cem", "Kuantum")
+        self.assertIsNone(get_materialized_suggestions(self.ayse, limit=1))
+        response = self._get(self.ayse)
+        self.assertEqual(response["X-Suggestions-Source"], "live")
+        self.assertNotIn("X-Suggestions-Computed-At", response)
+
+        refresh_materialized_suggestions()
+        response = self._get(self.ayse)
+        self.assertEqual(response["X-Suggestions-Source"], "materialized")
+        cem = next(item for item in response.json() if item["researcher_id"] == self.people["Cem"].researcher_id)
+        self.assertEqual(cem["reasons"]["common_tags"], ["Kuantum", "Optik"])
+
+    def test_deleted_candidate_falls_back_to_live(self):
+        refresh_materialized_suggestions()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.people["Berk"].delete()
+        self.assertIsNone(get_materialized_suggestions(self.ayse))
+        self.assertEqual(refresh_materialized_suggestions()["removed"], 1)
+        self.assertIsNotNone(get_materialized_suggestions(self.ayse))
+
+
+# ---------------------------------------------------------
+# İKİ FAZLI SIRALAMA (core/scoring.py rank_profile)
+# ---------------------------------------------------------
+
+class TopKSelectionTests(TestCase):
+
+    def test_ties_at_the_cutoff_keep_table_order(self):
+        # Tablo sırası id sırası değil; 3 güçlü aday, sonra aynı skorlu 6 aday
+        order = [1, 40, 12, 33, 7, 25, 18, 3, 29, 14]
+        strong = {33: 1, 18: 2, 14: 1}     # ortak skill sayısı
+        researchers = {r_id: {"full_name": f"R{r_id}", "department_id": None, "bio": ""} for r_id in order}
+        tags = {r_id: {1} for r_id in order}
+        skills = {1: {1, 2}, **{r_id: set(range(1, count + 1)) for r_id, count in strong.items()}}
+        matrices = FeatureMatrices(researchers, {}, tags, {1: "T1"}, skills, {1: "S1", 2: "S2"}, {})
+        graph = CollaborationGraph()
+
+        for limit in (3, 5, 8, 20):
+            ranked = [(item["researcher_id"], item["score"]) for item in rank_suggestions(matrices, graph, 1, limit=limit)]
+            scored = [
+                (r_id, round(0.3 + 0.2 * strong.get(r_id, 0) / 2 + 0.1, 4), position)
+                for position, r_id in enumerate(order) if r_id != 1
+            ]
+            expected = [(r_id, score) for r_id, score, _ in sorted(scored, key=lambda item: (-item[1], item[2]))][:limit]
+            self.assertEqual(ranked, expected, limit)
+        self.assertEqual([r_id for r_id, _ in ranked[:5]], [18, 33, 14, 40, 12])
+
+
+# ---------------------------------------------------------
+# TOPLU VE EKİP ÖNERİLERİ (core/scoring.py rank_batch, /collaboration-suggestions/batch/)
+# ---------------------------------------------------------
+
+class BatchSuggestionTests(TestCase):
+
+    def test_batch_matches_single_researcher_ranking(self):
+        matrices, graph, *_ = _scoring_fixture(seed=3)
+        ids = matrices.ids.tolist()
+        embeddings = {
+            r_id: matrices.embeddings[matrices.index[r_id]]
+            for r_id in ids if matrices.has_embedding[matrices.index[r_id]]
+        }
+        # Parça sınırı da denensin
+        with mock.patch('core.scoring.BATCH_CHUNK', 7):
+            batch = rank_batch(matrices, graph, ids + [ids[0], 999999], embeddings, limit=8)
+        self.assertEqual(list(batch), ids)
+        for r_id in ids:
+            self.assertEqual(batch[r_id], rank_suggestions(matrices, graph, r_id, embeddings.get(r_id), limit=8), r_id)
+
+    def test_endpoint_individual_and_team(self):
+        people, _, _ = _suggestion_fixture()
+        ayse, berk = people["Ayşe"].researcher_id, people["Berk"].researcher_id
+        response = self.client.post(
+            '/api/researchers/collaboration-suggestions/batch/',
+            {'researcher_ids': [ayse, berk, 999999], 'limit': 3},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        body = {item["researcher_id"]: item["suggestions"] for item in response.json()}
+        self.assertEqual(body[ayse], get_collaboration_suggestions(ayse, limit=3))
+        self.assertEqual(body[berk], get_collaboration_suggestions(berk, limit=3))
+        self.assertEqual(body[999999], [])
+
+        team = [ayse, people["Derya"].researcher_id]
+        response = self.client.post(
+            '/api/researchers/collaboration-suggestions/batch/',
+            {'researcher_ids': team, 'mode': 'team', 'limit': 10},
+            content_type='application/json',
+        )
+        suggested = [item["researcher_id"] for item in response.json()["suggestions"]]
+        self.assertTrue(suggested)
+        self.assertFalse(set(suggested) & set(team))
+        # Birleşik profil: Ece, Derya'nın tag'i ve projesi üzerinden gelir
+        self.assertIn(people["Ece"].researcher_id, suggested)
+
+        self.assertEqual(self.client.post(
+            '/api/researchers/collaboration-suggestions/batch/',
+            {'researcher_ids': list(range(101))},
+            content_type='application/json',
+        ).status_code, 400)
+
+
+# ---------------------------------------------------------
+# PROJEYE ARAŞTIRMACI ÖNERİSİ (/api/projects/{id}/suggested-researchers/)
+# ---------------------------------------------------------
+
+class ProjectSuggestionTests(TestCase):
+
+    def setUp(self):
+        self.people, self.tags, projects = _suggestion_fixture()
+        # Üyeler Derya (PI) ve Ece; departmanı yok, PI'ınki (Kimya) esas alınır
+        self.project = projects["Yeşil Kataliz"]
+
+    def _suggested(self, **params):
+        response = self.client.get(f'/api/projects/{self.project.project_id}/suggested-researchers/', params)
+        self.assertEqual(response.status_code, 200)
+        names = {researcher.researcher_id: name for name, researcher in self.people.items()}
+        return [(names[item["researcher_id"]], item) for item in response.json()]
+
+    def _tag_project(self, tag_name):
+        EntityTag.objects.create(entity_type='project', entity_id=self.project.project_id, tag=self.tags[tag_name])
+
+    def test_project_tags_and_member_skills_drive_the_profile(self):
+        self._tag_project("Kuantum")
+        suggested = self._suggested()
+        # Ayşe: Kuantum + Derya'nın skill'i (Python) + PI'ın işbirlikçisi; Gül: Kuantum + Kimya; Berk: Kuantum
+        self.assertEqual([name for name, _ in suggested], ["Ayşe", "Gül", "Berk"])
+        ayse = suggested[0][1]
+        self.assertEqual(ayse["reasons"]["common_tags"], ["Kuantum"])
+        self.assertEqual(ayse["reasons"]["common_skills"], ["Python"])
+        self.assertEqual(ayse["reasons"]["common_connections"], 1)
+        self.assertEqual([item["score"] for _, item in suggested], [round(0.3 + 0.2 + 0.2 / 3, 4), 0.4, 0.3])
+
+        EntityTag.objects.filter(entity_type='project').delete()
+        self._tag_project("Optik")
+        self.assertEqual([name for name, _ in self._suggested()], ["Ayşe", "Cem"])
+        self.assertEqual([name for name, _ in self._suggested(limit=1)], ["Ayşe"])
+
+    def test_members_are_not_suggested(self):
+        self._tag_project("Kataliz")
+        self._tag_project("Polimer")
+        names = [name for name, _ in self._suggested(limit=50)]
+        self.assertTrue(names)
+        self.assertNotIn("Derya", names)
+        self.assertNotIn("Ece", names)
+
+    def test_unknown_project(self):
+        self.assertEqual(self.client.get('/api/projects/999999/suggested-researchers/').status_code, 404)
+
+
+# ---------------------------------------------------------
+# KİŞİSELLEŞTİRİLMİŞ PAGERANK (core/graph.py)
+# ---------------------------------------------------------
+
+# 1-2-3-4 zinciri, 1-5 ve 5-3 (iki ortak yayın); ayrı bileşen 10-11-12
+PPR_GROUPS = {
+    PROJECT: ((1, 2), (2, 3), (3, 4), (10, 11), (11, 12)),
+    PUBLICATION: ((1, 5), (5, 3), (5, 3)),
+}
+
+
+def _ppr_graph():
+    graph = CollaborationGraph()
+    group_id = 0
+    for kind, groups in PPR_GROUPS.items():
+        for members in groups:
+            group_id += 1
+            for r_id in members:
+                graph.add_membership(kind, group_id, r_id)
+    return graph
+
+
+def _dense_ppr(graph, sources, restart=PPR_RESTART):
+    """ r = α·s + (1-α)·Pᵀr'nin kapalı çözümü: r = α·(I - (1-α)·Pᵀ)⁻¹·s (yoğun matrislerle) """
+    weights = (graph.weights(PROJECT) + graph.weights(PUBLICATION)).toarray()
+    degree = weights.sum(axis=1)
+    transition = np.divide(weights, degree[:, None], out=np.zeros_like(weights), where=degree[:, None] > 0)
+    start = np.zeros(len(weights))
+    start[list(sources)] = 1.0 / len(sources)
+    return restart * np.linalg.solve(np.eye(len(weights)) - (1 - restart) * transition.T, start)
+
+
+class PersonalizedPageRankTests(TestCase):
+
+    def setUp(self):
+        self.graph = _ppr_graph()
+        self.row = self.graph.index
+
+    def _scores(self, *researcher_ids):
+        rows, values = self.graph.personalized_pagerank(np.array([self.row[r_id] for r_id in researcher_ids]))
+        scores = np.zeros(len(self.graph.ids))
+        scores[rows] = values
+        return scores
+
+    def test_matches_dense_reference(self):
+        for sources in ((1,), (4,), (1, 4), (2, 5)):
+            expected = _dense_ppr(self.graph, [self.row[r_id] for r_id in sources])
+            scores = self._scores(*sources)
+            np.testing.assert_allclose(scores, expected, atol=1e-5)
+            self.assertAlmostEqual(scores.sum(), 1.0, places=5)
+
+    def test_converges_before_the_iteration_limit(self):
+        with mock.patch('core.graph.PPR_MAX_ITER', 1000):
+            long_run = self._scores(1)
+        self.graph._ppr_cache.clear()
+        np.testing.assert_allclose(self._scores(1), long_run, atol=PPR_TOLERANCE * 10)
+
+    def test_two_hop_collaborators_rank_above_unrelated(self):
+        scores = self._scores(1)
+        # 3: iki yoldan 2 adım, 4: 3 adım; diğer bileşen hiç ulaşılamaz
+        self.assertGreater(scores[self.row[3]], scores[self.row[4]])
+        self.assertGreater(scores[self.row[4]], 0.0)
+        for r_id in (10, 11, 12):
+            self.assertEqual(scores[self.row[r_id]], 0.0)
+
+    def test_cache_is_dropped_when_the_graph_changes(self):
+        first = self.graph.personalized_pagerank(np.array([self.row[1]]))
+        self.assertIs(self.graph.personalized_pagerank(np.array([self.row[1]])), first)
+        self.graph.add_membership(PROJECT, 99, 4)
+        self.graph.add_membership(PROJECT, 99, 10)
+        self.assertGreater(self._scores(1)[self.row[10]], 0.0)
+
+    def test_pagerank_network_score(self):
+        researchers = {r_id: {"full_name": f"R{r_id}", "department_id": r_id, "bio": ""} for r_id in self.graph.ids}
+        matrices = FeatureMatrices(researchers, {}, {}, {}, {}, {}, {})
+        suggestions = rank_suggestions(matrices, self.graph, 1, limit=10, network=NETWORK_PAGERANK)
+        ranked = [item["researcher_id"] for item in suggestions]
+        # Sıra PPR yakınlığını izler: iki yoldan ulaşılan 3 doğrudan ortakların önünde;
+        # diğer bileşen (10-12) hiç önerilmez
+        scores = self._scores(1)
+        self.assertEqual(ranked, sorted((2, 3, 5), key=lambda r_id: -scores[self.row[r_id]]))
+        self.assertEqual(ranked[0], 3)
+        self.assertEqual(suggestions[0]["reasons"]["network_proximity"], "%100")
+        # Ortak bağlantı yönteminde ortak komşusu olmayan 4 hiç aday olmaz
+        self.assertNotIn(4, [item["researcher_id"] for item in rank_suggestions(matrices, self.graph, 1, limit=10)])
+
+
+# ---------------------------------------------------------
+# KABUL KONTROLÜ (core/admission.py)
+# ---------------------------------------------------------
+
+class AdmissionControlTests(TestCase):
+
+    def test_full_gate_rejects_with_retry_after(self):
+        gate = GATES[SUGGESTIONS]
+        for _ in range(gate.slots):
+            gate.acquire()
+        try:
+            with mock.patch.object(gate, 'queue', 0):
+                response = self.client.get('/api/researchers/1/collaboration-suggestions/')
+        finally:
+            for _ in range(gate.slots):
+                gate.release()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(gate.retry_after))
+        self.assertEqual(gate.stats()["active"], 0)
+
+    def test_cancelled_async_wait_does_not_leak_slot(self):
+        # Kuyrukta beklerken iptal edilen isteğin thread'i slot'u sonradan alırsa hemen bırakmalı
+        gate = GATES[NETWORK]
+        admitted = gate.stats()["admitted"]
+
+        async def wait_for(condition):
+            for _ in range(500):
+                if condition():
+                    return
+                await asyncio.sleep(0.01)
+            self.fail(gate.stats())
+
+        async def request():
+            async with _admission(NETWORK):
+                pass
+
+        async def scenario():
+            for _ in range(gate.slots):
+                gate.acquire()
+            task = asyncio.ensure_future(request())
+            await wait_for(lambda: gate.stats()["queue_depth"] == 1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            gate.release()
+            await wait_for(lambda: gate.stats()["admitted"] == admitted + gate.slots + 1)
+            await wait_for(lambda: gate.stats()["active"] == gate.slots - 1)
+            for _ in range(gate.slots - 1):
+                gate.release()
+
+        with mock.patch.object(gate, 'timeout', 5.0):
+            asyncio.run(scenario())
+        self.assertEqual(gate.stats()["active"], 0)
+
+    def test_if_none_match_compares_whole_tags(self):
+        request = RequestFactory().get('/api/async/network/', HTTP_IF_NONE_MATCH='"network-12", W/"x"')
+        self.assertEqual(if_none_match(request), {'"network-12"', 'W/"x"'})
+        self.assertNotIn('"network-1"', if_none_match(request))
+
+
+# ---------------------------------------------------------
+# ASYNC ENDPOINT'LER (core/async_views.py, /api/async/...)
+# ---------------------------------------------------------
+
+async def _on_test_thread(func, *args, **kwargs):
+    # TestCase verisi commit edilmez: sorgular havuz thread'leri yerine testin bağlantısında çalışır
+    return await sync_to_async(func)(*args, **kwargs)
+
+
+@mock.patch('core.async_views.run_query', _on_test_thread)
+@mock.patch('core.async_views.run_scoring', _on_test_thread)
+class AsyncViewTests(TestCase):
+
+    def setUp(self):
+        self.people, _, _ = _suggestion_fixture()
+
+    def test_responses_match_sync_endpoints(self):
+        ayse = self.people["Ayşe"].researcher_id
+        for path in (
+            f'researchers/{ayse}/collaboration-suggestions/',
+            f'researchers/{ayse}/collaboration-suggestions/?limit=2',
+            'network/',
+            'dashboard/general_stats/',
+            'dashboard/department_distribution/',
+            'dashboard/top_skills/',
+        ):
+            response = self.client.get('/api/async/' + path)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertEqual(response.json(), self.client.get('/api/' + path).json(), path)
+
+    def test_only_get_is_allowed(self):
+        self.assertEqual(self.client.post('/api/async/network/').status_code, 405)
+
+
+# ---------------------------------------------------------
+# OTOMATİK ETİKETLEME (core/tagging.py)
+# ---------------------------------------------------------
+
+MATCHER_TAGS = [
+    "Machine Learning", "learning", "AI", "ai ethics", "Kinetics", "Sıvı", "İstanbul", "Islam",
+    "Görüntü İşleme", "µm", "μm", "Σοφία", "σοφίας", "ͅ", "ι", "Straße", "STRASSE", "C++", "", "ſcience",
+]
+MATCHER_WORDS = [
+    "machine", "MACHINE", "learning", "Learning", "LEARNİNG", "leArnıng", "ai", "AI", "aı", "Aİ", "ethics",
+    "\u212ainetics", "kinetics", "sıvı", "SIVI", "sivi", "İSTANBUL", "istanbul", "ıstanbul", "ISLAM", "islam",
+    "görüntü", "GÖRÜNTÜ", "işleme", "İŞLEME", "µm", "μm", "ΜM", "σοφία", "ΣΟΦΊΑ", "σοφίας", "σοφίαϲ",
+    "ͅ", "ι", "Ι", "ι", "straße", "STRASSE", "c++", "science", "SCIENCE", "ſcience",
+    " ", ",", "-", ".",
+]
+
+
+def _reference_tags(tags, text):
+    """ Otomattan önceki yöntem: her tag için ayrı regex """
+    return [
+        tag_id for tag_id, name in tags
+        if re.search(r'\b' + re.escape(name) + r'\b', text, re.IGNORECASE)
+    ]
+
+
+class TagMatcherTests(TestCase):
+
+    def test_ascii_cases_match_regex_engine(self):
+        # Otomat sadece ASCII adları içerir; metinde bir ASCII harfine eşit sayılan
+        # her ASCII dışı karakter _ASCII_CASES'te olmalı
+        letter = re.compile('[a-z]', re.IGNORECASE)
+        expected = {
+            chr(code): next(a for a in 'abcdefghijklmnopqrstuvwxyz' if re.fullmatch(a, chr(code), re.IGNORECASE))
+            for code in range(0x80, sys.maxunicode + 1) if letter.fullmatch(chr(code))
+        }
+        self.assertEqual(_ASCII_CASES, expected)
+
+    def test_matches_regex_loop(self):
+        tags = list(enumerate(MATCHER_TAGS, start=1))
+        matcher = TagMatcher(tags)
+        rng = random.Random(11)
+        texts = [" ".join(rng.choice(MATCHER_WORDS) for _ in range(rng.randint(1, 12))) for _ in range(3000)]
+        texts += [name for _, name in tags if name] + [name.upper() for _, name in tags] + [name.swapcase() for _, name in tags]
+        for text in texts:
+            self.assertEqual(matcher.match(text), sorted(_reference_tags(tags, text)), repr(text))
+
+    def test_greek_and_micro_variants(self):
+        tags = list(enumerate(MATCHER_TAGS, start=1))
+        matcher = TagMatcher(tags)
+        for text in ("5 µm", "5 μm", "5 ΜM", "ΣΟΦΊΑΣ", "σοφίαϲ", "ι", "Ι"):
+            expected = _reference_tags(tags, text)
+            self.assertTrue(expected, repr(text))
+            self.assertEqual(matcher.match(text), sorted(expected), repr(text))
+
+
+class BackfillTagsTests(TestCase):
+
+    def setUp(self):
+        Tag.objects.create(name="Robotics")
+        self.researcher = Researcher.objects.create(
+            full_name="Ada Yılmaz", email="ada@example.com", bio="Robotics and Machine Learning",
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = os.path.join(directory.name, 'checkpoint.json')
+
+    def _backfill(self, **options):
+        call_command('backfill_tags', entity='researcher', workers=1, checkpoint=self.checkpoint, stdout=io.StringIO(), **options)
+
+    def _tags(self):
+        return set(
+            EntityTag.objects.filter(entity_type='researcher', entity_id=self.researcher.researcher_id)
+            .values_list('tag__name', flat=True)
+        )
+
+    def test_resume_refuses_changed_tag_list(self):
+        self._backfill()
+        self.assertEqual(self._tags(), {"Robotics"})
+
+        # Checkpoint araştırmacıyı geçti; yeni tag onda hiç aranmamış olur
+        Tag.objects.create(name="Machine Learning")
+        with self.assertRaises(CommandError):
+            self._backfill(resume=True)
+
+        self._backfill()
+        self.assertEqual(self._tags(), {"Robotics", "Machine Learning"})
+
+    def test_resume_with_same_tag_list(self):
+        self._backfill()
+        EntityTag.objects.all().delete()
+        self._backfill(resume=True)
+        self.assertEqual(self._tags(), set())
+
+
+# ---------------------------------------------------------
+# ANLAMSAL ETİKET ÖNERİSİ (core/tagging.py LabelMatrix)
+# ---------------------------------------------------------
+
+# Sahte model: her anahtar kelime bir eksen; metin vektörü kelime sayılarıdır.
+# _suggestion_fixture'daki her tag / skill tek bir eksene düşer.
+LABEL_WORDS = ("kuantum", "optik", "kataliz", "polimer", "python", "spektroskopi")
+
+
+def _keyword_encode(texts, batch_size=64):
+    vectors = np.zeros((len(texts), len(LABEL_WORDS) + 1), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = re.findall(r'\w+', text.lower())
+        for col, word in enumerate(LABEL_WORDS):
+            vectors[row, col] = words.count(word)
+        if not vectors[row].any():
+            vectors[row, -1] = 1.0
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@mock.patch('core.views.AI_AVAILABLE', True)
+@mock.patch('core.embeddings.AI_AVAILABLE', True)
+class LabelSuggestionTests(TestCase):
+
+    def setUp(self):
+        # Tekil metinler EMBEDDING_BATCHER'dan, tag / skill adları doğrudan encode edilir
+        patcher = mock.patch('core.embeddings.encode_texts', side_effect=_keyword_encode)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('core.tagging.encode_texts', side_effect=_keyword_encode)
+        self.encode_labels = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('core.tagging._label_vectors', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        LABEL_MATRIX.invalidate()
+        self.addCleanup(LABEL_MATRIX.invalidate)
+        self.people, self.tags, _ = _suggestion_fixture()
+
+    @staticmethod
+    def _names(suggestions):
+        return {kind: [item["name"] for item in items] for kind, items in suggestions.items()}
+
+    def test_ranks_labels_by_similarity(self):
+        suggestions = suggest_labels_for_text("kuantum kuantum optik python ölçümleri")
+        self.assertEqual(self._names(suggestions), {"tags": ["Kuantum", "Optik"], "skills": ["Python"]})
+        self.assertEqual([item["score"] for item in suggestions["tags"]], [0.8165, 0.4082])
+
+        # Eşik ve tür başına limit
+        self.assertEqual(self._names(suggest_labels_for_text("kuantum kuantum optik python", threshold=0.5)), {"tags": ["Kuantum"], "skills": []})
+        self.assertEqual(self._names(suggest_labels_for_text("kuantum kuantum optik python", limit=1))["tags"], ["Kuantum"])
+
+    def test_matrix_scores_every_label_at_once(self):
+        matrix = get_label_matrix()
+        self.assertEqual(len(matrix), 6)
+        self.assertEqual(self.encode_labels.call_count, 1)
+        vector = _keyword_encode(["optik spektroskopi"])[0]
+        scored = matrix.score(vector, 0.4, 10)
+        self.assertEqual(self._names(scored), {"tags": ["Optik"], "skills": ["Spektroskopi"]})
+        self.assertEqual(scored["skills"][0]["score"], 0.7071)
+        optik = self.tags["Optik"].tag_id
+        self.assertEqual(self._names(matrix.score(vector, 0.4, 10, exclude={'tag': {optik}})), {"tags": [], "skills": ["Spektroskopi"]})
+
+    def test_suggest_endpoint(self):
+        response = self.client.post('/api/tags/suggest/', {"text": "kuantum kuantum optik python", "limit": 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._names(response.json()), {"tags": ["Kuantum"], "skills": ["Python"]})
+
+        for body in ({}, {"text": "  "}, {"text": "kuantum optik", "threshold": 2}, {"text": "kuantum optik", "limit": "x"}):
+            self.assertEqual(self.client.post('/api/tags/suggest/', body, content_type='application/json').status_code, 400, body)
+        with mock.patch('core.views.AI_AVAILABLE', False):
+            self.assertEqual(self.client.post('/api/tags/suggest/', {"text": "kuantum"}, content_type='application/json').status_code, 503)
+
+    def test_suggested_tags_skip_labels_the_researcher_has(self):
+        # Ayşe'de Kuantum, Optik tag'leri ve Python skill'i zaten var
+        ayse = self.people["Ayşe"]
+        ayse.bio = "kuantum kuantum optik python polimer spektroskopi deneyleri"
+        ayse.save()
+        response = self.client.get(f'/api/researchers/{ayse.researcher_id}/suggested-tags/', {"threshold": 0.3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._names(response.json()), {"tags": ["Polimer"], "skills": ["Spektroskopi"]})
+        # Aynı metin için serbest metin önerisi hiçbir şeyi dışlamaz
+        self.assertEqual(self._names(suggest_labels_for_text(ayse.bio, threshold=0.3))["tags"], ["Kuantum", "Optik", "Polimer"])
+
+        self.assertEqual(self.client.get('/api/researchers/999999/suggested-tags/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/researchers/{ayse.researcher_id}/suggested-tags/', {"threshold": -2}).status_code, 400)
+
+    def test_matrix_rebuilds_when_tags_or_skills_change(self):
+        self.assertEqual(len(get_label_matrix()), 6)
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name="Kataliz Polimer")
+        self.assertEqual(len(get_label_matrix()), 7)
+        self.assertEqual(self.encode_labels.call_args_list[-1].args[0], ["Kataliz Polimer"])
+
+        python = Skill.objects.get(name="Python")
+        with self.captureOnCommitCallbacks(execute=True):
+            python.name = "Python Kataliz"
+            python.save()
+        names = self._names(suggest_labels_for_text("kataliz kataliz", threshold=0.5))
+        self.assertEqual(names, {"tags": ["Kataliz", "Kataliz Polimer"], "skills": ["Python Kataliz"]})
+        # Sadece adı yeni olan encode edilir
+        self.assertEqual(self.encode_labels.call_args_list[-1].args[0], ["Python Kataliz"])
+
+
+# ---------------------------------------------------------
+# TOPLU İÇE AKTARMA (core/onboarding.py, /api/researchers/bulk-onboard/)
+# ---------------------------------------------------------
+
+ONBOARD_FIELDS = ("full_name", "email", "department_code", "department_id", "title", "bio", "skills", "tag_ids")
+# Satır sırası (CSV'de başlıktan sonra, NDJSON'da 1'den): 1 ve 6 geçerli, diğerleri hatalı
+ONBOARD_ROWS = [
+    {"full_name": "Ayşe Kaya", "email": "ayse@example.com", "department_code": "fzk", "skills": ["Python", "spektroskopi"], "tag_ids": ["Kuantum"]},
+    {"full_name": "", "email": "e-posta-değil", "department_id": "999"},
+    {"full_name": "Ayşe Kaya", "email": "ayse@example.com", "department_code": "FZK"},
+    {"full_name": "Eski Kayıt", "email": "mevcut@example.com", "department_code": "FZK"},
+    {"full_name": "Can Ak", "email": "can@example.com", "department_code": "FZK", "skills": ["Fortran"]},
+    {"full_name": "Berk Ay", "email": "berk@example.com", "department_code": "FZK", "title": "Dr.", "tag_ids": ["Optik", "optik"]},
+]
+ONBOARD_ERRORS = {
+    2: {"full_name", "email", "department_id"},
+    3: {"email"},
+    4: {"email"},
+    5: {"skills"},
+}
+
+
+def _onboard_lines(rows, fmt):
+    """ Kayıtları içe aktarma akışına (bayt satırları) çevirir; listeler CSV'de ';' ile birleşir """
+    if fmt == NDJSON_FORMAT:
+        return [json.dumps(row, ensure_ascii=False).encode() + b"\n" for row in rows]
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=ONBOARD_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({key: ";".join(value) if isinstance(value, list) else value for key, value in row.items()})
+    return out.getvalue().encode().splitlines(keepends=True)
+
+
+def _skill_names(researcher_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT s.name FROM researcher_skill rs JOIN skill s ON s.skill_id = rs.skill_id WHERE rs.researcher_id = %s",
+            [researcher_id],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+class BulkOnboardTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name="Fizik", code="FZK")
+        self.skills = {name: Skill.objects.create(name=name) for name in ("Python", "Spektroskopi")}
+        self.tags = {name: Tag.objects.create(name=name) for name in ("Kuantum", "Optik")}
+        Researcher.objects.create(full_name="Eski Kayıt", email="mevcut@example.com", department=self.department)
+
+    def _line(self, fmt, row_no):
+        """ ONBOARD_ROWS sırasındaki kaydın dosyadaki satır numarası """
+        return row_no + 1 if fmt == CSV_FORMAT else row_no
+
+    def _created(self):
+        return {
+            researcher.email: (
+                researcher.full_name,
+                researcher.department_id,
+                researcher.title,
+                _skill_names(researcher.researcher_id),
+                set(EntityTag.objects.filter(entity_type='researcher', entity_id=researcher.researcher_id).values_list('tag__name', flat=True)),
+            )
+            for researcher in Researcher.objects.exclude(email="mevcut@example.com")
+        }
+
+    def _assert_report(self, report, fmt, created):
+        self.assertEqual((report["total_rows"], report["valid_rows"], report["failed"]), (6, 2, 4))
+        self.assertEqual(report["created"], created)
+        self.assertEqual(
+            [(error["line"], set(error["errors"])) for error in report["errors"]],
+            [(self._line(fmt, row_no), fields) for row_no, fields in ONBOARD_ERRORS.items()],
+        )
+        by_line = {error["line"]: error for error in report["errors"]}
+        self.assertEqual(by_line[self._line(fmt, 3)]["errors"]["email"], "Bu e-posta dosyada daha önce geçti.")
+        self.assertEqual(by_line[self._line(fmt, 4)]["errors"]["email"], "Bu e-posta ile kayıtlı bir araştırmacı var.")
+        self.assertIn("Fortran", by_line[self._line(fmt, 5)]["errors"]["skills"])
+
+    def _check_import(self, fmt):
+        report = bulk_onboard(_onboard_lines(ONBOARD_ROWS, fmt), fmt, batch_size=2).as_dict()
+        self._assert_report(report, fmt, created=2)
+        self.assertIsNone(report["aborted"])
+        self.assertEqual(self._created(), {
+            "ayse@example.com": ("Ayşe Kaya", self.department.department_id, "", {"Python", "Spektroskopi"}, {"Kuantum"}),
+            "berk@example.com": ("Berk Ay", self.department.department_id, "Dr.", set(), {"Optik"}),
+        })
+        self.assertEqual(sorted(report["researcher_ids"]), sorted(Researcher.objects.exclude(email="mevcut@example.com").values_list('researcher_id', flat=True)))
+
+    def test_csv_import(self):
+        self._check_import(CSV_FORMAT)
+
+    def test_ndjson_import(self):
+        self._check_import(NDJSON_FORMAT)
+
+    def test_parsing(self):
+        csv_rows = list(iter_rows(_onboard_lines(ONBOARD_ROWS[:2], CSV_FORMAT), CSV_FORMAT))
+        self.assertEqual([line_no for line_no, _ in csv_rows], [2, 3])
+        self.assertEqual(csv_rows[0][1]["skills"], "Python;spektroskopi")
+        self.assertEqual(csv_rows[1][1]["full_name"], "")
+
+        # BOM atılır; boş satırlar atlanır, bozuk satırlar yerinde raporlanır
+        lines = [b"\xef\xbb\xbf" + _onboard_lines(ONBOARD_ROWS[:1], NDJSON_FORMAT)[0], b"\n", b"{bozuk\n", b"[1, 2]\n"]
+        ndjson_rows = list(iter_rows(lines, NDJSON_FORMAT))
+        self.assertEqual([line_no for line_no, _ in ndjson_rows], [1, 3, 4])
+        self.assertEqual(ndjson_rows[0][1], ONBOARD_ROWS[0])
+        self.assertTrue(ndjson_rows[1][1].startswith("Geçersiz JSON"))
+        self.assertEqual(ndjson_rows[2][1], "Her satır bir JSON nesnesi olmalıdır.")
+
+        report = bulk_onboard(lines, NDJSON_FORMAT).as_dict()
+        self.assertEqual((report["total_rows"], report["created"], report["failed"]), (3, 1, 2))
+
+    def test_unreadable_stream_keeps_written_batches(self):
+        lines = _onboard_lines(ONBOARD_ROWS[:1], NDJSON_FORMAT) + [b"\xff\xfe\n"]
+        report = bulk_onboard(lines, NDJSON_FORMAT, batch_size=1).as_dict()
+        self.assertTrue(report["aborted"].startswith("Dosya okunamadı"))
+        self.assertEqual(report["created"], 1)
+
+    def test_dry_run_writes_nothing(self):
+        for fmt in BULK_FORMATS:
+            with self.subTest(fmt=fmt):
+                report = bulk_onboard(_onboard_lines(ONBOARD_ROWS, fmt), fmt, batch_size=2, dry_run=True).as_dict()
+                self._assert_report(report, fmt, created=0)
+                self.assertTrue(report["dry_run"])
+                self.assertEqual(self._created(), {})
+
+    def test_batches_use_multi_row_inserts(self):
+        rows = [
+            {"full_name": f"Kişi {i}", "email": f"kisi{i}@example.com", "department_code": "FZK", "skills": ["Python"], "tag_ids": ["Kuantum"]}
+            for i in range(5)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            report = bulk_onboard(_onboard_lines(rows, NDJSON_FORMAT), NDJSON_FORMAT, batch_size=2)
+        self.assertEqual(len(report.researcher_ids), 5)
+        inserts = [query["sql"].split("(")[0].split()[-1].strip('"') for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        # Batch başına (3 batch: 2 + 2 + 1 satır) bir researcher, bir skill, bir tag INSERT'ü
+        self.assertEqual(inserts.count("researcher"), 3)
+        self.assertEqual(inserts.count("researcher_skill"), 3)
+        self.assertEqual(inserts.count("entity_tag"), 3)
+
+        # Çok satırlı INSERT parametre sınırı için MAX_ROWS_PER_INSERT'lük parçalara bölünür
+        with mock.patch('core.onboarding.MAX_ROWS_PER_INSERT', 2), CaptureQueriesContext(connection) as queries:
+            insert_researcher_skills([(r_id, self.skills["Spektroskopi"].skill_id) for r_id in report.researcher_ids])
+        self.assertEqual(len(queries.captured_queries), 3)
+        self.assertTrue(all(_skill_names(r_id) == {"Python", "Spektroskopi"} for r_id in report.researcher_ids))
+
+    def test_database_error_falls_back_to_single_rows(self):
+        # Doğrulamadan sonra başka bir istek aynı e-postayı eklemiş gibi
+        create = _create_researchers
+
+        def racing_create(records):
+            if any(record["email"] == "ayse@example.com" for _, record in records):
+                raise IntegrityError("UNIQUE constraint failed: researcher.email")
+            return create(records)
+
+        with mock.patch('core.onboarding._create', side_effect=racing_create) as patched:
+            report = bulk_onboard(_onboard_lines(ONBOARD_ROWS, CSV_FORMAT), CSV_FORMAT).as_dict()
+        # Tek batch başarısız, ardından iki geçerli satır tek tek
+        self.assertEqual([len(call.args[0]) for call in patched.call_args_list], [2, 1, 1])
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["failed"], 5)
+        self.assertEqual(report["errors"][0], {
+            "line": 2, "email": "ayse@example.com",
+            "errors": {"non_field_errors": "UNIQUE constraint failed: researcher.email"},
+        })
+        self.assertEqual(set(self._created()), {"berk@example.com"})
+
+    def test_endpoint_reports_rows_and_persists_valid_ones(self):
+        body = b"".join(_onboard_lines(ONBOARD_ROWS, CSV_FORMAT))
+        response = self.client.post('/api/researchers/bulk-onboard/?batch_size=2', body, content_type='text/csv')
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self._assert_report(report, CSV_FORMAT, created=2)
+        self.assertEqual(set(self._created()), {"ayse@example.com", "berk@example.com"})
+        job = Job.objects.get()
+        self.assertEqual((job.kind, sorted(job.payload["entity_ids"])), (BULK_ANALYSIS, sorted(report["researcher_ids"])))
+        self.assertEqual(report["job"]["id"], job.pk)
+
+        # Aynı dosya tekrar: hepsi veritabanında var, hiçbir şey eklenmez
+        upload = io.BytesIO(b"".join(_onboard_lines(ONBOARD_ROWS, NDJSON_FORMAT)))
+        upload.name = "arastirmacilar.ndjson"
+        response = self.client.post('/api/researchers/bulk-onboard/', {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["created"], response.json()["failed"]), (0, 6))
+
+    def test_endpoint_dry_run_and_bad_params(self):
+        body = b"".join(_onboard_lines(ONBOARD_ROWS, NDJSON_FORMAT))
+        response = self.client.post('/api/researchers/bulk-onboard/?dry_run=1', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self._assert_report(response.json(), NDJSON_FORMAT, created=0)
+        self.assertEqual((self._created(), Job.objects.count()), ({}, 0))
+
+        for query in ('?fmt=xml', '?fmt=csv&batch_size=x'):
+            self.assertEqual(self.client.post('/api/researchers/bulk-onboard/' + query, body, content_type='text/csv').status_code, 400, query)
+        self.assertEqual(self.client.post('/api/researchers/bulk-onboard/', body, content_type='text/plain').status_code, 400)
+
+
+# ---------------------------------------------------------
+# İŞ KUYRUĞU (core/jobs.py)
+# ---------------------------------------------------------
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        Tag.objects.create(name="Robotics")
+
+    def _researcher(self):
+        return Researcher.objects.create(full_name="Deniz Kaya", email="deniz@example.com", bio="Robotics lab")
+
+    def _tags(self, researcher):
+        return list(
+            EntityTag.objects.filter(entity_type='researcher', entity_id=researcher.researcher_id)
+            .values_list('tag__name', flat=True)
+        )
+
+    def test_worker_runs_auto_tag_job(self):
+        researcher = self._researcher()
+        self.assertTrue(Job.objects.filter(kind=AUTO_TAG, status=Job.PENDING).exists())
+
+        for job in iter(claim_next, None):
+            self.assertEqual(run_job(job).status, Job.DONE, job.error)
+
+        self.assertEqual(self._tags(researcher), ["Robotics"])
+        self.assertEqual(
+            Job.objects.get(kind=AUTO_TAG).result,
+            {"added_tags": ["Robotics"]},
+        )
+
+    def test_inline_mode_runs_auto_tag_after_commit(self):
+        with mock.patch('core.jobs.RUN_INLINE', True):
+            with self.captureOnCommitCallbacks(execute=True):
+                researcher = self._researcher()
+                self.assertEqual(self._tags(researcher), [])
+        self.assertEqual(self._tags(researcher), ["Robotics"])
+        self.assertFalse(Job.objects.filter(status=Job.PENDING).exists())
+
+    def test_enqueue_keeps_one_pending_copy(self):
+        first = enqueue(AUTO_TAG, entity_type='researcher', entity_id=1)
+        self.assertEqual(enqueue(AUTO_TAG, entity_type='researcher', entity_id=1), first)
+        self.assertNotEqual(enqueue(AUTO_TAG, entity_type='researcher', entity_id=2), first)
+        # Check-then-create yarışı veritabanında da engellenir
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Job.objects.create(kind=AUTO_TAG, dedup_key=first.dedup_key, payload=first.payload, run_after=timezone.now())
+
+        # Çalışmaya başlamış işin yerine yenisi kuyruğa girebilir
+        claimed = claim_next()
+        self.assertEqual(claimed, first)
+        self.assertNotEqual(enqueue(AUTO_TAG, entity_type='researcher', entity_id=1), first)
+
+    def test_only_jobs_with_lapsed_heartbeat_are_reclaimed(self):
+        job = enqueue(AUTO_TAG, entity_type='researcher', entity_id=1)
+        stuck = claim_next()
+        long_ago = timezone.now() - timedelta(seconds=STALE_AFTER * 10)
+
+        # Uzun süredir çalışıyor ama heartbeat'i geliyor: geri alınmaz
+        Job.objects.filter(pk=job.pk).update(started_at=long_ago, heartbeat_at=timezone.now())
+        self.assertIsNone(claim_next())
+
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=long_ago)
+        reclaimed = claim_next()
+        self.assertEqual(reclaimed, job)
+        self.assertEqual(reclaimed.attempts, 2)
+
+        # Eski worker sonunda biterse sonucu yenisinin üzerine yazılmaz
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertEqual(run_job(stuck).status, Job.DONE)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.RUNNING)
+        run_job(reclaimed)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.DONE)
+
+    def test_failed_retry_yields_to_newer_pending_copy(self):
+        def broken(**payload):
+            raise RuntimeError("bozuk")
+
+        with mock.patch.dict(HANDLERS, {'broken': broken}):
+            enqueue('broken', x=1)
+            first = claim_next()
+            second = enqueue('broken', x=1)
+            self.assertNotEqual(first, second)
+
+            with self.assertLogs('core.jobs', 'ERROR'):
+                run_job(first)
+            self.assertEqual(Job.objects.get(pk=first.pk).status, Job.FAILED)
+            self.assertEqual(Job.objects.get(pk=second.pk).status, Job.PENDING)
+
+    def test_api_shows_a_short_error(self):
+        def broken(**payload):
+            raise RuntimeError("bozuk\nayrıntı")
+
+        with mock.patch.dict(HANDLERS, {'broken': broken}):
+            job = enqueue('broken', x=1)
+            with self.assertLogs('core.jobs', 'ERROR') as logs:
+                run_job(claim_next())
+        # Traceback logda kalır, API'de sadece kısa mesaj görünür
+        self.assertIn('Traceback', logs.output[0])
+        body = self.client.get(f'/api/jobs/{job.pk}/').json()
+        self.assertEqual(body["status"], Job.PENDING)
+        self.assertEqual(body["error"], "RuntimeError: bozuk")
+
+
+# ---------------------------------------------------------
+# ALT AĞLAR (core/subgraph.py, /api/network/ego|department|tag/)
+# ---------------------------------------------------------
+
+class SubgraphEndpointTests(TestCase):
+    """
+    _suggestion_fixture'a bir proje eklenir. Ağ:
+    Ece - Derya - Ayşe, Ayşe / Berk / Cem üçgeni; Fatih ve Gül'ün ortak işi yok.
+    """
+
+    def setUp(self):
+        self.people, self.tags, _ = _suggestion_fixture()
+        project = Project.objects.create(title="Optik Ölçüm", status="active", pi=self.people["Cem"])
+        for name in ("Ayşe", "Berk", "Cem"):
+            _insert_membership(PROJECT, project.project_id, self.people[name].researcher_id)
+        COLLABORATION_GRAPH.invalidate()
+        self.names = {researcher.researcher_id: name for name, researcher in self.people.items()}
+
+    def _get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _ego(self, name, **params):
+        return self._get(f'/api/network/ego/{self.people[name].researcher_id}/', **params)
+
+    def _hops(self, body):
+        return {self.names[node["id"]]: node["hop"] for node in body["nodes"]}
+
+    def _edges(self, body):
+        return {frozenset((self.names[edge["from"]], self.names[edge["to"]])) for edge in body["edges"]}
+
+    def _nodes(self, body):
+        return {self.names[node["id"]] for node in body["nodes"]}
+
+    def test_ego_hop_limits(self):
+        body = self._ego("Ece")
+        self.assertEqual(self._hops(body), {"Ece": 0, "Derya": 1})
+        self.assertEqual(self._edges(body), {frozenset(("Ece", "Derya"))})
+        self.assertEqual(body["nodes"][0]["group"], "Kimya")
+
+        body = self._ego("Ece", depth=2)
+        self.assertEqual(self._hops(body), {"Ece": 0, "Derya": 1, "Ayşe": 2})
+        self.assertEqual(self._edges(body), {frozenset(("Ece", "Derya")), frozenset(("Derya", "Ayşe"))})
+
+        # depth NETWORK_EGO_MAX_DEPTH (3) ile sınırlı; Fatih ve Gül'e hiç ulaşılmaz
+        body = self._ego("Ece", depth=10)
+        self.assertEqual(self._hops(body), {"Ece": 0, "Derya": 1, "Ayşe": 2, "Berk": 3, "Cem": 3})
+        self.assertEqual(len(body["edges"]), 5)
+        self.assertFalse(body["truncated"])
+
+        body = self._ego("Gül", depth=3)
+        self.assertEqual((self._hops(body), body["edges"]), ({"Gül": 0}, []))
+
+    def test_ego_node_cap(self):
+        body = self._ego("Ece", depth=3, max_nodes=3)
+        self.assertEqual(self._hops(body), {"Ece": 0, "Derya": 1, "Ayşe": 2})
+        self.assertTrue(body["truncated"])
+
+        # Kesilen katmandan, bir önceki katmana en çok bağı olanlar kalır
+        graph = CollaborationGraph()
+        for group_id, members in enumerate(((1, 2), (1, 3), (2, 4), (3, 4), (3, 5)), start=1):
+            for r_id in members:
+                graph.add_membership(PROJECT, group_id, r_id)
+        rows, hops, truncated = graph.neighbourhood(graph.index[1], 2, max_nodes=4)
+        self.assertEqual(([graph.ids[row] for row in rows], hops.tolist(), truncated), ([1, 2, 3, 4], [0, 1, 1, 2], True))
+
+    def test_department_network(self):
+        fizik = Department.objects.get(name="Fizik").department_id
+        body = self._get(f'/api/network/department/{fizik}/')
+        self.assertEqual(self._nodes(body), {"Ayşe", "Berk", "Cem"})
+        self.assertEqual(self._edges(body), {frozenset(("Ayşe", "Berk")), frozenset(("Ayşe", "Cem")), frozenset(("Berk", "Cem"))})
+        self.assertFalse(body["truncated"])
+
+        # En çok bağlantısı olanlar kalır: Derya (2) ve Ece (1), Gül (0) değil
+        kimya = Department.objects.get(name="Kimya").department_id
+        body = self._get(f'/api/network/department/{kimya}/', max_nodes=2)
+        self.assertEqual(self._nodes(body), {"Derya", "Ece"})
+        self.assertEqual(self._edges(body), {frozenset(("Derya", "Ece"))})
+        self.assertTrue(body["truncated"])
+
+    def test_tag_network(self):
+        body = self._get(f'/api/network/tag/{self.tags["Kuantum"].tag_id}/')
+        self.assertEqual(self._nodes(body), {"Ayşe", "Berk", "Gül"})
+        self.assertEqual(self._edges(body), {frozenset(("Ayşe", "Berk"))})
+
+        body = self._get(f'/api/network/tag/{self.tags["Kuantum"].tag_id}/', max_nodes=1)
+        self.assertEqual((self._nodes(body), body["edges"], body["truncated"]), ({"Ayşe"}, [], True))
+
+        unused = Tag.objects.create(name="Akustik")
+        self.assertEqual(self._get(f'/api/network/tag/{unused.tag_id}/'), {"nodes": [], "edges": [], "truncated": False})
+
+    def test_not_found_and_bad_params(self):
+        ayse = self.people["Ayşe"].researcher_id
+        for url in ('/api/network/ego/999999/', '/api/network/department/999999/', '/api/network/tag/999999/'):
+            self.assertEqual(self.client.get(url).status_code, 404, url)
+        for url, params in (
+            (f'/api/network/ego/{ayse}/', {"depth": "x"}),
+            (f'/api/network/ego/{ayse}/', {"max_nodes": "x"}),
+            (f'/api/network/tag/{self.tags["Kuantum"].tag_id}/', {"max_nodes": "x"}),
+            ('/api/network/department/1/', {"max_nodes": "x"}),
+        ):
+            self.assertEqual(self.client.get(url, params).status_code, 400, (url, params))
+
+
+# ---------------------------------------------------------
+# AĞ DIŞA AKTARIMI (core/export.py, /api/network/export/)
+# ---------------------------------------------------------
+
+class NetworkExportTests(TestCase):
+
+    def setUp(self):
+        self.people, _, projects = _suggestion_fixture()
+        # XML'de kaçırılması gereken karakterler; Ayşe - Derya arasında proje ve yayın kenarı
+        self.people["Cem"].full_name = 'Cem & "Ortakları" <Lab>'
+        self.people["Cem"].save()
+        publication = Publication.objects.create(title="Kuantum Sensörler Üzerine")
+        for name in ("Ayşe", "Derya", "Cem"):
+            _insert_membership(PUBLICATION, publication.publication_id, self.people[name].researcher_id)
+        self.gate = GATES[EXPORT]
+        self.addCleanup(lambda: self.assertEqual(self.gate.stats()["active"], 0))
+
+    def _expected(self):
+        """ /api/network/ yanıtındaki düğümler ve (tür, küçük id, büyük id, ağırlık) kenarları """
+        body = self.client.get('/api/network/').json()
+        nodes = {node["id"]: (node["label"], node["group"]) for node in body["nodes"]}
+        edges = {(edge["type"], min(edge["from"], edge["to"]), max(edge["from"], edge["to"]), edge["value"]) for edge in body["edges"]}
+        return nodes, edges
+
+    def _export(self, fmt):
+        response = self.client.get('/api/network/export/', {"fmt": fmt})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f'network.{EXPORT_FORMATS[fmt][1]}', response["Content-Disposition"])
+        return b"".join(response.streaming_content)
+
+    def _assert_graph(self, graph, nodes, edges):
+        self.assertEqual(
+            {int(node_id[1:]): (data["label"], data["group"]) for node_id, data in graph.nodes(data=True)},
+            nodes,
+        )
+        exported = set()
+        for source, target, data in graph.edges(data=True):
+            a, b = sorted((int(source[1:]), int(target[1:])))
+            exported.add((data["type"], a, b, int(data["weight"])))
+        self.assertEqual(exported, edges)
+        self.assertEqual(graph.number_of_edges(), len(edges))
+
+    def test_ndjson(self):
+        nodes, edges = self._expected()
+        lines = [json.loads(line) for line in self._export(NDJSON).decode().splitlines()]
+        self.assertEqual({line["id"]: (line["label"], line["group"]) for line in lines if line["type"] == "node"}, nodes)
+        self.assertEqual({(line["kind"], line["from"], line["to"], line["value"]) for line in lines if line["type"] == "edge"}, edges)
+        self.assertEqual(len(lines), len(nodes) + len(edges))
+
+    def test_graphml(self):
+        nodes, edges = self._expected()
+        self.assertIn((PUBLICATION, *sorted((self.people["Ayşe"].researcher_id, self.people["Derya"].researcher_id)), 1), edges)
+        self._assert_graph(nx.read_graphml(io.BytesIO(self._export(GRAPHML))), nodes, edges)
+
+    def test_gexf(self):
+        nodes, edges = self._expected()
+        self._assert_graph(nx.read_gexf(io.BytesIO(self._export(GEXF))), nodes, edges)
+
+    def test_small_chunks_and_buffers(self):
+        expected = self._export(GRAPHML).decode()
+        with mock.patch('core.export.BUFFER_SIZE', 10):
+            chunks = list(export_network(GRAPHML, chunk_size=2))
+        self.assertGreater(len(chunks), len(self.people))
+        self.assertEqual("".join(chunks), expected)
+
+    def test_slot_is_held_until_the_stream_ends(self):
+        response = self.client.get('/api/network/export/', {"fmt": NDJSON})
+        self.assertEqual(self.gate.stats()["active"], 1)
+        content = iter(response.streaming_content)
+        next(content)
+        self.assertEqual(self.gate.stats()["active"], 1)
+        list(content)
+        self.assertEqual(self.gate.stats()["active"], 0)
+
+    def test_slot_is_released_when_the_response_is_closed(self):
+        # Hiç okunmadan (istemci bağlantıyı kesti) ve yarıda kapatılan yanıtlar
+        response = self.client.get('/api/network/export/', {"fmt": GEXF})
+        response.close()
+        self.assertEqual(self.gate.stats()["active"], 0)
+
+        with mock.patch('core.export.BUFFER_SIZE', 10):
+            response = self.client.get('/api/network/export/', {"fmt": GEXF})
+            next(iter(response.streaming_content))
+        response.close()
+        self.assertEqual(self.gate.stats()["active"], 0)
+
+        stream = GatedStream(self.gate, iter(["a", "b"]))
+        self.gate.acquire()
+        stream.close()
+        stream.close()
+        self.assertEqual(self.gate.stats()["active"], 0)
+
+    def test_busy_gate_and_bad_format(self):
+        self.assertEqual(self.client.get('/api/network/export/', {"fmt": "csv"}).status_code, 400)
+        for _ in range(self.gate.slots):
+            self.gate.acquire()
+        try:
+            with mock.patch.object(self.gate, 'queue', 0):
+                response = self.client.get('/api/network/export/')
+        finally:
+            for _ in range(self.gate.slots):
+                self.gate.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], str(self.gate.retry_after))
+
+
+# ---------------------------------------------------------
+# AĞ DEĞİŞİKLİK GÜNLÜĞÜ (core/changes.py)
+# ---------------------------------------------------------
+
+class GraphChangeLogTests(TestCase):
+
+    def setUp(self):
+        self.department = Department.objects.create(name="Fizik")
+        self.researcher = Researcher.objects.create(
+            full_name="Elif Demir", email="elif@example.com", title="Dr.", department=self.department, bio="Kuantum",
+        )
+
+    def _node_changes(self, since=0):
+        return [change for change in changes_since(since)["changes"] if change["entity"] == GraphChange.NODE]
+
+    def test_every_change_gets_a_commit_position(self):
+        self.assertFalse(GraphChange.objects.filter(txid__isnull=True).exists())
+        self.assertEqual(settled_version(), GraphChange.objects.order_by('-txid').values_list('txid', flat=True).first())
+
+    def test_only_node_fields_are_logged(self):
+        version = settled_version()
+        self.researcher.bio = "Kuantum optiği ve fotonik"
+        self.researcher.save()
+        self.researcher.email = "elif.demir@example.com"
+        self.researcher.save(update_fields=['email'])
+        self.assertEqual(self._node_changes(version), [])
+
+        self.researcher.title = "Doç. Dr."
+        self.researcher.save()
+        changes = self._node_changes(version)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0]["title"], "Doç. Dr.")
+        self.assertEqual(changes[0]["group"], "Fizik")
+
+    def test_department_rename_logs_its_researchers(self):
+        other = Researcher.objects.create(full_name="Can Ak", email="can@example.com")
+        version = settled_version()
+        self.department.faculty = "Fen"
+        self.department.save()
+        self.assertEqual(self._node_changes(version), [])
+
+        self.department.name = "Fizik Mühendisliği"
+        self.department.save()
+        changes = self._node_changes(version)
+        self.assertEqual([change["id"] for change in changes], [self.researcher.researcher_id])
+        self.assertEqual(changes[0]["group"], "Fizik Mühendisliği")
+        self.assertNotIn(other.researcher_id, [change["id"] for change in changes])
+
+    def test_pages_do_not_split_a_transaction(self):
+        # Aynı transaction'ın satırları aynı txid'yi taşır (PostgreSQL trigger'ı)
+        base = settled_version()
+        transactions = ((base + 10, 2), (base + 20, 3), (base + 30, 1))
+        for txid, count in transactions:
+            last_id = GraphChange.objects.order_by('-change_id').values_list('change_id', flat=True).first()
+            GraphChange.objects.bulk_create([
+                GraphChange(entity=GraphChange.NODE, op=GraphChange.REMOVE, source_id=1000 + i) for i in range(count)
+            ])
+            GraphChange.objects.filter(change_id__gt=last_id).update(txid=txid)
+
+        first = changes_since(base, limit=3)
+        self.assertTrue(first["has_more"])
+        self.assertEqual([change["version"] for change in first["changes"]], [base + 10] * 2)
+        self.assertEqual(first["version"], base + 10)
+
+        # limit'ten büyük transaction bölünmeden gelir
+        second = changes_since(first["version"], limit=2)
+        self.assertEqual([change["version"] for change in second["changes"]], [base + 20] * 3)
+        third = changes_since(second["version"], limit=2)
+        self.assertEqual([change["version"] for change in third["changes"]], [base + 30])
+        self.assertFalse(third["has_more"])
+        self.assertEqual(third["version"], base + 30)
+
+    def test_analysis_is_stale_after_a_change(self):
+        version = settled_version()
+        self.assertFalse(changed_since(version))
+        self.researcher.full_name = "Elif Demir Yıldız"
+        self.researcher.save()
+        self.assertTrue(changed_since(version))
+
+    def test_network_etag(self):
+        first = self.client.get('/api/network/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get('/api/network/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.researcher.title = "Prof. Dr."
+        self.researcher.save()
+        self.assertEqual(self.client.get('/api/network/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+    def test_project_delete_removes_its_edges(self):
+        a, b, c = (
+            Researcher.objects.create(full_name=name, email=f"{name.lower()}@example.com")
+            for name in ("Ayşe", "Berk", "Cem")
+        )
+        first = Project.objects.create(title="Kuantum Sensörler", status="active", pi=a)
+        second = Project.objects.create(title="Fotonik Devreler", status="active", pi=a)
+        for project, members in ((first, (a, b, c)), (second, (a, b))):
+            for researcher in members:
+                response = self.client.post(
+                    f'/api/projects/{project.project_id}/researchers/', {'researcher_id': researcher.researcher_id},
+                )
+                self.assertEqual(response.status_code, 201)
+
+        etag = self.client.get('/api/network/')['ETag']
+        version = settled_version()
+        first.delete()
+
+        self.assertEqual(self.client.get('/api/network/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        body = self.client.get('/api/network/changes/', {'since': version}).json()
+        edges = {(change["from"], change["to"]): change for change in body["changes"] if change["entity"] == GraphChange.EDGE}
+        ids = sorted(r.researcher_id for r in (a, b, c))
+        # a-b ikinci projede hâlâ ortak: ağırlık 1'e iner; c'nin kenarları silinir
+        self.assertEqual(edges[(a.researcher_id, b.researcher_id)]["op"], GraphChange.UPSERT)
+        self.assertEqual(edges[(a.researcher_id, b.researcher_id)]["value"], 1)
+        for pair in ((ids[0], ids[2]), (ids[1], ids[2])):
+            self.assertEqual(edges[pair]["op"], GraphChange.REMOVE)
+        self.assertTrue(changed_since(version))
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM project_researcher WHERE project_id = %s", [first.project_id])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+# ---------------------------------------------------------
+# AĞ ANALİZİ (core/analytics.py)
+# ---------------------------------------------------------
+
+# İki üçgen, aralarında 3 - 4 - 5 köprüsü (4-5 iki ortak proje). Köprüler: 3, 4, 5.
+ANALYTICS_PROJECTS = ((1, 2, 3), (3, 4), (4, 5), (4, 5), (5, 6, 7))
+
+
+class GraphAnalyticsTests(TestCase):
+
+    def setUp(self):
+        self.people = {
+            n: Researcher.objects.create(full_name=f"Araştırmacı {n}", email=f"r{n}@example.com")
+            for n in range(1, 9)
+        }
+        for group_id, members in enumerate(ANALYTICS_PROJECTS, start=1):
+            for n in members:
+                _insert_membership(PROJECT, group_id, self.people[n].researcher_id)
+
+    def _by_number(self, values):
+        numbers = {researcher.researcher_id: n for n, researcher in self.people.items()}
+        return {numbers[item["researcher_id"]]: item for item in values}
+
+    def test_compute(self):
+        graph = CollaborationGraph.load()
+        result = compute(graph)
+        row = {n: graph.index[researcher.researcher_id] for n, researcher in self.people.items() if n != 8}
+
+        self.assertEqual({n for n, r in row.items() if result["is_bridge"][r]}, {3, 4, 5})
+        self.assertEqual(result["edge_count"], 8)
+        self.assertEqual(result["community_count"], 2)
+        self.assertEqual(
+            {n: int(result["community"][r]) for n, r in row.items()},
+            {1: 1, 2: 1, 3: 1, 4: 0, 5: 0, 6: 0, 7: 0},
+        )
+        self.assertEqual([int(result["degree"][row[n]]) for n in (3, 4, 5)], [3, 2, 3])
+        self.assertEqual([int(result["weighted_degree"][row[n]]) for n in (3, 4, 5)], [3, 3, 4])
+        betweenness = {n: result["betweenness"][r] for n, r in row.items()}
+        self.assertEqual(max(betweenness, key=betweenness.get), 4)
+        self.assertEqual(betweenness[1], 0.0)
+        self.assertIsNone(result["betweenness_samples"])
+
+    def test_run_analysis_reuses_and_prunes(self):
+        first = run_analysis()
+        self.assertEqual(first.node_count, 7)
+        self.assertEqual(first.scores.count(), 7)
+        # Ağ değişmedi: yeniden hesaplanmaz
+        self.assertEqual(run_analysis().pk, first.pk)
+        self.assertFalse(is_stale(first))
+
+        analyses = [first]
+        with mock.patch('core.analytics.KEEP_ANALYSES', 2):
+            for title in ("Dr.", "Doç. Dr."):
+                researcher = self.people[1]
+                researcher.title = title
+                researcher.save()
+                self.assertTrue(is_stale(analyses[-1]))
+                analyses.append(run_analysis())
+        self.assertEqual(
+            list(GraphAnalysis.objects.order_by('analysis_id').values_list('pk', flat=True)),
+            [analysis.pk for analysis in analyses[1:]],
+        )
+        self.assertEqual(ResearcherCentrality.objects.count(), 2 * 7)
+
+    def test_communities_in_constant_queries(self):
+        analysis = run_analysis()
+        with self.assertNumQueries(3):
+            result = communities(analysis, top=2)
+        self.assertEqual([(item["community"], item["size"], item["bridges"]) for item in result], [(0, 4, 2), (1, 3, 1)])
+        members = [self._by_number(item["top_members"]) for item in result]
+        # En çok bağlantısı olan önce; eşitlikte küçük id
+        self.assertEqual(list(members[0]), [5, 4])
+        self.assertEqual(list(members[1]), [3, 1])
+        self.assertEqual(communities(analysis, limit=1)[0]["community"], 0)
+
+    def test_endpoints(self):
+        response = self.client.get('/api/network/central/')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(Job.objects.filter(kind=GRAPH_ANALYTICS, status=Job.PENDING).exists())
+        run_analysis()
+
+        body = self.client.get('/api/network/central/', {'metric': 'betweenness', 'limit': 3}).json()
+        self.assertFalse(body["analysis"]["stale"])
+        self.assertEqual(list(self._by_number(body["results"]))[0], 4)
+        body = self.client.get('/api/network/central/', {'metric': 'degree', 'community': 1}).json()
+        self.assertEqual(set(self._by_number(body["results"])), {1, 2, 3})
+        self.assertEqual(self.client.get('/api/network/central/', {'metric': 'pagerank'}).status_code, 400)
+
+        body = self.client.get('/api/network/communities/').json()
+        self.assertEqual([item["size"] for item in body["results"]], [4, 3])
+        body = self.client.get('/api/network/communities/1/').json()
+        self.assertEqual(set(self._by_number(body["members"])), {1, 2, 3})
+        self.assertEqual(self.client.get('/api/network/communities/5/').status_code, 404)
+
+        body = self.client.get(f'/api/researchers/{self.people[4].researcher_id}/centrality/').json()
+        self.assertEqual((body["community"], body["is_bridge"], body["community_size"], body["degree"]), (0, True, 4, 2))
+        body = self.client.get(f'/api/researchers/{self.people[8].researcher_id}/centrality/').json()
+        self.assertEqual((body["community"], body["degree"]), (None, 0))
+
+
+# ---------------------------------------------------------
+# EN KISA İŞBİRLİĞİ YOLU (core/graph.py, /api/network/path/)
+# ---------------------------------------------------------
+
+def _bfs_distances(graph, source):
+    """ Tek yönlü, düğüm düğüm BFS (karşılaştırma için) """
+    adjacency = graph.adjacency()
+    distance = {source: 0}
+    queue = deque([source])
+    while queue:
+        row = queue.popleft()
+        for neighbour in adjacency.indices[adjacency.indptr[row]:adjacency.indptr[row + 1]].tolist():
+            if neighbour not in distance:
+                distance[neighbour] = distance[row] + 1
+                queue.append(neighbour)
+    return distance
+
+
+class ShortestPathTests(TestCase):
+
+    def test_matches_breadth_first_search(self):
+        rng = random.Random(5)
+        graph = CollaborationGraph()
+        # Seyrek ağ: büyük bir bileşende 15 adıma kadar zincirler, birkaç kopuk düğüm
+        for group_id in range(1, 220):
+            for researcher_id in rng.sample(range(1, 201), rng.choice([2, 2, 2, 3])):
+                graph.add_membership(rng.choice([PROJECT, PUBLICATION]), group_id, researcher_id)
+        adjacency = graph.adjacency()
+
+        for source in rng.sample(range(len(graph.ids)), 15):
+            distance = _bfs_distances(graph, source)
+            for target in range(len(graph.ids)):
+                for max_hops in (3, 8, 20):
+                    path = graph.shortest_path(source, target, max_hops)
+                    expected = distance.get(target)
+                    if expected is None or expected > max_hops:
+                        self.assertIsNone(path, (source, target, max_hops))
+                        continue
+                    self.assertEqual(len(path) - 1, expected, (source, target, max_hops))
+                    self.assertEqual((path[0], path[-1]), (source, target))
+                    for a, b in zip(path, path[1:]):
+                        self.assertTrue(adjacency[a, b], (source, target, path))
+
+    def test_same_researcher(self):
+        graph = CollaborationGraph()
+        graph.add_membership(PROJECT, 1, 10)
+        self.assertEqual(graph.shortest_path(0, 0, 1), [0])
+
+    def test_path_endpoint(self):
+        a, b, c, d = (
+            Researcher.objects.create(full_name=name, email=f"{name.lower()}@example.com")
+            for name in ("Ayşe", "Berk", "Cem", "Derya")
+        )
+        first = Project.objects.create(title="Kuantum Sensörler", status="active", pi=a)
+        second = Project.objects.create(title="Fotonik Devreler", status="active", pi=b)
+        with connection.cursor() as cursor:
+            for project, researcher in ((first, a), (first, b), (second, b), (second, c)):
+                cursor.execute(
+                    "INSERT INTO project_researcher (project_id, researcher_id) VALUES (%s, %s)",
+                    [project.project_id, researcher.researcher_id],
+                )
+        COLLABORATION_GRAPH.invalidate()
+
+        response = self.client.get('/api/network/path/', {'from': a.researcher_id, 'to': c.researcher_id})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertTrue(body["found"])
+        self.assertEqual(body["hops"], 2)
+        self.assertEqual([node["id"] for node in body["nodes"]], [a.researcher_id, b.researcher_id, c.researcher_id])
+        self.assertEqual(
+            [[project["title"] for project in link["projects"]] for link in body["links"]],
+            [["Kuantum Sensörler"], ["Fotonik Devreler"]],
+        )
+
+        body = self.client.get('/api/network/path/', {'from': a.researcher_id, 'to': c.researcher_id, 'max_hops': 1}).json()
+        self.assertFalse(body["found"])
+        body = self.client.get('/api/network/path/', {'from': a.researcher_id, 'to': d.researcher_id}).json()
+        self.assertFalse(body["found"])
+
+        self.assertEqual(self.client.get('/api/network/path/', {'from': a.researcher_id, 'to': 999999}).status_code, 404)
+        self.assertEqual(self.client.get('/api/network/path/', {'from': a.researcher_id}).status_code, 400)
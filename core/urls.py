@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     DepartmentViewSet,
     ResearcherViewSet,
@@ -13,6 +14,8 @@ from .views import (
     SkillViewSet,
     DashboardViewSet,
     NetworkViewSet,
+    HealthViewSet,
+    JobViewSet,
 )
 
 router = DefaultRouter()
@@ -29,6 +32,18 @@ router.register(r'skills', SkillViewSet, basename='skill')
 # Basename zorunludur çünkü queryset'i olmayan özel bir ViewSet bu.
 router.register(r'dashboard', DashboardViewSet, basename='dashboard')
 router.register(r'network', NetworkViewSet, basename='network')
+router.register(r'health', HealthViewSet, basename='health')
+router.register(r'jobs', JobViewSet, basename='job')
+# Ağır endpoint'lerin async (ASGI) sürümleri, bkz. core/async_views.py
+async_urlpatterns = [
+    path('researchers/<int:pk>/collaboration-suggestions/', async_views.collaboration_suggestions),
+    path('network/', async_views.network),
+    path('dashboard/general_stats/', async_views.dashboard_general_stats),
+    path('dashboard/department_distribution/', async_views.dashboard_department_distribution),
+    path('dashboard/top_skills/', async_views.dashboard_top_skills),
+]
+
 urlpatterns = [
+    path('async/', include(async_urlpatterns)),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,8 +1,57 @@
 from django.db import connection,transaction
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .services import get_collaboration_suggestions
+from rest_framework.reverse import reverse
+from .analytics import (
+    METRICS,
+    analysis_summary,
+    communities,
+    community_members,
+    is_stale,
+    latest_analysis,
+    researcher_centrality,
+    top_central,
+)
+from .admission import EXPORT, GATES, NETWORK, ONBOARD, SUGGESTIONS, GatedStream, limit_concurrency
+from .export import EXPORT_FORMATS, GRAPHML, export_network
+from .queries import department_distribution, general_stats, network_edges, network_nodes, top_skills
+from .scoring import NETWORK_MODES
+from .subgraph import (
+    EGO_MAX_DEPTH,
+    PATH_MAX_HOPS,
+    SUBGRAPH_MAX_NODES,
+    collaboration_path,
+    department_network,
+    ego_network,
+    tag_network,
+)
+from .services import (
+    DEFAULT_NETWORK_SCORE,
+    get_batch_collaboration_suggestions,
+    get_collaboration_suggestions,
+    get_project_researcher_suggestions,
+    get_team_collaboration_suggestions,
+    invalidate_feature_snapshot,
+    readiness,
+    warm_up,
+)
+from .changes import MAX_CHANGES, changes_since, if_none_match, membership_changed, network_etag, settled_version
+from .graph import PROJECT
+from .jobs import BULK_ANALYSIS, GRAPH_ANALYTICS, ONBOARD_ANALYSIS, enqueue
+from .onboarding import (
+    BULK_BATCH_SIZE,
+    BULK_FORMATS,
+    CSV_FORMAT,
+    NDJSON_FORMAT,
+    bulk_onboard,
+    insert_researcher_skills,
+    insert_researcher_tags,
+)
+from .embeddings import AI_AVAILABLE
+from .tagging import SEMANTIC_TAG_THRESHOLD, suggest_labels_for_text, suggest_researcher_labels
+from .materialized import get_materialized_suggestions
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from django.db.models import Count, Sum, Avg
@@ -16,6 +65,7 @@ from .models import (
     Tag,
     EntityTag,
     Skill,
+    Job,
 )
 from .serializers import (
     DepartmentSerializer,
@@ -27,9 +77,60 @@ from .serializers import (
     TagSerializer,
     EntityTagSerializer,
     SkillSerializer,
+    JobSerializer,
 )
 
 
+def _label_suggestion_params(params):
+    """ Anlamsal tag/skill önerisi için (limit, threshold); geçersizse ValueError """
+    limit = max(1, min(int(params.get('limit', 10)), 50))
+    threshold = float(params.get('threshold', SEMANTIC_TAG_THRESHOLD))
+    if not -1.0 <= threshold <= 1.0:
+        raise ValueError(threshold)
+    return limit, threshold
+
+
+def _bulk_format(hint: str):
+    """ Content-Type veya dosya adından toplu içe aktarma formatı """
+    hint = (hint or '').lower()
+    if 'csv' in hint:
+        return CSV_FORMAT
+    if any(marker in hint for marker in ('ndjson', 'jsonl', 'json')):
+        return NDJSON_FORMAT
+    return None
+
+
+def _job_link(job, request):
+    """ Kuyruğa eklenen iş; sonuç GET /api/jobs/{job_id}/ ile takip edilir """
+    return {
+        "id": job.job_id,
+        "status": job.status,
+        "url": reverse('job-detail', args=[job.job_id], request=request),
+    }
+
+
+def _graph_analysis(request):
+    """
+    (son ağ analizi, None) veya hiç analiz yoksa (None, 202 yanıtı).
+    Ağ son analizden beri değiştiyse yeni hesap kuyruğa eklenir (bekleyen varsa o kullanılır);
+    o bitene kadar eski analiz döner (summary'de stale: true).
+    """
+    analysis = latest_analysis()
+    if not is_stale(analysis):
+        return analysis, None
+
+    job = enqueue(GRAPH_ANALYTICS)
+    # JOBS_RUN_INLINE açıksa iş hemen çalışmış olabilir
+    analysis = latest_analysis()
+    if analysis is not None:
+        return analysis, None
+    job.refresh_from_db()
+    return None, Response(
+        {"detail": "Ağ analizi henüz hazır değil, hesaplanıyor.", "job": _job_link(job, request)},
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
 # -------------------------
 #  Basit CRUD ViewSet'ler
 # -------------------------
@@ -58,6 +159,7 @@ class ResearcherViewSet(viewsets.ModelViewSet):
     search_fields = ['full_name', 'email', 'bio']
     ordering_fields = ['full_name', 'created_at']
     @action(detail=False, methods=['post'], url_path='onboard')
+    @limit_concurrency(ONBOARD)
     def onboard(self, request):
         """
         POST /api/researchers/onboard/
@@ -65,7 +167,8 @@ class ResearcherViewSet(viewsets.ModelViewSet):
         Bu endpoint:
         1. Yeni bir araştırmacı oluşturur.
         2. Gelen skill_ids ve tag_ids listelerine göre ilişkileri kurar.
-        3. İşlem biter bitmez AI algoritmasını çalıştırıp önerileri döner.
+        3. Etiketleme, embedding ve öneri hesabını arka plan işi olarak kuyruğa ekler
+           ve hemen döner. Sonuç GET /api/jobs/{job_id}/ ile takip edilir.
         """
         data = request.data
         
@@ -93,42 +196,31 @@ class ResearcherViewSet(viewsets.ModelViewSet):
                 new_id = new_researcher.researcher_id
 
                 # B) Yetenekleri (Skills) Ekle
-                skill_ids = data.get('skill_ids', [])
-                if skill_ids:
-                    # Raw SQL ile performansı artırıyoruz
-                    with connection.cursor() as cursor:
-                        for s_id in skill_ids:
-                            cursor.execute("""
-                                INSERT INTO researcher_skill (researcher_id, skill_id, level)
-                                VALUES (%s, %s, 1) 
-                            """, [new_id, s_id]) 
-                            # Not: Varsayılan level 1 olarak atandı, istersen parametre olarak alabilirsin.
+                # Tek bir çok satırlı INSERT (Not: Varsayılan level 1 olarak atandı)
+                insert_researcher_skills((new_id, s_id) for s_id in data.get('skill_ids', []))
 
                 # C) İlgi Alanlarını (Tags) Ekle
-                tag_ids = data.get('tag_ids', [])
-                if tag_ids:
-                    with connection.cursor() as cursor:
-                        for t_id in tag_ids:
-                            cursor.execute("""
-                                INSERT INTO entity_tag (entity_type, entity_id, tag_id)
-                                VALUES ('researcher', %s, %s)
-                            """, [new_id, t_id])
+                insert_researcher_tags((new_id, t_id) for t_id in data.get('tag_ids', []))
+
+                # Raw SQL yazmaları signal tetiklemez: öneri önbelleğini elle tazele
+                invalidate_feature_snapshot()
+
+                # 2. AI Analizi arka planda: iş, araştırmacıyla aynı transaction'da commit edilir
+                job = enqueue(ONBOARD_ANALYSIS, researcher_id=new_id, limit=5)
 
             # Transaction bitti, veriler güvenle kaydedildi.
-            
-            # 2. AI Analizi: Yeni eklenen kişi için önerileri getir
-            suggestions = get_collaboration_suggestions(new_id, limit=5)
 
-            # 3. Yanıt Dön
+            # 3. Yanıt Dön (JOBS_RUN_INLINE açıksa iş commit'te çalışmış olabilir)
+            job.refresh_from_db()
             return Response({
-                "message": "Araştırmacı başarıyla sisteme eklendi ve analiz edildi.",
+                "message": "Araştırmacı başarıyla sisteme eklendi, analiz arka planda yapılıyor.",
                 "new_researcher": {
                     "id": new_id,
                     "name": new_researcher.full_name,
                     "email": new_researcher.email,
                     "department": str(new_researcher.department) # __str__ metodunu kullanır
                 },
-                "collaboration_suggestions": suggestions
+                "job": _job_link(job, request),
             }, status=status.HTTP_201_CREATED)
 
         except Exception as e:
@@ -138,13 +230,16 @@ class ResearcherViewSet(viewsets.ModelViewSet):
 
 
     @action(detail=True, methods=['get'], url_path='collaboration-suggestions')
+    @limit_concurrency(SUGGESTIONS)
     def collaboration_suggestions(self, request, pk=None):
         """
         /api/researchers/{id}/collaboration-suggestions/
         Belirli bir araştırmacı için potansiyel işbirliği adaylarını döner.
 
-        Opsiyonel query param:
+        Opsiyonel query param'lar:
           - limit: döndürülecek maksimum öneri sayısı (default: 10)
+          - network: "common_partners" (ortak bağlantı sayısı) veya
+                     "pagerank" (kişiselleştirilmiş PageRank yakınlığı)
         """
         try:
             base_researcher_id = int(pk)
@@ -159,9 +254,151 @@ class ResearcherViewSet(viewsets.ModelViewSet):
 
         limit = max(1, min(limit, 50))  # 1 ile 50 arasında sınırla
 
-        suggestions = get_collaboration_suggestions(base_researcher_id, limit=limit)
-        return Response(suggestions)
+        network = request.query_params.get('network', DEFAULT_NETWORK_SCORE)
+        if network not in NETWORK_MODES:
+            return Response({"detail": f"network şunlardan biri olmalıdır: {', '.join(NETWORK_MODES)}."}, status=400)
+
+        # Önce refresh_suggestions komutunun yazdığı tabloya bak; bayatsa canlı hesapla
+        # (tablo varsayılan network yöntemiyle hesaplanır)
+        materialized = None
+        if network == DEFAULT_NETWORK_SCORE:
+            materialized = get_materialized_suggestions(base_researcher_id, limit=limit)
+        if materialized is not None:
+            suggestions, computed_at = materialized
+            response = Response(suggestions)
+            response["X-Suggestions-Source"] = "materialized"
+            response["X-Suggestions-Computed-At"] = computed_at.isoformat()
+            return response
+
+        suggestions = get_collaboration_suggestions(base_researcher_id, limit=limit, network=network)
+        response = Response(suggestions)
+        response["X-Suggestions-Source"] = "live"
+        return response
     
+    @action(detail=False, methods=['post'], url_path='bulk-onboard')
+    @limit_concurrency(ONBOARD)
+    def bulk_onboard(self, request):
+        """
+        POST /api/researchers/bulk-onboard/
+        Gövde: CSV (Content-Type: text/csv) veya NDJSON (application/x-ndjson) akışı,
+        ya da multipart "file" alanında .csv / .ndjson dosyası. Alanlar için bkz. core/onboarding.py.
+
+        Opsiyonel query param'lar:
+          - fmt: csv | ndjson (Content-Type / dosya adından anlaşılamıyorsa)
+          - batch_size: tek transaction'daki satır sayısı (default: BULK_ONBOARD_BATCH_SIZE)
+          - dry_run=1: sadece doğrula, hiçbir şey yazma
+
+        Satır bazında hata raporu döner; eklenenlerin etiketleme ve embedding'i tek bir
+        arka plan işiyle yapılır (job).
+        """
+        upload = request.FILES.get('file') if request.content_type.startswith('multipart/') else None
+        source = upload if upload is not None else request.stream
+        if source is None:
+            return Response({"detail": "Boş gövde: CSV veya NDJSON verisi bekleniyor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.query_params.get('fmt') or _bulk_format(upload.name if upload else request.content_type)
+        if fmt not in BULK_FORMATS:
+            return Response({"detail": f"fmt şunlardan biri olmalıdır: {', '.join(BULK_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_size = max(1, min(int(request.query_params.get('batch_size', BULK_BATCH_SIZE)), 5000))
+        except ValueError:
+            return Response({"detail": "Geçersiz batch_size."}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get('dry_run') in ('1', 'true', 'True')
+
+        report = bulk_onboard(source, fmt, batch_size=batch_size, dry_run=dry_run)
+        result = report.as_dict()
+        if report.researcher_ids:
+            # Raw SQL / bulk_create signal tetiklemez: öneri önbelleğini elle tazele
+            invalidate_feature_snapshot()
+            job = enqueue(BULK_ANALYSIS, entity_type='researcher', entity_ids=report.researcher_ids)
+            result["job"] = _job_link(job, request)
+        return Response(result, status=status.HTTP_201_CREATED if report.researcher_ids else status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'], url_path='suggested-tags')
+    @limit_concurrency(SUGGESTIONS)
+    def suggested_tags(self, request, pk=None):
+        """
+        /api/researchers/{id}/suggested-tags/
+        Bio'su anlamca yakın olup araştırmacıda henüz olmayan tag ve skill'ler.
+
+        Opsiyonel query param'lar:
+          - limit: tür başına maksimum öneri (default: 10)
+          - threshold: minimum cosine benzerliği (default: SEMANTIC_TAG_THRESHOLD)
+        """
+        if not AI_AVAILABLE:
+            return Response({"detail": "Anlamsal öneri için AI modeli yüklü değil."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        try:
+            researcher_id = int(pk)
+            limit, threshold = _label_suggestion_params(request.query_params)
+        except (TypeError, ValueError):
+            return Response({"detail": "Geçersiz researcher id, limit veya threshold."}, status=400)
+
+        suggestions = suggest_researcher_labels(researcher_id, threshold=threshold, limit=limit)
+        if suggestions is None:
+            return Response({"detail": "Araştırmacı bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(suggestions)
+
+    @action(detail=True, methods=['get'])
+    def centrality(self, request, pk=None):
+        """
+        /api/researchers/{id}/centrality/
+        Son ağ analizinden araştırmacının merkezilik skorları ve topluluğu (bkz. core/analytics.py).
+        Hiç ortak işi olmayan araştırmacının skorları 0, topluluğu null'dır.
+        """
+        researcher = self.get_object()
+        analysis, pending = _graph_analysis(request)
+        if pending is not None:
+            return pending
+
+        scores = researcher_centrality(analysis, researcher.researcher_id)
+        if scores is None:
+            scores = {**{metric: 0 for metric in METRICS}, "community": None, "is_bridge": False, "community_size": 0}
+        return Response({"researcher_id": researcher.researcher_id, **scores, "analysis": analysis_summary(analysis)})
+
+    @action(detail=False, methods=['post'], url_path='collaboration-suggestions/batch')
+    @limit_concurrency(SUGGESTIONS)
+    def collaboration_suggestions_batch(self, request):
+        """
+        POST /api/researchers/collaboration-suggestions/batch/
+
+        Body:
+          - researcher_ids: araştırmacı id listesi (en fazla 100)
+          - limit: kişi başı öneri sayısı (default: 10, 1-50)
+          - mode: "individual" (default) -> her araştırmacı için ayrı liste
+                  "team" -> ekibin birleşik profiline göre tek liste
+        """
+        data = request.data
+        researcher_ids = data.get('researcher_ids')
+        if not isinstance(researcher_ids, list) or not researcher_ids:
+            return Response({"detail": "researcher_ids boş olmayan bir liste olmalıdır."}, status=400)
+        if len(researcher_ids) > 100:
+            return Response({"detail": "Tek istekte en fazla 100 araştırmacı gönderilebilir."}, status=400)
+        try:
+            researcher_ids = [int(r_id) for r_id in researcher_ids]
+        except (TypeError, ValueError):
+            return Response({"detail": "Geçersiz researcher id."}, status=400)
+
+        try:
+            limit = int(data.get('limit', 10))
+        except (TypeError, ValueError):
+            limit = 10
+        limit = max(1, min(limit, 50))  # 1 ile 50 arasında sınırla
+
+        mode = data.get('mode', 'individual')
+        if mode == 'team':
+            return Response({
+                "team": researcher_ids,
+                "suggestions": get_team_collaboration_suggestions(researcher_ids, limit=limit),
+            })
+        if mode != 'individual':
+            return Response({"detail": "mode 'individual' veya 'team' olmalıdır."}, status=400)
+
+        results = get_batch_collaboration_suggestions(researcher_ids, limit=limit)
+        return Response([
+            {"researcher_id": r_id, "suggestions": suggestions}
+            for r_id, suggestions in results.items()
+        ])
+
     @action(detail=True, methods=['get'])
     def projects(self, request, pk=None):
         """
@@ -289,6 +526,34 @@ class ProjectViewSet(viewsets.ModelViewSet):
         ]
         return Response(data)
 
+    @action(detail=True, methods=['get'], url_path='suggested-researchers')
+    @limit_concurrency(SUGGESTIONS)
+    def suggested_researchers(self, request, pk=None):
+        """
+        /api/projects/{id}/suggested-researchers/
+        Projeye katılabilecek araştırmacıları skorlayıp döner. Kriterler:
+        proje özeti ile bio benzerliği, projenin tag'leri, mevcut üyelerin
+        skill'leri, departman ve PI'a ağdaki yakınlık. Mevcut üyeler listelenmez.
+
+        Opsiyonel query param:
+          - limit: döndürülecek maksimum öneri sayısı (default: 10)
+        """
+        try:
+            project_id = int(pk)
+        except (TypeError, ValueError):
+            return Response({"detail": "Geçersiz project id."}, status=400)
+
+        try:
+            limit = int(request.query_params.get('limit', '10'))
+        except ValueError:
+            limit = 10
+        limit = max(1, min(limit, 50))  # 1 ile 50 arasında sınırla
+
+        suggestions = get_project_researcher_suggestions(project_id, limit=limit)
+        if suggestions is None:
+            return Response({"detail": "Proje bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(suggestions)
+
     @researchers.mapping.post
     def add_researcher(self, request, pk=None):
         """
@@ -323,13 +588,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        with connection.cursor() as cursor:
+        with transaction.atomic(), connection.cursor() as cursor:
             cursor.execute("""
                 INSERT INTO project_researcher
                     (project_id, researcher_id, role, contribution_pct, joined_at)
                 VALUES (%s, %s, %s, %s, %s);
             """, [project_id, researcher_id, role, contribution_val, joined_at])
 
+            # Ağ (collaboration network) değişti: değişen kenarları aynı transaction'da
+            # günlüğe yaz, matrise sadece yeni kenarları ekle
+            membership_changed(PROJECT, project_id, researcher_id)
+
         return Response({"detail": "Araştırmacı projeye eklendi."}, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['get'])
@@ -430,6 +699,26 @@ class TagViewSet(viewsets.ModelViewSet):
     queryset = Tag.objects.all().order_by('tag_id')
     serializer_class = TagSerializer
 
+    @action(detail=False, methods=['post'], url_path='suggest')
+    @limit_concurrency(SUGGESTIONS)
+    def suggest(self, request):
+        """
+        POST /api/tags/suggest/
+        Body: {"text": "...", "limit": 10, "threshold": 0.4}
+        Serbest metne (örn. henüz kaydedilmemiş bir bio) anlamca yakın tag ve skill'ler.
+        """
+        if not AI_AVAILABLE:
+            return Response({"detail": "Anlamsal öneri için AI modeli yüklü değil."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        text = request.data.get('text')
+        if not isinstance(text, str) or not text.strip():
+            return Response({"detail": "Eksik bilgi: text alanı zorunludur."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit, threshold = _label_suggestion_params(request.data)
+        except (TypeError, ValueError):
+            return Response({"detail": "Geçersiz limit veya threshold."}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(suggest_labels_for_text(text, threshold=threshold, limit=limit))
+
 
 class EntityTagViewSet(viewsets.ModelViewSet):
     queryset = EntityTag.objects.all().order_by('entity_tag_id')
@@ -457,21 +746,7 @@ class DashboardViewSet(viewsets.ViewSet):
         /api/dashboard/general-stats/
         Yönetici paneli tepesindeki özet sayı kartları için veri döner.
         """
-        total_researchers = Researcher.objects.count()
-        total_projects = Project.objects.count()
-        active_projects = Project.objects.filter(status__icontains='active').count()
-        total_publications = Publication.objects.count()
-        
-        # Toplam hibe miktarını hesapla (Currency ayrımı yapmadan basit toplam - geliştirilebilir)
-        total_funding = FundingAgencyGrant.objects.aggregate(Sum('amount'))['amount__sum'] or 0
-
-        return Response({
-            "total_researchers": total_researchers,
-            "total_projects": total_projects,
-            "active_projects": active_projects,
-            "total_publications": total_publications,
-            "total_funding_amount": total_funding
-        })
+        return Response(general_stats())
 
     @action(detail=False, methods=['get'])
     def department_distribution(self, request):
@@ -479,12 +754,7 @@ class DashboardViewSet(viewsets.ViewSet):
         /api/dashboard/department-distribution/
         Hangi bölümde kaç araştırmacı var? (Pie Chart için)
         """
-        # Group By işlemi: Department'a göre grupla ve say
-        data = Department.objects.annotate(
-            researcher_count=Count('researchers')
-        ).values('name', 'researcher_count').order_by('-researcher_count')
-
-        return Response(data)
+        return Response(department_distribution())
 
     @action(detail=False, methods=['get'])
     def top_skills(self, request):
@@ -493,105 +763,267 @@ class DashboardViewSet(viewsets.ViewSet):
         Okulda en çok sahip olunan yetenekler neler? (Bar Chart için)
         Raw SQL kullanılarak düzeltildi.
         """
-        # SQL Sorgusu: Skill tablosunu researcher_skill ile birleştir ve say
-        sql = """
-            SELECT s.name, COUNT(rs.researcher_id) as usage_count
-            FROM skill s
-            JOIN researcher_skill rs ON s.skill_id = rs.skill_id
-            GROUP BY s.name
-            ORDER BY usage_count DESC
-            LIMIT 10;
-        """
-        
-        with connection.cursor() as cursor:
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-
-        # SQL sonucunu JSON formatına çevir
-        data = [
-            {"skill": row[0], "researcher_count": row[1]} 
-            for row in rows
-        ]
-        
-        return Response(data)
+        return Response(top_skills())
     
 
 # -------------------------
 #  Network / İlişki Ağı API
 # -------------------------
 
+def _max_nodes_param(request) -> int:
+    return max(1, min(int(request.query_params.get('max_nodes', SUBGRAPH_MAX_NODES)), SUBGRAPH_MAX_NODES))
+
+
 class NetworkViewSet(viewsets.ViewSet):
     """
     Araştırmacılar arasındaki ilişkileri (Graph Data) döner.
     Frontend'de (React Flow, Cytoscape.js) çizim yapmak için kullanılır.
+    list tüm ağı döner; ego / department / tag sadece istenen parçayı
+    önbellekteki ağdan döner (bkz. core/subgraph.py). analytics / central /
+    communities arka planda hesaplanıp saklanan son analizi okur (bkz. core/analytics.py).
     """
 
     def list(self, request):
         """
         GET /api/network/
+        Yanıtta ETag (ağ değişmediyse If-None-Match ile 304) ve X-Network-Version
+        (sonraki güncellemeler için /api/network/changes/?since=) header'ları vardır.
         """
-        nodes = []
-        edges = []
-        
-        # 1. NODES (Düğümler - Araştırmacılar)
-        # Her araştırmacı bir düğümdür.
-        researchers = Researcher.objects.select_related('department').all()
-        for r in researchers:
-            nodes.append({
-                "id": r.researcher_id,
-                "label": r.full_name,
-                "group": r.department.name if r.department else "Unknown",
-                "title": r.title  # Mouse ile üzerine gelince görünsün diye
-            })
+        etag = network_etag()
+        if etag in if_none_match(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        # Veri bu versiyondan sonra okunur: arada gelen değişiklikler changes'te tekrar gelir
+        version = settled_version()
+
+        with GATES[NETWORK]:
+            # 1. NODES (Düğümler - Araştırmacılar)
+            # 2-3. EDGES - PROJE ve YAYIN İLİŞKİLERİ
+            data = {
+                "nodes": network_nodes(),
+                "edges": network_edges("project") + network_edges("publication"),
+            }
+        return Response(data, headers={"ETag": etag, "X-Network-Version": str(version)})
 
-        # 2. EDGES - PROJE İLİŞKİLERİ
-        # Aynı projede çalışanları bul (Self Join)
-        # pr1.researcher_id < pr2.researcher_id koşulu, (Ali-Ayşe) ve (Ayşe-Ali) diye iki kere saymayı önler.
-        project_sql = """
-            SELECT pr1.researcher_id, pr2.researcher_id, COUNT(*) as weight
-            FROM project_researcher pr1
-            JOIN project_researcher pr2 ON pr1.project_id = pr2.project_id
-            WHERE pr1.researcher_id < pr2.researcher_id
-            GROUP BY pr1.researcher_id, pr2.researcher_id
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
         """
-        
-        with connection.cursor() as cursor:
-            cursor.execute(project_sql)
-            rows = cursor.fetchall()
-            
-        for row in rows:
-            source, target, weight = row
-            edges.append({
-                "from": source,
-                "to": target,
-                "value": weight,   # Çizgi kalınlığı
-                "type": "project"  # İlişki türü
-            })
+        GET /api/network/changes/?since=<versiyon>&limit=<n>
+        since'ten sonraki düğüm / kenar değişiklikleri (bkz. core/changes.py).
+        has_more ise dönen version ile tekrar sorulur.
+        """
+        try:
+            since = int(request.query_params['since'])
+            if since < 0:
+                raise ValueError(since)
+        except (KeyError, ValueError):
+            return Response({"detail": "since parametresi (>= 0 tam sayı) zorunludur."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', MAX_CHANGES)), 1), MAX_CHANGES)
+        except ValueError:
+            return Response({"detail": "limit tam sayı olmalıdır."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(changes_since(since, limit=limit))
 
-        # 3. EDGES - YAYIN İLİŞKİLERİ
-        # Aynı yayında yazarlığı olanları bul
-        pub_sql = """
-            SELECT ap1.researcher_id, ap2.researcher_id, COUNT(*) as weight
-            FROM author_publication ap1
-            JOIN author_publication ap2 ON ap1.publication_id = ap2.publication_id
-            WHERE ap1.researcher_id < ap2.researcher_id
-            GROUP BY ap1.researcher_id, ap2.researcher_id
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        GET /api/network/export/?fmt=ndjson|graphml|gexf
+        Tüm ağı dosya olarak akıtır (Gephi için graphml / gexf); bellek kullanımı
+        ağın büyüklüğünden bağımsızdır. Bkz. core/export.py.
         """
+        fmt = request.query_params.get('fmt', GRAPHML)
+        if fmt not in EXPORT_FORMATS:
+            return Response({"detail": f"fmt şunlardan biri olmalıdır: {', '.join(EXPORT_FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        gate = GATES[EXPORT]
+        gate.acquire()
+        content_type, extension = EXPORT_FORMATS[fmt]
+        response = StreamingHttpResponse(
+            GatedStream(gate, (chunk.encode('utf-8') for chunk in export_network(fmt))),
+            content_type=f"{content_type}; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'attachment; filename="network.{extension}"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path=r'ego/(?P<researcher_id>\d+)')
+    def ego(self, request, researcher_id=None):
+        """
+        GET /api/network/ego/{researcher_id}/?depth=1
+        Araştırmacı ve depth adım (1-NETWORK_EGO_MAX_DEPTH) uzağındaki işbirlikçileri.
+        Opsiyonel: max_nodes (default: NETWORK_SUBGRAPH_MAX_NODES)
+        """
+        try:
+            depth = max(1, min(int(request.query_params.get('depth', 1)), EGO_MAX_DEPTH))
+            max_nodes = _max_nodes_param(request)
+        except ValueError:
+            return Response({"detail": "Geçersiz depth veya max_nodes."}, status=status.HTTP_400_BAD_REQUEST)
 
-        with connection.cursor() as cursor:
-            cursor.execute(pub_sql)
-            rows = cursor.fetchall()
+        subgraph = ego_network(int(researcher_id), depth=depth, max_nodes=max_nodes)
+        if subgraph is None:
+            return Response({"detail": "Araştırmacı bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(subgraph)
 
-        for row in rows:
-            source, target, weight = row
-            edges.append({
-                "from": source,
-                "to": target,
-                "value": weight,       # Yayın ilişkisi daha değerliyse Frontend'de *2 yapılabilir
-                "type": "publication"
-            })
+    @action(detail=False, methods=['get'], url_path=r'department/(?P<department_id>\d+)')
+    def department(self, request, department_id=None):
+        """
+        GET /api/network/department/{department_id}/
+        Departmandaki araştırmacılar ve aralarındaki işbirlikleri.
+        """
+        try:
+            max_nodes = _max_nodes_param(request)
+        except ValueError:
+            return Response({"detail": "Geçersiz max_nodes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        subgraph = department_network(int(department_id), max_nodes=max_nodes)
+        if subgraph is None:
+            return Response({"detail": "Departman bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(subgraph)
+
+    @action(detail=False, methods=['get'], url_path=r'tag/(?P<tag_id>\d+)')
+    def tag(self, request, tag_id=None):
+        """
+        GET /api/network/tag/{tag_id}/
+        Tag'e sahip araştırmacılar ve aralarındaki işbirlikleri.
+        """
+        try:
+            max_nodes = _max_nodes_param(request)
+        except ValueError:
+            return Response({"detail": "Geçersiz max_nodes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        subgraph = tag_network(int(tag_id), max_nodes=max_nodes)
+        if subgraph is None:
+            return Response({"detail": "Tag bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(subgraph)
+
+    @action(detail=False, methods=['get'])
+    def path(self, request):
+        """
+        GET /api/network/path/?from=A&to=B&max_hops=6
+        A'dan B'ye en kısa işbirliği zinciri (önbellekteki ağda iki yönlü BFS)
+        ve her adımda ortak olunan proje / yayınlar. max_hops: 1-NETWORK_PATH_MAX_HOPS
+        """
+        try:
+            source_id = int(request.query_params['from'])
+            target_id = int(request.query_params['to'])
+            max_hops = max(1, min(int(request.query_params.get('max_hops', PATH_MAX_HOPS)), PATH_MAX_HOPS))
+        except (KeyError, ValueError):
+            return Response({"detail": "from ve to (araştırmacı id) zorunludur; max_hops tam sayı olmalıdır."}, status=status.HTTP_400_BAD_REQUEST)
+
+        path = collaboration_path(source_id, target_id, max_hops=max_hops)
+        if path is None:
+            return Response({"detail": "Araştırmacı bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(path)
+
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """
+        GET /api/network/analytics/
+        Son ağ analizinin özeti: versiyon, düğüm / kenar / topluluk sayısı, modularity.
+        Hesap arka planda yapılır (bkz. core/analytics.py); ilk seferde 202 döner.
+        """
+        analysis, pending = _graph_analysis(request)
+        if pending is not None:
+            return pending
+        return Response(analysis_summary(analysis))
+
+    @action(detail=False, methods=['get'])
+    def central(self, request):
+        """
+        GET /api/network/central/?metric=betweenness&limit=10
+        metric'e göre en merkezi araştırmacılar: degree, weighted_degree,
+        betweenness (default), eigenvector. Opsiyonel: community (sadece o topluluk içinde)
+        """
+        metric = request.query_params.get('metric', 'betweenness')
+        if metric not in METRICS:
+            return Response({"detail": f"metric şunlardan biri olmalıdır: {', '.join(METRICS)}."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 100))
+            community = request.query_params.get('community')
+            community = int(community) if community is not None else None
+        except ValueError:
+            return Response({"detail": "Geçersiz limit veya community."}, status=status.HTTP_400_BAD_REQUEST)
 
+        analysis, pending = _graph_analysis(request)
+        if pending is not None:
+            return pending
         return Response({
-            "nodes": nodes,
-            "edges": edges
-        })
\ No newline at end of file
+            "analysis": analysis_summary(analysis),
+            "metric": metric,
+            "results": top_central(analysis, metric, limit=limit, community=community),
+        })
+
+    @action(detail=False, methods=['get'], url_path='communities')
+    def community_list(self, request):
+        """
+        GET /api/network/communities/?limit=50
+        En büyük topluluklar: boyutu, köprü araştırmacı sayısı ve en çok bağlantısı olan üyeleri.
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+        except ValueError:
+            return Response({"detail": "Geçersiz limit."}, status=status.HTTP_400_BAD_REQUEST)
+
+        analysis, pending = _graph_analysis(request)
+        if pending is not None:
+            return pending
+        return Response({"analysis": analysis_summary(analysis), "results": communities(analysis, limit=limit)})
+
+    @action(detail=False, methods=['get'], url_path=r'communities/(?P<community>\d+)')
+    def community_detail(self, request, community=None):
+        """
+        GET /api/network/communities/{community}/
+        Topluluğun üyeleri ve skorları. Opsiyonel: max_nodes (default: NETWORK_SUBGRAPH_MAX_NODES)
+        """
+        try:
+            max_nodes = _max_nodes_param(request)
+        except ValueError:
+            return Response({"detail": "Geçersiz max_nodes."}, status=status.HTTP_400_BAD_REQUEST)
+
+        analysis, pending = _graph_analysis(request)
+        if pending is not None:
+            return pending
+        members = community_members(analysis, int(community), limit=max_nodes)
+        if members is None:
+            return Response({"detail": "Topluluk bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"analysis": analysis_summary(analysis), **members})
+
+
+# -------------------------
+#  Sağlık / Hazırlık API
+# -------------------------
+
+class HealthViewSet(viewsets.ViewSet):
+    """
+    Load balancer / deploy script'leri için: AI modeli ve öneri
+    önbellekleri ısındı mı?
+    """
+
+    @action(detail=False, methods=['get'])
+    def ready(self, request):
+        """
+        GET /api/health/ready/
+        Her şey hazırsa 200, değilse 503 döner (hiçbir şeyi yüklemez).
+        """
+        report = readiness()
+        return Response(
+            report,
+            status=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    @action(detail=False, methods=['post'])
+    def warmup(self, request):
+        """
+        POST /api/health/warmup/
+        Modeli yükler ve önbellekleri kurar; adım sürelerini döner.
+        """
+        timings = warm_up()
+        return Response({"timings": timings, **readiness()})
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Arka plan işlerinin durumu (bkz. core/jobs.py).
+    GET /api/jobs/{id}/ -> status: pending | running | done | failed, bittiyse result.
+    """
+    queryset = Job.objects.all().order_by('-job_id')
+    serializer_class = JobSerializer
+    filterset_fields = ['kind', 'status']
@@ -0,0 +1,59 @@
+# gunicorn -c gunicorn.conf.py research_backend.wsgi
+#
+# preload_app: Django ve AI modeli master process'te BİR KEZ yüklenir,
+# worker'lar fork ile oluşturulur ve model ağırlıklarını copy-on-write
+# olarak paylaşır (her worker kendi kopyasını yüklemez).
+#
+# worker_class = 'gthread': her worker `threads` isteği aynı anda işler.
+# Kabul kontrolü (core/admission.py) worker başınadır ve sadece bir worker'da
+# birden çok istek aynı anda çalışıyorsa devreye girer; sync worker'da (tek
+# thread) slot'lar hiç dolmaz. threads, ADMISSION_LIMITS'teki slot + kuyruk
+# toplamlarından büyük tutulmalı ki pahalı istekler beklerken ucuz CRUD
+# istekleri için thread kalsın. Her thread kendi DB bağlantısını açar:
+# toplam bağlantı = workers * threads.
+#
+# Arka plan işleri (core/jobs.py): her worker JOBS_WORKER_THREADS tane
+# run_jobs döngüsünü thread olarak çalıştırır; yüklü AI modelini web
+# istekleriyle paylaşır. İşler ayrı bir servisle (python manage.py run_jobs)
+# çalıştırılıyorsa JOBS_WORKER_THREADS=0.
+import gc
+import os
+import threading
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '16'))
+timeout = 120
+preload_app = True
+
+JOBS_WORKER_THREADS = int(os.environ.get('JOBS_WORKER_THREADS', '1'))
+
+
+def when_ready(server):
+    # Master'da, worker'lar fork edilmeden hemen önce çalışır
+    from django.db import connections
+    from core.embeddings import preload_model
+
+    if preload_model():
+        server.log.info("AI modeli master process'te yüklendi (worker'lar paylaşacak).")
+
+    # Fork sonrası DB bağlantıları paylaşılmamalı
+    connections.close_all()
+
+    # Yüklenen nesneleri GC takibinden çıkar: aksi halde worker'lardaki
+    # GC taramaları sayfalara yazıp copy-on-write paylaşımını bozar
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Her worker'da, fork ve uygulama yüklendikten sonra çalışır
+    from django.core.management import call_command
+
+    for number in range(JOBS_WORKER_THREADS):
+        threading.Thread(
+            target=call_command,
+            args=('run_jobs',),
+            name=f'run_jobs-{number}',
+            daemon=True,   # Worker kapanınca yarım kalan iş heartbeat'i kesilince geri alınır
+        ).start()
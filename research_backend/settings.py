@@ -96,6 +96,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'research_backend.wsgi.application'
 
+# managed = False tabloları test veritabanında da oluşturulsun (core/test_runner.py)
+TEST_RUNNER = 'core.test_runner.LegacySchemaRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -185,4 +188,101 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 
 # CORS AYARLARI
-CORS_ALLOW_ALL_ORIGINS = True
\ No newline at end of file
+CORS_ALLOW_ALL_ORIGINS = True
+
+
+
+# ÖNERİ MOTORU (core/services.py)
+# Öneri özellik önbelleği en fazla bu kadar saniye bayat kalabilir.
+# Aynı process'teki değişiklikler signal'ler ile anında yansır; bu süre diğer
+# worker'lardaki / management command'lardaki yazmalar için üst sınırdır.
+FEATURE_SNAPSHOT_MAX_AGE = 300
+
+# İşbirliği ağı (core/graph.py) bu süre sonunda DB'den baştan okunur.
+# Aynı process'teki project_researcher / author_publication yazmaları anında uygulanır.
+COLLABORATION_GRAPH_MAX_AGE = 900
+
+# ANN vektör indeksi (core/ann.py): 'brute' (kesin), 'ivf' (yaklaşık) veya
+# 'auto' (ANN_IVF_MIN_SIZE altında brute, üstünde ivf).
+ANN_INDEX_BACKEND = 'auto'
+ANN_IVF_MIN_SIZE = 20000
+ANN_IVF_LISTS = None        # None = sqrt(N)
+ANN_IVF_PROBE = 8           # Büyütülürse recall artar, sorgu yavaşlar
+ANN_INDEX_DIR = os.path.join(BASE_DIR, 'ann_indexes')
+ANN_INDEX_MAX_AGE = 3600
+# True: öneri aday budaması anlamsal komşuları ANN indeksinden alır (hızlı ama IVF'de
+# yaklaşık; sorgulanmayan listelerdeki adaylar kaçabilir). False: vektör matrisi taranır, kesin.
+SUGGESTION_SEMANTIC_ANN = False
+
+# Tekil encode isteklerini birleştiren kuyruk (core/embeddings.py, EmbeddingBatcher)
+EMBEDDING_BATCH_SIZE = 32       # Bir batch'teki en fazla metin
+EMBEDDING_BATCH_WAIT_MS = 5     # İlk istek batch dolsun diye en fazla bu kadar bekler
+EMBEDDING_BATCH_THREADS = 1     # Modeli çalıştıran thread sayısı
+
+# Önceden hesaplanmış öneriler (core/materialized.py, refresh_suggestions komutu)
+SUGGESTIONS_TOP_N = 50          # Araştırmacı başına saklanan öneri sayısı
+SUGGESTIONS_MAX_AGE = 3600      # Saniye; daha eski kayıtlar yerine canlı hesaplanır
+
+# Öneri network skoru: 'common_partners' (ortak bağlantı sayısı, max 3) veya
+# 'pagerank' (kişiselleştirilmiş PageRank; 2-3 adım uzaktakileri de aday yapar)
+SUGGESTION_NETWORK_SCORE = 'common_partners'
+PPR_RESTART = 0.15          # Her adımda kaynağa geri dönme olasılığı
+PPR_TOLERANCE = 1e-6        # Yakınsama eşiği; bunun altındaki yakınlıklar atılır
+PPR_MAX_ITER = 100
+PPR_CACHE_SIZE = 1024       # Ağ değişene kadar saklanan kaynak sayısı (worker başına)
+
+# Pahalı endpoint'lerin worker başına eş zamanlılık sınırları (core/admission.py).
+# Slot'lar doluysa istek kuyrukta bekler; kuyruk doluysa / timeout aşılırsa 503 + Retry-After.
+# Bekleyen istek de bir thread tutar: slot + kuyruk, gunicorn.conf.py'deki threads'ten
+# (GUNICORN_THREADS, default 16) küçük olmalı.
+ADMISSION_LIMITS = {
+    'suggestions': {'slots': 4, 'queue': 8, 'timeout': 5.0, 'retry_after': 2},
+    'onboard': {'slots': 2, 'queue': 8, 'timeout': 10.0, 'retry_after': 5},
+    'network': {'slots': 2, 'queue': 4, 'timeout': 5.0, 'retry_after': 5},
+    'export': {'slots': 1, 'queue': 2, 'timeout': 5.0, 'retry_after': 30},
+}
+
+# Async endpoint'lerde (/api/async/..., core/async_views.py) skorlamayı çalıştıran thread sayısı
+ASYNC_SCORING_WORKERS = 4
+
+# Otomatik etiketleme otomatı (core/tagging.py) diğer process'lerdeki Tag değişiklikleri için
+# en fazla bu kadar saniye bayat kalır; aynı process'tekiler signal ile anında yansır.
+TAG_MATCHER_MAX_AGE = 300
+
+# Arka plan iş kuyruğu (core/jobs.py). Worker: python manage.py run_jobs; deploy'da
+# gunicorn worker'larının içinde thread olarak çalışır (gunicorn.conf.py, JOBS_WORKER_THREADS).
+# True: worker yok, işler commit'ten hemen sonra aynı process'te çalışır
+JOBS_RUN_INLINE = os.environ.get('JOBS_RUN_INLINE', '0') == '1'
+JOBS_MAX_ATTEMPTS = 3       # Hata veren iş bu kadar denenir
+JOBS_RETRY_DELAY = 10       # Saniye; her denemede iki katına çıkar
+JOBS_HEARTBEAT_INTERVAL = 30    # Saniye; çalışan iş heartbeat_at'i bu aralıkla günceller
+JOBS_STALE_AFTER = 120      # Saniye; heartbeat'i bu kadar süredir gelmeyen iş (ölmüş worker) yeniden alınır
+JOBS_POLL_INTERVAL = 1.0    # Kuyruk boşken bekleme (sn)
+JOBS_KEEP_DAYS = 7          # Biten işler bu kadar gün saklanır
+
+# Anlamsal tag / skill önerisi (core/tagging.py): bio vektörü ile tüm tag ve skill adlarının
+# vektör matrisi arasındaki cosine benzerliği. Matris Tag / Skill değişince yeniden kurulur.
+SEMANTIC_TAG_THRESHOLD = 0.4        # /suggested-tags/ ve /api/tags/suggest/ varsayılan eşiği
+AUTO_TAG_SEMANTIC = False           # True: otomatik etiketleme adı geçmeyen ama yakın tag'leri de ekler
+AUTO_TAG_SEMANTIC_THRESHOLD = 0.5   # Otomatik eklemede daha temkinli eşik
+AUTO_TAG_SEMANTIC_LIMIT = 5         # Metin başına en fazla bu kadar anlamsal tag eklenir
+LABEL_MATRIX_MAX_AGE = 3600
+
+# Toplu araştırmacı içe aktarma (POST /api/researchers/bulk-onboard/, core/onboarding.py)
+BULK_ONBOARD_BATCH_SIZE = 500   # Tek transaction'da yazılan satır sayısı
+BULK_ONBOARD_MAX_ERRORS = 1000  # Yanıtta listelenen en fazla hatalı satır
+
+# Alt ağ endpoint'leri (/api/network/ego|department|tag|path/..., core/subgraph.py)
+NETWORK_SUBGRAPH_MAX_NODES = 2000   # Daha büyük alt ağlar en çok bağlantısı olanlarla kesilir
+NETWORK_EGO_MAX_DEPTH = 3
+NETWORK_PATH_MAX_HOPS = 6           # /api/network/path/ en fazla bu kadar adım arar
+
+# Ağ dışa aktarımı (/api/network/export/, export_network komutu, core/export.py)
+NETWORK_EXPORT_CHUNK_SIZE = 2000    # Sunucu taraflı cursor'dan bir seferde okunan satır
+
+# Ağ değişiklik günlüğü (/api/network/changes/?since=, core/changes.py)
+GRAPH_CHANGES_PAGE_SIZE = 5000      # Bir yanıtta en fazla değişiklik
+
+# Ağ analizi: merkezilik ve topluluklar (/api/network/central|communities/, core/analytics.py)
+GRAPH_ANALYTICS_BETWEENNESS_SAMPLES = 500   # Daha büyük ağlarda betweenness bu kadar kaynaktan örneklenir
+GRAPH_ANALYTICS_KEEP = 3                    # Saklanan son analiz sayısı